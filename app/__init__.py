@@ -3,18 +3,23 @@
 from flask import Flask, jsonify, request, make_response
 from dotenv import load_dotenv
 import os
+import multiprocessing
 from datetime import timedelta
 from flask_compress import Compress
 
 # 환경변수 로드 (반드시 Flask 앱 생성 전에)
-print("🔍 환경변수 로딩 시작...")
-print(f"현재 작업 디렉토리: {os.getcwd()}")
-print(f".env 파일 존재 여부: {os.path.exists('.env')}")
+# 로딩 정보는 메인 프로세스에서만 출력 (시트 파싱용 자식 프로세스가 다시 import 할 때는 조용히)
+_verbose = multiprocessing.parent_process() is None
+if _verbose:
+    print("🔍 환경변수 로딩 시작...")
+    print(f"현재 작업 디렉토리: {os.getcwd()}")
+    print(f".env 파일 존재 여부: {os.path.exists('.env')}")
 
 # .env 파일 경로를 명시적으로 지정
 env_path = os.path.join(os.getcwd(), '.env')
-print(f".env 파일 경로: {env_path}")
-print(f".env 파일 존재 여부 (절대 경로): {os.path.exists(env_path)}")
+if _verbose:
+    print(f".env 파일 경로: {env_path}")
+    print(f".env 파일 존재 여부 (절대 경로): {os.path.exists(env_path)}")
 
 # 환경변수 로드 시도
 load_dotenv(env_path)
@@ -22,9 +27,10 @@ load_dotenv(env_path)
 # 로드된 환경변수 확인
 naver_client_id = os.getenv("NAVER_MAPS_NCP_CLIENT_ID")
 naver_client_secret = os.getenv("NAVER_MAPS_NCP_CLIENT_SECRET")
-print(f"로드된 NAVER_MAPS_NCP_CLIENT_ID: {'설정됨' if naver_client_id else 'None'}")
-print(f"로드된 NAVER_MAPS_NCP_CLIENT_SECRET: {'설정됨' if naver_client_secret else 'None'}")
-print("🔍 환경변수 로딩 완료")
+if _verbose:
+    print(f"로드된 NAVER_MAPS_NCP_CLIENT_ID: {'설정됨' if naver_client_id else 'None'}")
+    print(f"로드된 NAVER_MAPS_NCP_CLIENT_SECRET: {'설정됨' if naver_client_secret else 'None'}")
+    print("🔍 환경변수 로딩 완료")
 
 def create_app(config_object=None):
     """
@@ -86,6 +92,14 @@ def create_app(config_object=None):
         print(f"⚠️ 시트 동기화 시작 실패: {e}")
         print("   Google Sheets 자동 동기화 기능이 비활성화됩니다.")
     
+    # 매물 스냅샷 백그라운드 준비 (첫 요청이 Excel 파싱을 기다리지 않도록)
+    try:
+        from .services.snapshot_warmup import init_snapshot_warmup
+        init_snapshot_warmup(app)
+        print("✅ 매물 스냅샷 백그라운드 준비 시작")
+    except Exception as e:
+        print(f"⚠️ 매물 스냅샷 백그라운드 준비 시작 실패: {e}")
+    
     # 지오코딩 동기화 시작 (Flask 컨텍스트에서)
     try:
         # GeocodingScheduler 초기화 (Flask 앱 컨텍스트 전달)
@@ -129,8 +143,10 @@ def create_app(config_object=None):
         response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
         response.headers.add('Access-Control-Allow-Credentials', 'true')
         
-        # 캐시 헤더 설정
-        if request.path.startswith('/static/'):
+        # 캐시 헤더 설정 (라우트에서 직접 지정한 경우 그대로 둠: ETag 재검증용)
+        if 'Cache-Control' in response.headers:
+            pass
+        elif request.path.startswith('/static/'):
             response.headers.add('Cache-Control', 'public, max-age=31536000')
         else:
             response.headers.add('Cache-Control', 'no-cache, no-store, must-revalidate')
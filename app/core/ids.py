@@ -1,13 +1,43 @@
-# ids.py
 # app/core/ids.py
 
 import time
 import random
 import string
+import hashlib
+from typing import Dict, Sequence
+
+# 매물 고유 ID 기준 컬럼: 접수 시 정해지고 수정되지 않는 접수날짜 + 위치(주소, 층)
+# 가게명/건물명/면적/현황/금액처럼 사람이 고쳐 쓰는 값은 넣지 않는다 (고치면 ID 가 바뀌므로)
+# 같은 층의 여러 호실은 시트 순서대로 -2, -3 ... 접미사로 구분 (ListingIdAssigner)
+LISTING_ID_KEY_COLUMNS = ("접수날짜", "지역2", "지역", "지번", "층수")
 
 def listing_id_from_row(idx: int) -> str:
+    """시트 행 위치 기반 ID (이전 방식, 마이그레이션용)"""
     return f"lst_{idx:06d}"
 
+def listing_id_from_content(key_values: Sequence[str], prefix: str = "lst") -> str:
+    """기준 컬럼 값으로 만든 매물 ID (공백 차이는 무시)"""
+    normalized = "\x1f".join(" ".join(str(v or "").split()) for v in key_values)
+    digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+    return f"{prefix}_{digest}"
+
+class ListingIdAssigner:
+    """
+    시트 순서대로 매물 ID 를 배정한다.
+    기준 컬럼 값이 같은 매물(같은 날 접수된 같은 층의 여러 호실)은 두 번째부터 -2, -3 ... 접미사를 붙인다.
+    앞쪽 호실이 삭제되면 뒤쪽 호실의 접미사가 당겨지지만, 매물 내용을 고쳐서는 ID 가 바뀌지 않는다.
+    """
+
+    def __init__(self, prefix: str = "lst"):
+        self.prefix = prefix
+        self._seen: Dict[str, int] = {}
+
+    def assign(self, key_values: Sequence[str]) -> str:
+        base = listing_id_from_content(key_values, self.prefix)
+        count = self._seen.get(base, 0) + 1
+        self._seen[base] = count
+        return base if count == 1 else f"{base}-{count}"
+
 def generate_id(prefix: str = "id") -> str:
     """고유 ID 생성"""
     timestamp = int(time.time() * 1000)
@@ -0,0 +1,76 @@
+# app/core/singleflight.py
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    키별 중복 호출 합치기: 같은 키로 동시에 들어온 호출 중 첫 번째만 실제로 실행하고
+    나머지는 그 결과(또는 예외)를 함께 받는다. 끝난 호출은 기억하지 않는다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._calls
+
+
+class KeyedLoader:
+    """
+    키(보통 (파일 경로, mtime))가 같으면 마지막 결과를 재사용하고,
+    키가 바뀌면 한 번만 다시 로드 (동시 호출은 SingleFlight 로 합침).
+    로드 중 예외가 나면 결과를 기억하지 않는다. 반환 값은 공유되므로 수정하지 말 것.
+    """
+
+    def __init__(self):
+        self._flight = SingleFlight()
+        self._last: Optional[Tuple[Hashable, Any]] = None
+
+    def get(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        last = self._last
+        if last is not None and last[0] == key:
+            return last[1]
+
+        def _load():
+            value = load()
+            self._last = (key, value)
+            return value
+
+        return self._flight.do(key, _load)
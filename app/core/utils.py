@@ -16,3 +16,77 @@ def to_int_or_none(val: str):
         return int(digits)
     except:
         return None
+
+_FLOAT_PREFIX = re.compile(r"^[-+]?(\d+\.?\d*|\.\d+)")
+
+def to_float_or_none(val):
+    """프론트엔드 parseNumber()와 같은 규칙으로 숫자 추출 (숫자/./- 외 문자 제거 후 앞부분 파싱)"""
+    if val is None:
+        return None
+    if isinstance(val, (int, float)):
+        return float(val)
+    s = re.sub(r"[^\d.-]", "", str(val))
+    m = _FLOAT_PREFIX.match(s)
+    if not m:
+        return None
+    try:
+        return float(m.group(0))
+    except ValueError:
+        return None
+
+def parse_floor_value(val):
+    """프론트엔드 parseFloorValue()와 같은 규칙으로 층수 추출 (지하/B 는 음수)"""
+    if val is None:
+        return None
+    if isinstance(val, (int, float)):
+        return int(val)
+    s = str(val).strip().lower()
+    if s == "":
+        return None
+    m = re.search(r"(\d+)", s)
+    if not m:
+        return None
+    n = int(m.group(1))
+    if "지하" in s or "b" in s:
+        return -n
+    if s.startswith("-"):
+        m2 = re.search(r"-(\d+)", s)
+        if m2:
+            return -int(m2.group(1))
+    return n
+
+# 담당자 셀에 여러 명이 적힌 경우의 구분자 ('남/정', '남,정', '남·정')
+_MANAGER_SEPARATORS = re.compile(r"[/,·&+|]")
+
+def split_manager_names(val) -> list:
+    """담당자 셀 값 → 담당자 이름 목록 ('남/정' → ['남', '정'], 빈 값은 [])"""
+    if val is None:
+        return []
+    names = []
+    for part in _MANAGER_SEPARATORS.split(str(val)):
+        name = part.strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+def build_manager_partition(values) -> dict:
+    """담당자 컬럼 값 목록 → {담당자 이름: 행 위치 목록(오름차순)} (여러 명이 적힌 행은 각 담당자에 포함)"""
+    partition = {}
+    names_by_value = {}
+    for pos, value in enumerate(values):
+        names = names_by_value.get(value)
+        if names is None:
+            names = names_by_value[value] = split_manager_names(value)
+        for name in names:
+            partition.setdefault(name, []).append(pos)
+    return partition
+
+def manager_positions(partition: dict, manager_name) -> list:
+    """담당자명(여러 명이면 그중 누구든)에 해당하는 행 위치 목록 (오름차순)"""
+    names = split_manager_names(manager_name)
+    if len(names) == 1:
+        return partition.get(names[0], [])
+    merged = set()
+    for name in names:
+        merged.update(partition.get(name, []))
+    return sorted(merged)
@@ -35,7 +35,7 @@ def list_briefings_api():
         if manager_name:
             # 담당자명으로 고객을 필터링하고, 해당 고객들의 브리핑만 조회
             from app.services import store
-            customers = store.list_customers(user, 'own', '')
+            customers = store.list_customers(user.email, 'own', '')
             customer_ids = [c['id'] for c in customers if c.get('id')]
             
             # 해당 고객들의 브리핑만 필터링
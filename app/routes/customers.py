@@ -78,9 +78,9 @@ def list_customers_api():
     filter_type = request.args.get('filter', 'own')
     manager = request.args.get('manager', '')
     
-    # 원래 store.py 함수 사용 (User 객체 전달)
+    # 원래 store.py 함수 사용 (사용자 이메일 전달)
     from app.services import store
-    items = store.list_customers(user, filter_type, manager)
+    items = store.list_customers(user.email, filter_type, manager)
     
     return jsonify({"items": items, "total": len(items)})
 
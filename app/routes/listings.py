@@ -2,22 +2,33 @@
 # app/routes/listings.py
 
 from flask import current_app
-import json
 from flask import Blueprint, request, jsonify, session
-from ..services.listings_loader import load_listings
+from ..services.listings_loader import get_listing_snapshot, invalidate_listing_snapshots
+from ..services.listing_query import ListingQuery, get_query_index
+from ..services.listing_sheets import get_sheet_schema
+from ..services.listing_payload import get_listing_payload, iter_ndjson, SUPPORTED_ENCODINGS, NDJSON_MIMETYPE
+from ..services.listing_delta import changes_since, build_delta_response
+from ..services.listing_clusters import get_cluster_index, build_cluster_response
+from ..services.listing_facets import get_facet_index
+from ..services.listing_nearest import (
+    get_nearest_index, build_nearest_response, parse_point, parse_radius, DEFAULT_NEAREST_LIMIT, MAX_NEAREST_LIMIT
+)
+from ..services.customer_matching import match_customers, DEFAULT_MATCH_LIMIT
+from ..services.reverse_matching import match_events
 from ..services.sheet_fetcher import clear_listing_cache
+from ..services.reload_admission import admit_force_reload
 
 bp = Blueprint("listings", __name__)
 
-@bp.route("/api/listings")
-def api_listings():
+def _authenticate():
+    """세션 또는 X-User 헤더로 사용자 확인: (user, 오류 응답)"""
     # 사용자 인증 확인 (세션 또는 X-User 헤더)
     user_id = session.get("user_id")
     user_email = request.headers.get("X-User")
     
     if not user_id and not user_email:
         current_app.logger.warning(f"Unauthorized access attempt from IP {request.remote_addr}")
-        return jsonify({"error": "로그인이 필요합니다."}), 401
+        return None, (jsonify({"error": "로그인이 필요합니다."}), 401)
     
     # 사용자 서비스로 사용자 확인
     try:
@@ -31,47 +42,26 @@ def api_listings():
             if not user or not user.is_active():
                 session.clear()
                 current_app.logger.warning(f"Invalid session {user_id} from IP {request.remote_addr}")
-                return jsonify({"error": "유효하지 않은 세션입니다."}), 401
+                return None, (jsonify({"error": "유효하지 않은 세션입니다."}), 401)
         elif user_email:
             # X-User 헤더 기반 인증
             user = user_service.get_user_by_email(user_email)
             current_app.logger.info(f"Header user lookup: user_email={user_email}, found={user is not None}")
             if not user or not user.is_active():
                 current_app.logger.warning(f"Invalid X-User header: {user_email} from IP {request.remote_addr}")
-                return jsonify({"error": "유효하지 않은 사용자입니다."}), 401
+                return None, (jsonify({"error": "유효하지 않은 사용자입니다."}), 401)
     except Exception as auth_error:
         current_app.logger.error(f"❌ 사용자 인증 중 오류: {auth_error}")
-        return jsonify({"error": f"사용자 인증 실패: {str(auth_error)}"}), 500
+        return None, (jsonify({"error": f"사용자 인증 실패: {str(auth_error)}"}), 500)
     
     if not user:
         current_app.logger.warning(f"User not found from IP {request.remote_addr}")
-        return jsonify({"error": "사용자를 찾을 수 없습니다."}), 401
-    
-    current_app.logger.info(f"Listings request from user: {user.email} (IP: {request.remote_addr})")
+        return None, (jsonify({"error": "사용자를 찾을 수 없습니다."}), 401)
     
-    force = request.args.get("force") == "1"
-    status_raw = request.args.get("status_raw")
-    limit = int(request.args.get("limit", 100))
-    offset = int(request.args.get("offset", 0))
-
-    # 강제 새로고침 요청 시 로그
-    if force:
-        current_app.logger.info(f"🔄 강제 새로고침 요청: {user.email} (IP: {request.remote_addr})")
-
-    # force 파라미터를 제대로 전달
-    try:
-        data = load_listings(force_reload=force)
-    except Exception as e:
-        current_app.logger.error(f"❌ load_listings 실패: {str(e)}")
-        current_app.logger.error(f"❌ 에러 타입: {type(e).__name__}")
-        import traceback
-        current_app.logger.error(f"❌ 스택 트레이스: {traceback.format_exc()}")
-        return jsonify({"error": f"데이터 로드 실패: {str(e)}"}), 500
+    return user, None
 
-    # 필터
-    if status_raw:
-        data = [d for d in data if d.get("status_raw") == status_raw]
-    
+def _apply_role_scope(user, query, snapshot) -> bool:
+    """역할별 조회 범위를 query 에 반영. 조회 가능한 매물이 없으면 True"""
     # 역할별 매물 필터링 (안전한 처리)
     if user and hasattr(user, 'is_user') and hasattr(user, 'is_manager') and hasattr(user, 'is_admin'):
         try:
@@ -79,66 +69,372 @@ def api_listings():
                 # 일반 사용자는 본인 담당 매물만 조회
                 manager_name = getattr(user, 'manager_name', '')
                 if manager_name:
-                    # 디버깅: 첫 5개 매물의 담당자 정보 출력
-                    current_app.logger.info(f"🔍 디버깅: 첫 5개 매물의 담당자 정보:")
-                    for i, item in enumerate(data[:5]):
-                        current_app.logger.info(f"  매물 {i+1}: 담당자='{item.get('fields', {}).get('담당자', 'N/A')}' (타입: {type(item.get('fields', {}).get('담당자', 'N/A'))})")
-                    
-                    data = [d for d in data if d.get("fields", {}).get("담당자") == manager_name]
-                    current_app.logger.info(f"User {user.email} filtered listings by manager_name: {manager_name} ({len(data)} items)")
+                    query.manager_exact = manager_name
+                    current_app.logger.info(f"User {user.email} filtered listings by manager_name: {manager_name}")
                 else:
                     # 담당자명이 설정되지 않은 경우 빈 결과 반환
-                    data = []
                     current_app.logger.info(f"User {user.email} has no manager_name set, returning empty results")
+                    return True
             elif user.is_manager():
                 # 매니저는 모든 매물 조회 가능
-                current_app.logger.info(f"Manager {user.email} accessing all listings ({len(data)} items)")
+                current_app.logger.info(f"Manager {user.email} accessing all listings ({len(snapshot)} items)")
             elif user.is_admin():
                 # 어드민은 모든 매물 조회 가능
-                current_app.logger.info(f"Admin {user.email} accessing all listings ({len(data)} items)")
+                current_app.logger.info(f"Admin {user.email} accessing all listings ({len(snapshot)} items)")
             else:
                 # 역할이 명확하지 않은 경우 모든 매물 조회 (기본값)
-                current_app.logger.info(f"User {user.email} with unknown role accessing all listings ({len(data)} items)")
+                current_app.logger.info(f"User {user.email} with unknown role accessing all listings ({len(snapshot)} items)")
         except Exception as filter_error:
             current_app.logger.error(f"❌ 역할별 필터링 중 오류: {filter_error}")
             # 필터링 실패 시 모든 매물 조회 (안전한 기본값)
-            current_app.logger.info(f"Fallback: User {user.email} accessing all listings due to filter error ({len(data)} items)")
+            current_app.logger.info(f"Fallback: User {user.email} accessing all listings due to filter error ({len(snapshot)} items)")
     else:
         # 사용자 객체가 없거나 메서드가 없는 경우 모든 매물 조회
-        current_app.logger.warning(f"User object or role methods not available, accessing all listings ({len(data)} items)")
+        current_app.logger.warning(f"User object or role methods not available, accessing all listings ({len(snapshot)} items)")
+
+    return False
+
+@bp.route("/api/listings")
+def api_listings():
+    user, error = _authenticate()
+    if error:
+        return error
+
+    current_app.logger.info(f"Listings request from user: {user.email} (IP: {request.remote_addr})")
+    
+    force = request.args.get("force") == "1"
+    since = request.args.get("since", type=int)  # 클라이언트가 가진 스냅샷 버전
+    try:
+        sheet_type = get_sheet_schema(request.args.get("sheet")).sheet_type
+        query = ListingQuery.from_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": f"잘못된 조회 조건입니다: {str(e)}"}), 400
 
-    total = len(data)
-    sliced = data[offset:offset+limit]
+    # 강제 새로고침: 요청 스레드에서 다시 만들지 않고 백그라운드 재구성 여부만 결정 (사용자별 간격 제한)
+    rebuild = None
+    if force:
+        rebuild = admit_force_reload(user.email, sheet_type)
+        current_app.logger.info(f"🔄 강제 새로고침 요청: {user.email} (IP: {request.remote_addr}) → {rebuild['status']}")
+    force_now = rebuild is not None and rebuild["status"] == "unavailable"
+    # 응답 본문(캐시 대상)에는 상태만, 재시도 대기 시간은 캐시 조회 뒤 헤더로
+    retry_after = rebuild.pop("retry_after", None) if rebuild else None
+
+    try:
+        snapshot = get_listing_snapshot(force_reload=force_now, sheet_type=sheet_type)
+    except Exception as e:
+        current_app.logger.error(f"❌ 매물 스냅샷 로드 실패: {str(e)}")
+        current_app.logger.error(f"❌ 에러 타입: {type(e).__name__}")
+        import traceback
+        current_app.logger.error(f"❌ 스택 트레이스: {traceback.format_exc()}")
+        return jsonify({"error": f"데이터 로드 실패: {str(e)}"}), 500
+
+    deny_all = _apply_role_scope(user, query, snapshot)
+
+    # 필터/정렬/페이지는 스냅샷의 컬럼 인덱스로 서버에서 처리
+    def build_response():
+        if deny_all:
+            sliced, total = [], 0
+        else:
+            sliced, total = get_query_index(snapshot).page(query)
+        return {
+            "mode": "full",
+            "items": sliced,
+            "total": total,
+            "limit": query.limit,
+            "offset": query.offset,
+            "version": snapshot.version,
+            "force_reload": force,
+            "cache_used": not force_now,
+            "rebuild": rebuild
+        }
+
+    # 직렬화/압축 결과는 (스냅샷 버전, 역할 뷰, 조회 조건, 강제 새로고침 상태)별로 재사용
+    view_key = ("deny" if deny_all else "view", rebuild["status"] if rebuild else None, query.cache_key())
 
-    resp_dict = {
-        "items": sliced,
+    # ?since=버전: 그 이후 변경분만 응답 (기록 범위를 벗어나면 전체 데이터)
+    if since is not None and not force:
+        changes = changes_since(since, snapshot.version, sheet_type)
+        if changes is not None:
+            def build_delta():
+                if deny_all:
+                    visible_ids = set()
+                elif query.has_filters():
+                    index = get_query_index(snapshot)
+                    visible_ids = {index.items.ids[p] for p in index.evaluate(query)}
+                else:
+                    visible_ids = None
+                return build_delta_response(snapshot, since, changes, visible_ids)
+
+            payload = get_listing_payload(snapshot, ("delta", since) + view_key, build_delta)
+            return _payload_response(payload)
+        current_app.logger.info(f"ℹ️ since={since} 변경 내역 없음 → 전체 데이터 응답 (현재 {snapshot.version})")
+
+    # ?stream=1 또는 Accept: application/x-ndjson → 매물을 나눠서 바로 내보냄
+    if _wants_stream():
+        response = _stream_response(snapshot, query, deny_all, force, force_now, rebuild)
+    else:
+        payload = get_listing_payload(snapshot, view_key, build_response)
+        response = _payload_response(payload)
+    if retry_after is not None:
+        response.headers["Retry-After"] = str(retry_after)
+    return response
+
+def _wants_stream() -> bool:
+    if request.args.get("stream") == "1":
+        return True
+    return request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+def _stream_response(snapshot, query, deny_all, force, force_now=False, rebuild=None):
+    """
+    전체 응답을 NDJSON 으로 스트리밍 (첫 줄 메타, 이후 매물 한 줄씩, 마지막 줄 done)
+    페이지의 행 위치만 먼저 계산하고 매물 dict 는 보내는 시점에 스냅샷에서 만든다.
+    """
+    if deny_all:
+        window, total = [], 0
+    else:
+        window, total = get_query_index(snapshot).page_positions(query)
+    meta = {
+        "mode": "stream",
         "total": total,
-        "limit": limit,
-        "offset": offset,
+        "count": len(window),
+        "limit": query.limit,
+        "offset": query.offset,
+        "version": snapshot.version,
         "force_reload": force,
-        "cache_used": not force
+        "cache_used": not force_now,
+        "rebuild": rebuild
     }
+    items = snapshot.items
+    body = iter_ndjson(meta, (items[p] for p in window))
     return current_app.response_class(
-        json.dumps(resp_dict, ensure_ascii=False),
-        mimetype="application/json; charset=utf-8"
+        body,
+        mimetype=NDJSON_MIMETYPE,
+        headers={
+            "Cache-Control": "private, no-cache",
+            "Vary": "Accept, X-User, Cookie",
+            "X-Accel-Buffering": "no",  # 프록시(nginx) 버퍼링 없이 바로 전달
+        }
     )
 
+@bp.route("/api/listings/clusters")
+def api_listing_clusters():
+    """지도 마커 클러스터 (bbox, zoom): 스냅샷마다 미리 계산한 줌 레벨별 클러스터 사용"""
+    user, error = _authenticate()
+    if error:
+        return error
+
+    zoom = request.args.get("zoom", type=int)
+    if zoom is None:
+        return jsonify({"error": "zoom 파라미터가 필요합니다."}), 400
+    try:
+        sheet_type = get_sheet_schema(request.args.get("sheet")).sheet_type
+        query = ListingQuery.from_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": f"잘못된 조회 조건입니다: {str(e)}"}), 400
+
+    try:
+        snapshot = get_listing_snapshot(sheet_type=sheet_type)
+    except Exception as e:
+        current_app.logger.error(f"❌ 매물 스냅샷 로드 실패: {str(e)}")
+        return jsonify({"error": f"데이터 로드 실패: {str(e)}"}), 500
+
+    deny_all = _apply_role_scope(user, query, snapshot)
+    clusters = get_cluster_index(snapshot)
+    # 클러스터 구성은 화면 영역과 무관하게 하고 bbox 는 결과 클러스터 선택에만 사용
+    bbox, query.bbox = query.bbox, None
+
+    def build():
+        if deny_all:
+            level = clusters.level_for_positions(zoom, [])
+        elif query.has_filters():
+            # 필터/담당자 제한이 있으면 해당 매물만으로 이 줌 레벨을 계산
+            level = clusters.level_for_positions(zoom, get_query_index(snapshot).evaluate(query))
+        else:
+            level = clusters.level(zoom)
+        return build_cluster_response(snapshot, level, bbox)
+
+    # 클러스터는 정렬/페이지와 무관하므로 필터 조건만 키에 포함
+    key = ("clusters", clusters.clamp_zoom(zoom), bbox, "deny" if deny_all else "view", query.filter_key())
+    return _payload_response(get_listing_payload(snapshot, key, build))
+
+@bp.route("/api/listings/facets")
+def api_listing_facets():
+    """필터 UI 용 집계: 지역/지역2/현황/층수 값별 개수와 보증금/월세/권리금/면적 히스토그램"""
+    user, error = _authenticate()
+    if error:
+        return error
+
+    try:
+        sheet_type = get_sheet_schema(request.args.get("sheet")).sheet_type
+        query = ListingQuery.from_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": f"잘못된 조회 조건입니다: {str(e)}"}), 400
+
+    try:
+        snapshot = get_listing_snapshot(sheet_type=sheet_type)
+    except Exception as e:
+        current_app.logger.error(f"❌ 매물 스냅샷 로드 실패: {str(e)}")
+        return jsonify({"error": f"데이터 로드 실패: {str(e)}"}), 500
+
+    deny_all = _apply_role_scope(user, query, snapshot)
+
+    def build():
+        facets = get_facet_index(snapshot)
+        if deny_all:
+            data = facets.aggregate([])
+        elif query.has_filters():
+            # 필터된 부분 집합은 해당 행 위치만 다시 집계
+            data = facets.aggregate(get_query_index(snapshot).evaluate(query))
+        else:
+            data = facets.aggregate()
+        data["version"] = snapshot.version
+        return data
+
+    # (스냅샷 버전, 필터 조건)별 캐시: 정렬/페이지는 결과에 영향이 없으므로 키에서 제외
+    key = ("facets", "deny" if deny_all else "view", query.filter_key())
+    return _payload_response(get_listing_payload(snapshot, key, build))
+
+@bp.route("/api/listings/nearest")
+def api_listing_nearest():
+    """
+    (lat, lng) 에서 가까운 매물 limit 개 (기본 20): 거리(m)는 서버에서 haversine 으로 계산
+    /api/listings 와 같은 필터를 함께 쓸 수 있음 (예: status_raw=생). radius=최대 거리(m)
+    """
+    user, error = _authenticate()
+    if error:
+        return error
+
+    try:
+        sheet_type = get_sheet_schema(request.args.get("sheet")).sheet_type
+        lat, lng = parse_point(request.args.get("lat"), request.args.get("lng"))
+        limit = max(0, min(int(request.args.get("limit", DEFAULT_NEAREST_LIMIT)), MAX_NEAREST_LIMIT))
+        radius = parse_radius(request.args.get("radius"))
+        query = ListingQuery.from_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": f"잘못된 조회 조건입니다: {str(e)}"}), 400
+
+    try:
+        snapshot = get_listing_snapshot(sheet_type=sheet_type)
+    except Exception as e:
+        current_app.logger.error(f"❌ 매물 스냅샷 로드 실패: {str(e)}")
+        return jsonify({"error": f"데이터 로드 실패: {str(e)}"}), 500
+
+    deny_all = _apply_role_scope(user, query, snapshot)
+    # 순서는 거리로 정하므로 정렬/페이지 조건은 무시
+    query.sort, query.limit, query.offset = None, 0, 0
+
+    def build():
+        nearest = get_nearest_index(snapshot)
+        if deny_all:
+            candidates = []
+        elif query.has_filters():
+            candidates = get_query_index(snapshot).evaluate(query)
+        else:
+            candidates = None
+        positions, distances, total = nearest.nearest(lat, lng, limit, candidates, radius)
+        return build_nearest_response(snapshot, lat, lng, positions, distances, total)
+
+    key = ("nearest", lat, lng, limit, radius, "deny" if deny_all else "view", query.filter_key())
+    return _payload_response(get_listing_payload(snapshot, key, build))
+
+@bp.route("/api/listings/matches")
+def api_listing_matches():
+    """
+    고객 조건(filter_data) ↔ 매물 매칭
+    customer_id 가 있으면 그 고객의 순위별 매물, 없으면 조회 가능한 고객 전체를 한 번에 매칭
+    """
+    user, error = _authenticate()
+    if error:
+        return error
+
+    customer_id = request.args.get("customer_id")
+    try:
+        sheet_type = get_sheet_schema(request.args.get("sheet")).sheet_type
+        limit = max(0, min(int(request.args.get("limit", DEFAULT_MATCH_LIMIT)), 500))
+    except ValueError as e:
+        return jsonify({"error": f"잘못된 조회 조건입니다: {str(e)}"}), 400
+
+    try:
+        snapshot = get_listing_snapshot(sheet_type=sheet_type)
+    except Exception as e:
+        current_app.logger.error(f"❌ 매물 스냅샷 로드 실패: {str(e)}")
+        return jsonify({"error": f"데이터 로드 실패: {str(e)}"}), 500
+
+    # 고객 목록은 고객 API 와 같은 역할별 규칙으로 조회
+    from ..services import store
+    customers = store.list_customers(user.email, request.args.get("filter", "own"), request.args.get("manager", ""))
+    if customer_id:
+        customers = [c for c in customers if str(c.get("id")) == customer_id]
+        if not customers:
+            return jsonify({"error": "고객을 찾을 수 없습니다."}), 404
+
+    base = ListingQuery()
+    deny_all = _apply_role_scope(user, base, snapshot)
+    results = match_customers(snapshot, customers, base, limit, deny_all=deny_all)
+
+    if customer_id:
+        result = results[0]
+        result["listings"] = [snapshot.get(m["id"]) for m in result["matches"]]
+        result["version"] = snapshot.version
+        return jsonify(result)
+    return jsonify({"version": snapshot.version, "customers": results, "total": len(results)})
+
+@bp.route("/api/listings/match-events")
+def api_listing_match_events():
+    """동기화로 추가/변경된 매물이 어떤 고객 조건에 맞는지 (?since=마지막으로 받은 seq)"""
+    user, error = _authenticate()
+    if error:
+        return error
+
+    since = request.args.get("since", 0, type=int)
+    manager_name = None
+    if user.is_user():
+        # 일반 사용자는 본인 담당 고객의 이벤트만
+        manager_name = getattr(user, 'manager_name', '')
+        if not manager_name:
+            return jsonify({"events": [], "last_seq": since})
+
+    events = match_events(since, manager_name)
+    return jsonify({"events": events, "last_seq": events[-1]["seq"] if events else since})
+
+def _payload_response(payload):
+    """캐시된 직렬화 결과로 응답 생성 (If-None-Match 일치 시 304)"""
+    encoding = "identity"
+    if len(payload.body) >= current_app.config.get("COMPRESS_MIN_SIZE", 500):
+        encoding = request.accept_encodings.best_match(SUPPORTED_ENCODINGS) or "identity"
+
+    etag = payload.etag(encoding)
+    headers = {
+        "ETag": f'"{etag}"',
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept, Accept-Encoding, X-User, Cookie",
+    }
+    if request.if_none_match.contains_weak(etag):
+        return current_app.response_class(status=304, headers=headers)
+
+    response = current_app.response_class(
+        payload.encoded(encoding),
+        mimetype="application/json; charset=utf-8",
+        headers=headers
+    )
+    if encoding != "identity":
+        # Flask-Compress 는 Content-Encoding 이 있으면 다시 압축하지 않음
+        response.headers["Content-Encoding"] = encoding
+    return response
+
 @bp.route("/api/listings/clear-cache", methods=["POST"])
 def clear_listings_cache():
-    """매물 캐시 강제 삭제 (관리자용)"""
+    """매물 캐시 강제 삭제 (관리자용): 캐시 파일 삭제 후 모든 워커의 스냅샷을 원본에서 다시 만든다"""
     try:
-        if clear_listing_cache():
-            current_app.logger.info("매물 캐시 삭제 완료")
-            return jsonify({
-                "success": True,
-                "message": "매물 캐시가 삭제되었습니다. 다음 요청 시 파일에서 새로 로드됩니다."
-            })
+        removed = clear_listing_cache()
+        warming = invalidate_listing_snapshots()
+        current_app.logger.info(f"매물 캐시 삭제 완료 (파일 삭제: {removed}, 백그라운드 재구성: {warming})")
+        if warming:
+            message = "매물 캐시가 삭제되었습니다. 원본 파일에서 다시 불러오는 중이며, 완료 전까지는 기존 데이터가 제공됩니다."
         else:
-            return jsonify({
-                "success": False,
-                "message": "캐시 파일이 존재하지 않습니다."
-            })
-            
+            message = "매물 캐시가 삭제되었습니다. 다음 요청 시 원본 파일에서 다시 불러옵니다."
+        return jsonify({"success": True, "message": message})
+
     except Exception as e:
         current_app.logger.error(f"캐시 삭제 실패: {e}")
         return jsonify({
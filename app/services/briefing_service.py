@@ -130,14 +130,13 @@ class BriefingService:
                 print(f"❌ 권한 없음: {user_email}")
                 return None
             
-            # 매물 정보 로드
-            from .listings_loader import load_listings
-            all_listings = {lst["id"]: lst for lst in load_listings()}
+            # 매물 정보: 현재 스냅샷에서 브리핑의 매물만 조회 (전체 목록을 만들지 않음)
+            from .listings_loader import get_listing_snapshot
+            snapshot = get_listing_snapshot()
             
-            # 브리핑의 매물들만 필터링
             items = []
             for listing_id in briefing["listing_ids"]:
-                base_listing = all_listings.get(listing_id)
+                base_listing = snapshot.get(listing_id)
                 if not base_listing:
                     continue
                 
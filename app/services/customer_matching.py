@@ -0,0 +1,198 @@
+# app/services/customer_matching.py
+
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..core.utils import to_float_or_none
+from .listing_query import ListingQuery, NumRange, get_query_index, parse_floor_filter, parse_num_filter, parse_text_tokens
+from .store import normalize_region
+
+# 고객 필터로 쓰는 키 (customer-management.js 의 customerFilterKeys 와 동일)
+CUSTOMER_FILTER_KEYS = ("region", "region2", "floor", "area_real", "deposit", "rent", "premium")
+
+# filter_data 가 없는 예전 고객의 필드 → 필터 키
+_LEGACY_FIELDS = {"region": "regions", "floor": "floor", "area_real": "area",
+                  "deposit": "deposit", "rent": "rent", "premium": "premium"}
+
+DEFAULT_MATCH_LIMIT = 20
+MAX_PARSED_CRITERIA = 2048
+
+
+@dataclass
+class CustomerCriteria:
+    """고객 한 명의 매칭 조건 (고객 데이터가 바뀌지 않으면 다시 파싱하지 않음)"""
+    customer_id: str
+    name: str
+    filters: Dict[str, str] = field(default_factory=dict)  # 정리된 원본 조건 (응답 표시용)
+    query: ListingQuery = field(default_factory=ListingQuery)
+
+
+def customer_filter_data(customer: dict) -> Dict[str, str]:
+    """고객의 저장된 필터데이터 (filter_data JSON, 없으면 예전 필드) 중 값이 있는 것만"""
+    raw = customer.get("filter_data")
+    data = None
+    if isinstance(raw, dict):
+        data = raw
+    elif isinstance(raw, str) and raw.strip():
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            data = None
+    if not isinstance(data, dict):
+        data = {key: customer.get(col, "") for key, col in _LEGACY_FIELDS.items()}
+    return {k: str(v).strip() for k, v in data.items()
+            if k in CUSTOMER_FILTER_KEYS and v is not None and str(v).strip() not in ("", "nan")}
+
+
+def _is_district(region: str) -> bool:
+    # 시군구 단위 (구, 시 포함) 는 지역2, 나머지는 지역으로 검색
+    return "구" in region or "시" in region
+
+
+def _budget_range(value: str) -> Optional[NumRange]:
+    """보증금/월세/권리금: 단일값은 0 ~ 입력값, 범위는 그대로"""
+    if "-" in value or "~" in value:
+        return parse_num_filter(value, "lte")
+    n = to_float_or_none(value)
+    if n is not None and n > 0:
+        return NumRange(0, n)
+    return parse_num_filter(value, "lte")
+
+
+def _area_range(value: str) -> Optional[NumRange]:
+    """실평수: 단일값은 입력값 이상, 범위는 그대로"""
+    if "-" in value or "~" in value:
+        return parse_num_filter(value, "gte")
+    n = to_float_or_none(value)
+    if n is not None and n > 0:
+        return NumRange(n, None)
+    return parse_num_filter(value, "gte")
+
+
+def build_customer_criteria(customer: dict) -> CustomerCriteria:
+    """
+    고객 조건 → ListingQuery (프론트엔드 고객 필터 적용 규칙과 같음)
+    - 지역: 쉼표로 여러 개, 정규화 후 시군구 단위는 지역2 / 읍면동은 지역
+    - 층수: 지역명이 잘못 들어간 경우 지역2 로 사용
+    """
+    filters = customer_filter_data(customer)
+    query = ListingQuery(limit=0)
+    region, region2 = [], []
+    for key, value in filters.items():
+        if key == "region":
+            for token in parse_text_tokens(value):
+                name = normalize_region(token)
+                (region2 if _is_district(name) else region).append(name)
+        elif key == "region2":
+            region2.extend(normalize_region(t) for t in parse_text_tokens(value))
+        elif key == "floor":
+            if _is_district(value):
+                region2 = [normalize_region(value)]
+            else:
+                query.floor = parse_floor_filter(value)
+        elif key == "area_real":
+            rng = _area_range(value)
+            if rng is not None:
+                query.numeric[key] = rng
+        else:
+            rng = _budget_range(value)
+            if rng is not None:
+                query.numeric[key] = rng
+    if region:
+        query.text["region"] = region
+    if region2:
+        query.text["region2"] = region2
+    return CustomerCriteria(str(customer.get("id", "")), str(customer.get("name", "")), filters, query)
+
+
+# 파싱된 고객 조건 캐시: (고객 ID, 필터데이터) → CustomerCriteria
+_criteria_cache: "OrderedDict[tuple, CustomerCriteria]" = OrderedDict()
+_criteria_lock = threading.Lock()
+
+
+def get_customer_criteria(customer: dict) -> CustomerCriteria:
+    """고객 조건을 한 번만 파싱 (같은 고객이라도 조건이 바뀌면 다시 파싱)"""
+    key = (customer.get("id"), customer.get("filter_data"),
+           tuple(str(customer.get(col, "")) for col in _LEGACY_FIELDS.values()))
+    with _criteria_lock:
+        criteria = _criteria_cache.get(key)
+        if criteria is not None:
+            _criteria_cache.move_to_end(key)
+            return criteria
+    criteria = build_customer_criteria(customer)
+    with _criteria_lock:
+        _criteria_cache[key] = criteria
+        while len(_criteria_cache) > MAX_PARSED_CRITERIA:
+            _criteria_cache.popitem(last=False)
+    return criteria
+
+
+class MatchIndex:
+    """스냅샷 단위 매칭 보조 데이터: 조건 컬럼별 '값이 있는 행' 비트맵 (순위 계산용)"""
+
+    def __init__(self, snapshot):
+        index = get_query_index(snapshot)
+        self.index = index
+        self.ids = snapshot.items.ids
+        self.present: Dict[str, np.ndarray] = {}
+        for key, rng in index.range_indexes.items():
+            self.present[key] = self._present(rng)
+        self.present["floor"] = self._present(index.floor_range)
+
+    @staticmethod
+    def _present(rng) -> np.ndarray:
+        present = np.ones(rng.size, dtype=bool)
+        present[rng.missing] = False
+        return present
+
+    def match(self, criteria: CustomerCriteria, base: Optional[ListingQuery] = None,
+              limit: int = DEFAULT_MATCH_LIMIT, deny_all: bool = False) -> dict:
+        """
+        조건에 맞는 매물을 순위순으로 반환.
+        점수 = 고객 조건 중 매물에 실제 값이 있어 확인된 비율 (값이 없는 항목은 통과하지만 점수는 낮음)
+        점수가 같으면 최근 등록(아래 행) 순.
+        base 는 역할 기반 제한(담당자 등)을 담은 조회 조건, deny_all 이면 조회 가능한 매물이 없음.
+        """
+        query = criteria.query
+        if base is not None and base.manager_exact is not None:
+            query = ListingQuery(text=query.text, numeric=query.numeric, floor=query.floor,
+                                 manager_exact=base.manager_exact)
+        if deny_all:
+            positions = np.empty(0, dtype=np.int64)
+        else:
+            positions = self.index.positions(query).astype(np.int64, copy=False)
+
+        keys = list(query.numeric) + (["floor"] if query.floor is not None else [])
+        if keys and len(positions):
+            confirmed = np.zeros(len(positions), dtype=np.int32)
+            for key in keys:
+                confirmed += self.present[key][positions]
+            scores = confirmed / len(keys)
+        else:
+            scores = np.ones(len(positions), dtype=np.float64)
+        # 점수 내림차순, 같은 점수는 행 위치 내림차순 (최신순)
+        order = np.lexsort((-positions, -scores))[:limit]
+        return {
+            "customer_id": criteria.customer_id,
+            "name": criteria.name,
+            "criteria": criteria.filters,
+            "total": int(len(positions)),
+            "matches": [{"id": self.ids[int(positions[i])], "score": round(float(scores[i]), 3)} for i in order],
+        }
+
+
+def get_match_index(snapshot) -> MatchIndex:
+    """스냅샷에 연결된 매칭 인덱스 (스냅샷마다 한 번만 생성)"""
+    return snapshot.derived("match_index", MatchIndex)
+
+
+def match_customers(snapshot, customers: Sequence[dict], base: Optional[ListingQuery] = None,
+                    limit: int = DEFAULT_MATCH_LIMIT, deny_all: bool = False) -> List[dict]:
+    """여러 고객을 한 번에 매칭 (같은 스냅샷 인덱스 공유)"""
+    index = get_match_index(snapshot)
+    return [index.match(get_customer_criteria(c), base, limit, deny_all) for c in customers]
@@ -5,6 +5,7 @@ import pandas as pd
 from typing import List, Dict, Any, Optional
 from flask import current_app
 from ..models.customer import Customer
+from ..core.utils import build_manager_partition, manager_positions
 
 class CustomerService:
     """고객 관련 비즈니스 로직 서비스"""
@@ -191,7 +192,8 @@ class CustomerService:
         elif filter_type == 'manager':
             # 특정 매니저의 고객
             if manager and 'manager' in filtered_df.columns:
-                filtered_df = filtered_df[filtered_df['manager'] == manager]
+                partition = build_manager_partition(filtered_df['manager'].astype(str).tolist())
+                filtered_df = filtered_df.iloc[manager_positions(partition, manager)]
         
         return filtered_df
     
@@ -6,9 +6,12 @@ import logging
 import pandas as pd
 import requests
 from typing import Dict, List, Tuple, Optional
-from flask import current_app
-from .sheet_fetcher import read_local_listing_sheet
+from flask import current_app, has_app_context
 from .geocode_cache import load_geocode_cache, save_geocode_cache
+from ..core.singleflight import KeyedLoader
+
+# 지도캐시 좌표 (파일 버전별 결과를 인스턴스 간에 공유)
+_existing_coordinates = KeyedLoader()
 
 class GeocodingService:
     """지오코딩 자동화 서비스"""
@@ -98,70 +101,40 @@ class GeocodingService:
             self.logger.info(f"data_dir이 설정되지 않아 기본값 사용: {self.data_dir}")
     
     def extract_addresses_from_listings(self) -> List[str]:
-        """상가임대차.xlsx에서 현황이 '생'인 매물의 주소만 추출"""
+        """상가임대차 스냅샷에서 현황이 '생'인 매물의 주소만 추출 (원본을 다시 읽지 않고 캐시된 파싱 결과 사용)"""
         try:
-            # 파일 경로 직접 확인
-            filename = os.getenv("LISTING_SHEET_FILENAME", "상가임대차.xlsx")
-            data_dir = os.getenv("DATA_DIR", "./data")
-            source_path = os.path.join(data_dir, "raw", filename)
-            
-            self.logger.info(f"상가임대차 파일 경로: {source_path}")
-            
-            if not os.path.exists(source_path):
-                self.logger.error(f"상가임대차 파일이 존재하지 않습니다: {source_path}")
+            if not has_app_context():
+                self.logger.error("Flask 앱 컨텍스트가 없어 매물 스냅샷을 읽을 수 없습니다.")
                 return []
-            
-            try:
-                rows = read_local_listing_sheet()
-            except Exception as e:
-                self.logger.error(f"상가임대차 파일 읽기 실패: {e}")
-                # 직접 파일 읽기 시도
-                try:
-                    self.logger.info("직접 파일 읽기 시도...")
-                    df = pd.read_excel(source_path, dtype=str, engine='openpyxl').fillna("")
-                    rows = [df.columns.tolist()] + df.values.tolist()
-                    self.logger.info(f"직접 파일 읽기 성공: {len(rows)}행")
-                except Exception as e2:
-                    self.logger.error(f"직접 파일 읽기도 실패: {e2}")
-                    return []
-                
-            if not rows or len(rows) < 2:
+
+            from .listings_loader import get_listing_snapshot
+            # 동기화 직후에도 최신 원본 기준으로 추출하도록 재구성된 스냅샷을 기다림
+            items = get_listing_snapshot(sheet_type="lease", allow_stale=False).items
+            if not len(items):
                 self.logger.warning("상가임대차 데이터가 없습니다.")
                 return []
-            
-            header = rows[0]
-            hdr_map = self._normalize_headers(header)
-            
+
+            # 컬럼 단위로 읽음 (매물 dict 를 만들지 않음)
+            status = items.status_column_values()
+            region2 = items.field_column("지역2") if "지역2" in items.field_names else [""] * len(items)
+            region = items.field_column("지역") if "지역" in items.field_names else [""] * len(items)
+            lot = items.field_column("지번") if "지번" in items.field_names else [""] * len(items)
+
             addresses = []
-            for i, row in enumerate(rows[1:], start=1):
-                try:
-                    # 현황이 '생'인 매물만 처리
-                    status = row[hdr_map.get("현황", -1)] if "현황" in hdr_map else ""
-                    if status != "생":
-                        continue  # 현황이 '생'이 아닌 매물은 건너뛰기
-                    
-                    # 주소 구성: 지역2 + 지역 + 지번
-                    region2 = row[hdr_map.get("지역2", -1)] if "지역2" in hdr_map else ""
-                    region = row[hdr_map.get("지역", -1)] if "지역" in hdr_map else ""
-                    lot = row[hdr_map.get("지번", -1)] if "지번" in hdr_map else ""
-                    
-                    # 주소가 완성된 경우만 추가
-                    if region2 and region and lot:
-                        address = f"{region2} {region} {lot}".strip()
-                        # 줄바꿈 문자 제거 및 정리
-                        address = address.replace('\n', ' ').replace('\r', ' ').strip()
-                        # 연속된 공백을 하나로
-                        address = ' '.join(address.split())
-                        if address and address not in addresses:
-                            addresses.append(address)
-                            
-                except Exception as e:
-                    self.logger.warning(f"Row {i} 주소 파싱 실패: {e}")
+            seen = set()
+            for st, r2, r, l in zip(status, region2, region, lot):
+                # 현황이 '생'이고 주소(지역2 + 지역 + 지번)가 완성된 매물만
+                if st.strip() != "생" or not (r2 and r and l):
                     continue
-            
+                # 줄바꿈/연속 공백 정리
+                address = " ".join(f"{r2} {r} {l}".split())
+                if address and address not in seen:
+                    seen.add(address)
+                    addresses.append(address)
+
             self.logger.info(f"상가임대차에서 현황이 '생'인 매물 {len(addresses)}개 주소 추출 완료")
             return addresses
-            
+
         except Exception as e:
             self.logger.error(f"주소 추출 실패: {e}")
             return []
@@ -188,49 +161,54 @@ class GeocodingService:
                 self.logger.warning(f"지도캐시 파일이 없습니다: {map_cache_path}")
                 return {}
             
-            # Excel 파일 읽기 (여러 엔진 시도)
-            df = None
-            try:
-                # 1. openpyxl 엔진 시도
-                df = pd.read_excel(map_cache_path, dtype=str, engine='openpyxl').fillna("")
-            except Exception as e1:
-                try:
-                    # 2. xlrd 엔진 시도
-                    df = pd.read_excel(map_cache_path, dtype=str, engine='xlrd').fillna("")
-                except Exception as e2:
-                    try:
-                        # 3. 기본 엔진 시도
-                        df = pd.read_excel(map_cache_path, dtype=str).fillna("")
-                    except Exception as e3:
-                        try:
-                            # 4. odf 엔진 시도
-                            df = pd.read_excel(map_cache_path, dtype=str, engine='odf').fillna("")
-                        except Exception as e4:
-                            self.logger.error(f"지도캐시 Excel 읽기 실패: 모든 엔진 실패")
-                            return {}
-            
-            coordinates = {}
-            for _, row in df.iterrows():
-                addr = row.get("주소", "").strip()
-                lat = row.get("위도", "").strip()
-                lng = row.get("경도", "").strip()
-                
-                if addr and lat and lng:
-                    try:
-                        lat_val = float(lat)
-                        lng_val = float(lng)
-                        if -90 <= lat_val <= 90 and -180 <= lng_val <= 180:
-                            coordinates[addr] = (lat_val, lng_val)
-                    except ValueError:
-                        continue
-            
-            self.logger.info(f"지도캐시에서 {len(coordinates)}개 좌표 로드 완료")
-            return coordinates
+            # 같은 파일 버전이면 마지막 결과 재사용, 동시 호출은 한 번의 읽기로 합침
+            key = (map_cache_path, os.path.getmtime(map_cache_path))
+            return _existing_coordinates.get(key, lambda: self._read_coordinates(map_cache_path))
             
         except Exception as e:
             self.logger.error(f"지도캐시 읽기 실패: {e}")
             return {}
     
+    def _read_coordinates(self, map_cache_path: str) -> Dict[str, Tuple[float, float]]:
+        """지도캐시 Excel 에서 {주소: (위도, 경도)} 읽기 (모든 엔진 실패 시 예외)"""
+        # Excel 파일 읽기 (여러 엔진 시도)
+        df = None
+        try:
+            # 1. openpyxl 엔진 시도
+            df = pd.read_excel(map_cache_path, dtype=str, engine='openpyxl').fillna("")
+        except Exception as e1:
+            try:
+                # 2. xlrd 엔진 시도
+                df = pd.read_excel(map_cache_path, dtype=str, engine='xlrd').fillna("")
+            except Exception as e2:
+                try:
+                    # 3. 기본 엔진 시도
+                    df = pd.read_excel(map_cache_path, dtype=str).fillna("")
+                except Exception as e3:
+                    try:
+                        # 4. odf 엔진 시도
+                        df = pd.read_excel(map_cache_path, dtype=str, engine='odf').fillna("")
+                    except Exception as e4:
+                        raise Exception("지도캐시 Excel 읽기 실패: 모든 엔진 실패") from e4
+        
+        coordinates = {}
+        for _, row in df.iterrows():
+            addr = row.get("주소", "").strip()
+            lat = row.get("위도", "").strip()
+            lng = row.get("경도", "").strip()
+            
+            if addr and lat and lng:
+                try:
+                    lat_val = float(lat)
+                    lng_val = float(lng)
+                    if -90 <= lat_val <= 90 and -180 <= lng_val <= 180:
+                        coordinates[addr] = (lat_val, lng_val)
+                except ValueError:
+                    continue
+        
+        self.logger.info(f"지도캐시에서 {len(coordinates)}개 좌표 로드 완료")
+        return coordinates
+    
     def geocode_address(self, address: str) -> Optional[Tuple[float, float]]:
         """네이버 지오코딩 API로 주소를 좌표로 변환"""
         # API 키 상태 확인 (로그에는 노출하지 않음)
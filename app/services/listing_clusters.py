@@ -0,0 +1,144 @@
+# app/services/listing_clusters.py
+
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .listing_spatial import BBox, get_spatial_index
+
+# 프론트엔드 MarkerClustering 설정과 동일 (map-markers.js)
+GRID_SIZE_PX = 80
+MIN_CLUSTER_SIZE = 2
+
+# 네이버 지도 줌 범위
+MIN_ZOOM = 6
+MAX_ZOOM = 21
+
+_TILE_SIZE = 256
+
+
+def _world_pixels(lats: np.ndarray, lngs: np.ndarray, zoom: int):
+    """위경도 → 해당 줌의 웹 메르카토르 픽셀 좌표"""
+    scale = _TILE_SIZE * (2 ** zoom)
+    x = (lngs + 180.0) / 360.0 * scale
+    sin = np.clip(np.sin(np.radians(lats)), -0.9999, 0.9999)
+    y = (0.5 - np.log((1 + sin) / (1 - sin)) / (4 * math.pi)) * scale
+    return x, y
+
+
+class ClusterLevel:
+    """한 줌 레벨의 클러스터 목록 (격자 칸 하나가 클러스터 하나)"""
+
+    def __init__(self, zoom: int, lats: np.ndarray, lngs: np.ndarray, ids: List[str]):
+        self.zoom = zoom
+        self.lats = lats      # 클러스터 중심 위도
+        self.lngs = lngs      # 클러스터 중심 경도
+        self.ids = ids        # 클러스터별 소속 매물 ID 목록
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def in_bbox(self, bbox: Optional[BBox]) -> List[dict]:
+        """bbox 안에 중심이 있는 클러스터 (bbox 가 없으면 전체)"""
+        if bbox is None:
+            selected = range(len(self.ids))
+        else:
+            min_lat, min_lng, max_lat, max_lng = bbox
+            mask = (self.lats >= min_lat) & (self.lats <= max_lat) & (self.lngs >= min_lng) & (self.lngs <= max_lng)
+            selected = np.flatnonzero(mask).tolist()
+        lats, lngs = self.lats.tolist(), self.lngs.tolist()
+        return [
+            {"lat": lats[i], "lng": lngs[i], "count": len(self.ids[i]), "ids": self.ids[i]}
+            for i in selected
+        ]
+
+
+class ClusterIndex:
+    """
+    스냅샷 좌표로 만드는 줌 레벨별 격자 클러스터.
+
+    가장 큰 줌의 GRID_SIZE_PX 격자 칸을 구한 뒤 한 단계 줌아웃할 때마다 칸 번호를 절반(>>1)으로
+    접기 때문에 각 레벨의 클러스터는 아래 레벨 클러스터들을 정확히 묶은 계층 구조가 된다.
+    """
+
+    def __init__(self, lats: Sequence[Optional[float]], lngs: Sequence[Optional[float]],
+                 ids: Sequence[str], min_zoom: int = MIN_ZOOM, max_zoom: int = MAX_ZOOM):
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.ids = ids
+
+        self.positions = np.array([p for p, (lat, lng) in enumerate(zip(lats, lngs))
+                                   if lat is not None and lng is not None], dtype=np.int64)
+        self.lats = np.array([lats[p] for p in self.positions.tolist()], dtype=np.float64)
+        self.lngs = np.array([lngs[p] for p in self.positions.tolist()], dtype=np.float64)
+
+        # 위치 → 좌표 배열 인덱스 (좌표 없는 매물은 -1)
+        self.slot = np.full(len(ids), -1, dtype=np.int64)
+        self.slot[self.positions] = np.arange(len(self.positions))
+
+        x, y = _world_pixels(self.lats, self.lngs, max_zoom)
+        self.cell_x = np.floor(x / GRID_SIZE_PX).astype(np.int64)
+        self.cell_y = np.floor(y / GRID_SIZE_PX).astype(np.int64)
+
+        self.levels: Dict[int, ClusterLevel] = {
+            zoom: self._build_level(zoom, np.arange(len(self.positions)))
+            for zoom in range(min_zoom, max_zoom + 1)
+        }
+
+    def clamp_zoom(self, zoom: int) -> int:
+        return max(self.min_zoom, min(self.max_zoom, zoom))
+
+    def _build_level(self, zoom: int, slots: np.ndarray) -> ClusterLevel:
+        """좌표 배열 인덱스 slots 를 zoom 레벨 격자로 묶음"""
+        if len(slots) == 0:
+            return ClusterLevel(zoom, np.empty(0), np.empty(0), [])
+        shift = self.max_zoom - zoom
+        cx = self.cell_x[slots] >> shift
+        cy = self.cell_y[slots] >> shift
+        keys = np.stack([cx, cy], axis=1)
+        _, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        counts = np.bincount(inverse)
+        lats = np.bincount(inverse, weights=self.lats[slots]) / counts
+        lngs = np.bincount(inverse, weights=self.lngs[slots]) / counts
+
+        # 클러스터별 소속 매물 (원본 행 순서 유지)
+        order = np.argsort(inverse, kind="stable")
+        groups = np.split(self.positions[slots][order], np.cumsum(counts)[:-1])
+        ids = [[self.ids[p] for p in group.tolist()] for group in groups]
+        return ClusterLevel(zoom, lats, lngs, ids)
+
+    def level(self, zoom: int) -> ClusterLevel:
+        return self.levels[self.clamp_zoom(zoom)]
+
+    def level_for_positions(self, zoom: int, positions: Sequence[int]) -> ClusterLevel:
+        """필터가 적용된 매물 위치만으로 zoom 레벨 클러스터를 계산"""
+        slots = self.slot[np.asarray(positions, dtype=np.int64)] if len(positions) else np.empty(0, dtype=np.int64)
+        return self._build_level(self.clamp_zoom(zoom), slots[slots >= 0])
+
+
+def get_cluster_index(snapshot) -> ClusterIndex:
+    """스냅샷에 연결된 클러스터 인덱스 (스냅샷마다 한 번만 생성)"""
+    def build(snap):
+        spatial = get_spatial_index(snap)
+        return ClusterIndex(spatial.lats, spatial.lngs, snap.items.ids)
+    return snapshot.derived("cluster_index", build)
+
+
+def build_cluster_response(snapshot, level: ClusterLevel, bbox: Optional[BBox]) -> dict:
+    """클러스터 응답: MIN_CLUSTER_SIZE 미만은 개별 마커로 내려준다"""
+    clusters, markers = [], []
+    for cluster in level.in_bbox(bbox):
+        if cluster["count"] >= MIN_CLUSTER_SIZE:
+            clusters.append(cluster)
+        else:
+            markers.append({"id": cluster["ids"][0], "lat": cluster["lat"], "lng": cluster["lng"]})
+    return {
+        "zoom": level.zoom,
+        "version": snapshot.version,
+        "clusters": clusters,
+        "markers": markers,
+        "total": sum(c["count"] for c in clusters) + len(markers),
+    }
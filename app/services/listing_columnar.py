@@ -0,0 +1,307 @@
+# app/services/listing_columnar.py
+
+import os
+import json
+import mmap
+import struct
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .listing_compact import sorted_ids
+
+# 정규화된 매물 스냅샷 디스크 캐시 (listing_sheet_cache.pkl 대체)
+LISTING_SNAPSHOT_FILE = "./data/cache/listing_snapshot.bin"
+_SHEET_SNAPSHOT_FILE = "./data/cache/listing_snapshot_{sheet_type}.bin"
+
+# 파일 구조: MAGIC(8) | 헤더 길이(uint64 LE) | 헤더 JSON | 8바이트 정렬된 배열들
+_MAGIC = b"LSNAP\x00\x00\x01"
+_ALIGN = 8
+FORMAT_VERSION = 8  # 2: 내용 기반 매물 ID, 3: 시트별 numeric_cache 키, 4: 스냅샷 버전, 5: 호실 구분 ID 기준 컬럼, 6: int64 밖 숫자 보존, 7: 위치 기반 ID 기준 컬럼, 8: 정렬된 ID 배열
+
+NUMERIC_KEYS = ("deposit", "rent", "premium", "area", "total")
+NULL_INT = np.iinfo(np.int64).min  # numeric_cache 의 None 표현
+
+
+def columnar_snapshot_path(sheet_type: str = "lease") -> str:
+    """시트 종류별 컬럼 스냅샷 파일 경로 (상가임대차는 기존 경로 유지)"""
+    if sheet_type == "lease":
+        return LISTING_SNAPSHOT_FILE
+    return _SHEET_SNAPSHOT_FILE.format(sheet_type=sheet_type)
+
+
+def _encode_strings(values: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+    """문자열 컬럼을 (사전, int32 코드 배열)로 변환"""
+    dictionary: List[str] = []
+    lookup: Dict[str, int] = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        code = lookup.get(value)
+        if code is None:
+            code = len(dictionary)
+            lookup[value] = code
+            dictionary.append(value)
+        codes[i] = code
+    return dictionary, codes
+
+
+def _encode_ints(values: Sequence[Optional[int]]) -> Tuple[np.ndarray, Dict[str, int]]:
+    """int64 배열 + 범위를 벗어나는 값(숫자만 이어붙인 비정상 입력) {위치: 값} - 후자는 헤더에 따로 저장"""
+    out = np.full(len(values), NULL_INT, dtype=np.int64)
+    overflow: Dict[str, int] = {}
+    for i, value in enumerate(values):
+        if value is None:
+            continue
+        if NULL_INT < value <= np.iinfo(np.int64).max:
+            out[i] = value
+        else:
+            overflow[str(i)] = value
+    return out, overflow
+
+
+def _encode_floats(values: Sequence[Optional[float]]) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def write_columnar_snapshot(items: Sequence[dict], source_key: Sequence[float],
+                            path: str = LISTING_SNAPSHOT_FILE, version: Optional[int] = None) -> None:
+    """
+    정규화된 매물 목록을 컬럼 형식 파일로 저장 (임시 파일 작성 후 교체)
+    version 은 이 파일로 만든 스냅샷의 버전 (여러 워커 프로세스가 같은 버전 번호를 쓰도록)
+    """
+    fields: List[str] = []
+    for item in items:
+        for col in item.get("fields", {}):
+            if col not in fields:
+                fields.append(col)
+    numeric_keys = list(items[0]["numeric_cache"]) if items else list(NUMERIC_KEYS)
+
+    arrays: Dict[str, np.ndarray] = {}
+    dictionaries: Dict[str, List[str]] = {}
+    numeric_overflow: Dict[str, Dict[str, int]] = {}
+
+    def add_strings(name: str, values: Sequence[str]):
+        dictionaries[name], arrays[name] = _encode_strings(values)
+
+    ids = [item["id"] for item in items]
+    add_strings("id", ids)
+    add_strings("address_full", [item.get("address_full", "") for item in items])
+    add_strings("status_raw", [item.get("status_raw", "") for item in items])
+    for col in fields:
+        add_strings(f"f:{col}", [str(item["fields"].get(col, "")) for item in items])
+
+    arrays["raw_row_index"] = np.array([item["raw_row_index"] for item in items], dtype=np.int64)
+    for key in numeric_keys:
+        arrays[f"n:{key}"], overflow = _encode_ints([item["numeric_cache"].get(key) for item in items])
+        if overflow:
+            numeric_overflow[key] = overflow
+    arrays["lat"] = _encode_floats([(item.get("coords") or {}).get("lat") for item in items])
+    arrays["lng"] = _encode_floats([(item.get("coords") or {}).get("lng") for item in items])
+    arrays["id_sorted"], arrays["id_order"] = sorted_ids(ids)
+
+    specs = {}
+    offset = 0
+    for name, arr in arrays.items():
+        specs[name] = {"dtype": arr.dtype.str, "offset": offset, "length": int(arr.shape[0])}
+        offset += -(-arr.nbytes // _ALIGN) * _ALIGN
+
+    header = json.dumps({
+        "format": FORMAT_VERSION,
+        "source_key": list(source_key),
+        "version": version,
+        "count": len(items),
+        "fields": fields,
+        "numeric_keys": numeric_keys,
+        "numeric_overflow": numeric_overflow,
+        "dictionaries": dictionaries,
+        "arrays": specs,
+    }, ensure_ascii=False).encode("utf-8")
+    header += b" " * (-(len(_MAGIC) + 8 + len(header)) % _ALIGN)
+    data_start = len(_MAGIC) + 8 + len(header)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for name, arr in arrays.items():
+            f.seek(data_start + specs[name]["offset"])
+            f.write(arr.tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp, path)
+
+
+class ColumnarListings:
+    """메모리 매핑된 컬럼 형식 매물 스냅샷 (읽기 전용)"""
+
+    def __init__(self, mm: mmap.mmap, header: dict, data_start: int):
+        self._mm = mm
+        self._data_start = data_start
+        self._specs = header["arrays"]
+        self.source_key = tuple(header["source_key"])
+        self.version: Optional[int] = header.get("version")
+        self.count = header["count"]
+        self.fields: List[str] = header["fields"]
+        self.numeric_keys: List[str] = header["numeric_keys"]
+        # 숫자 키 → {위치: int64 범위를 벗어나는 값}
+        self.numeric_overflow: Dict[str, Dict[int, int]] = {
+            key: {int(pos): value for pos, value in values.items()}
+            for key, values in header.get("numeric_overflow", {}).items()
+        }
+        self.dictionaries: Dict[str, List[str]] = header["dictionaries"]
+        self.arrays: Dict[str, np.ndarray] = {
+            name: np.frombuffer(mm, dtype=np.dtype(spec["dtype"]), count=spec["length"],
+                                offset=data_start + spec["offset"])
+            for name, spec in header["arrays"].items()
+        }
+
+    def view(self, name: str, typecode: str) -> memoryview:
+        """
+        배열을 복사하지 않는 memoryview (원소 접근 시 파이썬 int/float 반환)
+        매핑된 페이지는 같은 파일을 연 모든 프로세스가 OS 페이지 캐시를 공유한다.
+        """
+        spec = self._specs[name]
+        start = self._data_start + spec["offset"]
+        end = start + spec["length"] * np.dtype(spec["dtype"]).itemsize
+        return memoryview(self._mm)[start:end].cast(typecode)
+
+    def strings(self, name: str) -> List[str]:
+        """사전 인코딩된 문자열 컬럼을 디코딩"""
+        dictionary = self.dictionaries[name]
+        return [dictionary[c] for c in self.arrays[name].tolist()]
+
+    def ints(self, name: str) -> List[Optional[int]]:
+        overflow = self.numeric_overflow.get(name[2:], {}) if name.startswith("n:") else {}
+        return [overflow.get(i) if v == NULL_INT else v for i, v in enumerate(self.arrays[name].tolist())]
+
+    def floats(self, name: str) -> List[Optional[float]]:
+        return [None if v != v else v for v in self.arrays[name].tolist()]
+
+    def to_items(self) -> List[dict]:
+        """load_listings() 와 같은 구조의 매물 dict 목록으로 복원"""
+        ids = self.strings("id")
+        addresses = self.strings("address_full")
+        statuses = self.strings("status_raw")
+        row_indexes = self.arrays["raw_row_index"].tolist()
+        field_columns = [(col, self.strings(f"f:{col}")) for col in self.fields]
+        numeric_columns = [(key, self.ints(f"n:{key}")) for key in self.numeric_keys]
+        lats, lngs = self.floats("lat"), self.floats("lng")
+
+        items = []
+        for i in range(self.count):
+            fields = {col: values[i] for col, values in field_columns}
+            items.append({
+                "id": ids[i],
+                "raw_row_index": row_indexes[i],
+                "address_full": addresses[i],
+                "address_comp": {
+                    "region2": fields.get("지역2", ""),
+                    "region": fields.get("지역", ""),
+                    "lot": fields.get("지번", ""),
+                },
+                "fields": fields,
+                "coords": {"lat": lats[i], "lng": lngs[i]},
+                "numeric_cache": {key: values[i] for key, values in numeric_columns},
+                "status_raw": statuses[i],
+            })
+        return items
+
+    def close(self) -> None:
+        self.arrays = {}
+        self._mm.close()
+
+
+def load_columnar_snapshot(source_key: Optional[Sequence[float]] = None,
+                           path: str = LISTING_SNAPSHOT_FILE) -> Optional[ColumnarListings]:
+    """
+    컬럼 형식 스냅샷을 메모리 매핑으로 연다.
+    파일이 없거나 형식 버전/원본 버전(source_key)이 다르면 None
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        if mm[:len(_MAGIC)] != _MAGIC:
+            raise ValueError("invalid magic")
+        (header_len,) = struct.unpack("<Q", mm[len(_MAGIC):len(_MAGIC) + 8])
+        data_start = len(_MAGIC) + 8 + header_len
+        header = json.loads(mm[len(_MAGIC) + 8:data_start].decode("utf-8"))
+        stale = header.get("format") != FORMAT_VERSION or (
+            source_key is not None and tuple(header["source_key"]) != tuple(source_key))
+        if stale:
+            mm.close()
+            return None
+        return ColumnarListings(mm, header, data_start)
+    except Exception:
+        mm.close()
+        raise
+
+
+def remove_columnar_snapshot(path: str = LISTING_SNAPSHOT_FILE) -> bool:
+    if os.path.exists(path):
+        os.remove(path)
+        return True
+    return False
+
+
+# ----- 워커 프로세스 간 스냅샷 공유 -----
+# 한 프로세스만 파싱해서 컬럼 파일을 쓰고(빌드 락), 버전 파일에 스냅샷 버전을 기록한다.
+# 다른 프로세스는 버전 파일이 바뀌면 같은 컬럼 파일을 읽기 전용으로 매핑해 교체한다.
+
+def _version_file(path: str) -> str:
+    return path + ".version"
+
+
+def publish_snapshot_version(path: str, version: int) -> None:
+    """컬럼 파일에 해당하는 스냅샷 버전 기록 (임시 파일 작성 후 교체)"""
+    tmp = _version_file(path) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(str(version))
+    os.replace(tmp, _version_file(path))
+
+
+def published_version_stamp(path: str) -> Optional[int]:
+    """버전 파일 mtime (없으면 None) - 매 요청 확인용으로 stat 한 번만"""
+    try:
+        return os.stat(_version_file(path)).st_mtime_ns
+    except OSError:
+        return None
+
+
+def read_published_version(path: str) -> int:
+    try:
+        with open(_version_file(path), "r", encoding="utf-8") as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+@contextmanager
+def snapshot_build_lock(path: str) -> Iterator[None]:
+    """컬럼 파일별 프로세스 간 배타 락 (다른 워커가 만드는 중이면 끝날 때까지 대기)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".lock", "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK 은 약 10초 후 포기하므로 다시 시도
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,253 @@
+# app/services/listing_compact.py
+
+import math
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .listing_sheets import SheetSchema, LEASE
+
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+NULL_INT = _INT64_MIN  # 숫자 값 없음 (listing_columnar.NULL_INT 와 동일)
+
+
+def sorted_ids(ids: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """ID 이진 탐색용 (정렬된 UTF-8 ID 배열, 각 ID 의 행 위치 int32 배열)"""
+    encoded = np.array([lid.encode("utf-8") for lid in ids], dtype=bytes) if ids else np.empty(0, dtype="S1")
+    order = np.argsort(encoded, kind="stable").astype(np.int32)
+    return encoded[order], order
+
+
+def _encode(values, dictionary: List[str], lookup: Dict[str, int]) -> array:
+    """문자열 → 사전 코드 (같은 값은 사전의 문자열 객체 하나를 공유)"""
+    codes = array("i")
+    append = codes.append
+    for value in values:
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(dictionary)
+            dictionary.append(sys.intern(value) if len(value) <= 64 else value)
+        append(code)
+    return codes
+
+
+class CompactListings(Sequence):
+    """
+    스냅샷 매물 목록의 압축 표현 (컬럼 배열 + 사전 인코딩 문자열)
+
+    시트 컬럼은 컬럼별 사전과 int32 코드 배열, 숫자는 int64 배열, 좌표는 float64 배열로 보관한다.
+    address_full / address_comp / status_raw 는 fields 에서 다시 만들 수 있으므로 따로 저장하지 않는다.
+    ID → 행 위치는 dict 대신 정렬된 ID 배열을 이진 탐색한다 (컬럼 파일에 저장되어 워커 간 공유).
+    인덱스로 접근하면 load_listings() 와 같은 구조의 매물 dict 를 그때그때 만들어 준다.
+    """
+
+    __slots__ = ("size", "ids", "row_index", "field_names", "field_dicts", "field_codes",
+                 "numeric_keys", "numerics", "numeric_overflow", "lats", "lngs",
+                 "address_columns", "status_column", "id_sorted", "id_order")
+
+    def __init__(self, ids: List[str], row_index: array, field_names: List[str],
+                 field_dicts: List[List[str]], field_codes: List[array],
+                 numeric_keys: List[str], numerics: List[array], lats: array, lngs: array,
+                 schema: SheetSchema = LEASE,
+                 numeric_overflow: Optional[Dict[Tuple[int, int], int]] = None,
+                 id_index: Optional[Tuple[np.ndarray, np.ndarray]] = None):
+        self.size = len(ids)
+        self.ids = ids
+        self.row_index = row_index
+        self.field_names = field_names
+        self.field_dicts = field_dicts
+        self.field_codes = field_codes
+        self.numeric_keys = numeric_keys
+        self.numerics = numerics
+        self.numeric_overflow = numeric_overflow or {}  # int64 범위를 벗어나는 값 (키 번호, 위치) → 값
+        self.lats = lats
+        self.lngs = lngs
+        self.address_columns = schema.address_columns
+        self.status_column = schema.status_column
+        self.id_sorted, self.id_order = id_index if id_index is not None else sorted_ids(ids)
+
+    @classmethod
+    def from_items(cls, items: Sequence, schema: SheetSchema = LEASE) -> "CompactListings":
+        """정규화된 매물 dict 목록에서 생성"""
+        field_names: List[str] = []
+        for item in items:
+            for col in item["fields"]:
+                if col not in field_names:
+                    field_names.append(col)
+        numeric_keys = list(items[0]["numeric_cache"]) if items else list(schema.numeric_keys)
+
+        field_dicts, field_codes = [], []
+        for col in field_names:
+            dictionary: List[str] = []
+            field_codes.append(_encode((str(item["fields"].get(col, "")) for item in items), dictionary, {}))
+            field_dicts.append(dictionary)
+
+        numerics, overflow = [], {}
+        for k, key in enumerate(numeric_keys):
+            column = array("q")
+            for pos, item in enumerate(items):
+                value = item["numeric_cache"].get(key)
+                if value is None:
+                    column.append(NULL_INT)
+                elif _INT64_MIN < value <= _INT64_MAX:
+                    column.append(value)
+                else:
+                    column.append(NULL_INT)
+                    overflow[(k, pos)] = value
+            numerics.append(column)
+
+        def coord(item, key):
+            value = (item.get("coords") or {}).get(key)
+            return math.nan if value is None else value
+
+        return cls(
+            ids=[item["id"] for item in items],
+            row_index=array("q", (item["raw_row_index"] for item in items)),
+            field_names=field_names,
+            field_dicts=field_dicts,
+            field_codes=field_codes,
+            numeric_keys=numeric_keys,
+            numerics=numerics,
+            lats=array("d", (coord(item, "lat") for item in items)),
+            lngs=array("d", (coord(item, "lng") for item in items)),
+            schema=schema,
+            numeric_overflow=overflow,
+        )
+
+    @classmethod
+    def from_columnar(cls, columnar, schema: SheetSchema = LEASE, shared: bool = False) -> "CompactListings":
+        """
+        메모리 매핑된 컬럼 스냅샷(ColumnarListings)에서 dict 를 거치지 않고 생성
+        shared=True 이면 코드/숫자/좌표 배열을 복사하지 않고 매핑된 파일을 그대로 가리킨다
+        (여러 워커가 같은 페이지를 공유. memoryview 가 매핑을 붙잡고 있으므로 columnar 를 닫지 말 것)
+        """
+        def copy(name: str, typecode: str):
+            if shared:
+                return columnar.view(name, typecode)
+            out = array(typecode)
+            out.frombytes(columnar.arrays[name].tobytes())
+            return out
+
+        def copy_array(name: str) -> np.ndarray:
+            return columnar.arrays[name] if shared else columnar.arrays[name].copy()
+
+        field_dicts = []
+        for col in columnar.fields:
+            field_dicts.append([sys.intern(v) if len(v) <= 64 else v for v in columnar.dictionaries[f"f:{col}"]])
+        return cls(
+            ids=columnar.strings("id"),
+            row_index=copy("raw_row_index", "q"),
+            field_names=list(columnar.fields),
+            field_dicts=field_dicts,
+            field_codes=[copy(f"f:{col}", "i") for col in columnar.fields],
+            numeric_keys=list(columnar.numeric_keys),
+            numerics=[copy(f"n:{key}", "q") for key in columnar.numeric_keys],
+            lats=copy("lat", "d"),
+            lngs=copy("lng", "d"),
+            schema=schema,
+            numeric_overflow={(k, pos): value
+                              for k, key in enumerate(columnar.numeric_keys)
+                              for pos, value in columnar.numeric_overflow.get(key, {}).items()},
+            id_index=(copy_array("id_sorted"), copy_array("id_order")),
+        )
+
+    # ----- Sequence -----
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, pos):
+        if isinstance(pos, slice):
+            return [self._materialize(i) for i in range(*pos.indices(self.size))]
+        if pos < 0:
+            pos += self.size
+        if not 0 <= pos < self.size:
+            raise IndexError(pos)
+        return self._materialize(pos)
+
+    def __iter__(self) -> Iterator[dict]:
+        for pos in range(self.size):
+            yield self._materialize(pos)
+
+    def _materialize(self, pos: int) -> dict:
+        fields = {name: dictionary[codes[pos]]
+                  for name, dictionary, codes in zip(self.field_names, self.field_dicts, self.field_codes)}
+        numeric_cache = {}
+        for k, (key, column) in enumerate(zip(self.numeric_keys, self.numerics)):
+            value = column[pos]
+            numeric_cache[key] = value if value != NULL_INT else self.numeric_overflow.get((k, pos))
+        lat, lng = self.lats[pos], self.lngs[pos]
+        return {
+            "id": self.ids[pos],
+            "raw_row_index": self.row_index[pos],
+            "address_full": " ".join(fields.get(col, "").strip() for col in self.address_columns).strip(),
+            "address_comp": {
+                "region2": fields.get("지역2", ""),
+                "region": fields.get("지역", ""),
+                "lot": fields.get("지번", ""),
+            },
+            "fields": fields,
+            "coords": {"lat": None if lat != lat else lat, "lng": None if lng != lng else lng},
+            "numeric_cache": numeric_cache,
+            "status_raw": fields.get(self.status_column, "").strip(),
+        }
+
+    # ----- 컬럼 접근 (인덱스 생성용, dict 를 만들지 않음) -----
+
+    def position(self, listing_id: str) -> Optional[int]:
+        key = listing_id.encode("utf-8")
+        i = int(np.searchsorted(self.id_sorted, key))
+        if i < self.size and self.id_sorted[i] == key:
+            return int(self.id_order[i])
+        return None
+
+    def get(self, listing_id: str) -> Optional[dict]:
+        pos = self.position(listing_id)
+        return None if pos is None else self._materialize(pos)
+
+    def field_column(self, name: str) -> List[str]:
+        """시트 컬럼 값 목록 (없는 컬럼은 빈 문자열)"""
+        if name not in self.field_names:
+            return [""] * self.size
+        idx = self.field_names.index(name)
+        dictionary = self.field_dicts[idx]
+        return [dictionary[c] for c in self.field_codes[idx]]
+
+    def field_dictionary(self, name: str) -> Tuple[List[str], array]:
+        """(사전, 코드 배열) - 값별로 한 번만 계산하면 되는 파생 컬럼용"""
+        if name not in self.field_names:
+            return [""], array("i", bytes(4 * self.size))
+        idx = self.field_names.index(name)
+        return self.field_dicts[idx], self.field_codes[idx]
+
+    def field_codes_array(self, name: str) -> Tuple[List[str], np.ndarray]:
+        """(사전, int32 코드 ndarray) - 코드 배열을 복사하지 않고 numpy 로 감싼다"""
+        dictionary, codes = self.field_dictionary(name)
+        return dictionary, np.frombuffer(codes, dtype=np.int32)
+
+    def status_column_values(self) -> List[str]:
+        dictionary, codes = self.field_dictionary(self.status_column)
+        stripped = [v.strip() for v in dictionary]
+        return [stripped[c] for c in codes]
+
+    def coordinates(self) -> Tuple[List[Optional[float]], List[Optional[float]]]:
+        return ([None if v != v else v for v in self.lats], [None if v != v else v for v in self.lngs])
+
+    def memory_usage(self) -> Dict[str, int]:
+        """구성 요소별 대략적인 바이트 수"""
+        def strings(values) -> int:
+            return sys.getsizeof(values) + sum(sys.getsizeof(v) for v in values)
+
+        return {
+            "ids": strings(self.ids),
+            "id_index": self.id_sorted.nbytes + self.id_order.nbytes,
+            "row_index": sys.getsizeof(self.row_index),
+            "field_codes": sum(sys.getsizeof(c) for c in self.field_codes),
+            "field_dicts": sum(strings(d) for d in self.field_dicts),
+            "numerics": sum(sys.getsizeof(c) for c in self.numerics),
+            "coords": sys.getsizeof(self.lats) + sys.getsizeof(self.lngs),
+        }
@@ -0,0 +1,178 @@
+# app/services/listing_delta.py
+
+import hashlib
+import json
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+from .sheet_changes import changes_between
+
+# 보관할 연속 스냅샷 간 변경 내역 수 (이보다 오래된 버전은 전체 데이터로 응답)
+MAX_DELTA_HISTORY = 24
+
+
+# 지문에서 제외할 위치 정보 (위쪽 행 추가/삭제만으로 모든 매물이 변경으로 잡히지 않도록)
+_POSITIONAL_KEYS = ("raw_row_index",)
+
+
+def row_fingerprint(item: dict) -> str:
+    """매물 한 건의 내용 지문 (위치 정보를 뺀 어느 값이든 바뀌면 달라짐)"""
+    content = {k: v for k, v in item.items() if k not in _POSITIONAL_KEYS}
+    raw = json.dumps(content, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=10).hexdigest()
+
+
+def snapshot_fingerprints(snapshot) -> Dict[str, str]:
+    """스냅샷의 매물 ID → 지문 (스냅샷마다 한 번만 계산)"""
+    return snapshot.derived(
+        "fingerprints",
+        lambda snap: {item["id"]: row_fingerprint(item) for item in snap.items}
+    )
+
+
+def _logged_changes(old, new) -> Optional[dict]:
+    """
+    지도캐시가 그대로인 시트 다운로드 간 전환이면 시트 변경 기록(sheet_changes)으로 변경 내역 구성
+    (두 스냅샷의 전체 매물 지문 계산 생략). 기록으로 이을 수 없으면 None
+    """
+    old_key, new_key = old.source_key, new.source_key
+    if not old_key or not new_key or old_key[1] != new_key[1]:
+        return None
+    changes = changes_between(new.sheet_type, old_key[0], new_key[0])
+    # 기록의 행 수가 스냅샷과 다르면(ID 규칙 변경 등) 믿지 않음
+    if changes is None or changes["rows"] != len(new):
+        return None
+    return changes
+
+
+class ListingDelta:
+    """연속된 두 스냅샷 사이의 변경 내역"""
+
+    def __init__(self, from_version: int, to_version: int,
+                 added: List[str], removed: List[str], changed: List[str]):
+        self.from_version = from_version
+        self.to_version = to_version
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+    @classmethod
+    def between(cls, old, new) -> "ListingDelta":
+        logged = _logged_changes(old, new)
+        if logged is not None:
+            return cls(old.version, new.version, logged["added"], logged["removed"], logged["modified"])
+        old_fp = snapshot_fingerprints(old)
+        new_fp = snapshot_fingerprints(new)
+        added = [lid for lid in new_fp if lid not in old_fp]
+        removed = [lid for lid in old_fp if lid not in new_fp]
+        changed = [lid for lid, fp in new_fp.items() if lid in old_fp and old_fp[lid] != fp]
+        return cls(old.version, new.version, added, removed, changed)
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+class DeltaHistory:
+    """최근 스냅샷 전환들의 변경 내역 (개수 제한)"""
+
+    def __init__(self, max_entries: int = MAX_DELTA_HISTORY):
+        self._deltas: deque = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+
+    def record(self, old, new) -> Optional[ListingDelta]:
+        if old is None or new is None or old.version == new.version:
+            return None
+        delta = ListingDelta.between(old, new)
+        with self._lock:
+            # 스냅샷 전환이 연속되지 않으면(중간 버전 누락) 이전 기록으로는 이어 붙일 수 없음
+            if self._deltas and self._deltas[-1].to_version != old.version:
+                self._deltas.clear()
+            self._deltas.append(delta)
+        return delta
+
+    def since(self, version: int, current_version: int) -> Optional[Dict[str, List[str]]]:
+        """
+        version 이후 current_version 까지의 누적 변경 {added, removed, changed}
+        기록 범위를 벗어나면 None (전체 데이터로 대체)
+        """
+        if version == current_version:
+            return {"added": [], "removed": [], "changed": []}
+
+        with self._lock:
+            deltas = list(self._deltas)
+        start = next((i for i, d in enumerate(deltas) if d.from_version == version), None)
+        if start is None or deltas[-1].to_version != current_version:
+            return None
+
+        state: Dict[str, str] = {}
+        for delta in deltas[start:]:
+            for lid in delta.added:
+                # 기준 버전에 있던 매물이 삭제 후 다시 생긴 경우는 변경으로 취급
+                state[lid] = "changed" if state.get(lid) == "removed" else "added"
+            for lid in delta.removed:
+                if state.get(lid) == "added":
+                    del state[lid]
+                else:
+                    state[lid] = "removed"
+            for lid in delta.changed:
+                if state.get(lid) != "added":
+                    state[lid] = "changed"
+
+        result = {"added": [], "removed": [], "changed": []}
+        for lid, op in state.items():
+            result[op].append(lid)
+        return result
+
+
+# 시트 종류별 변경 내역 (스냅샷 버전 번호는 시트 간에 공유되므로 따로 보관)
+_histories: Dict[str, DeltaHistory] = {}
+_histories_lock = threading.Lock()
+
+
+def _history(sheet_type: str) -> DeltaHistory:
+    with _histories_lock:
+        history = _histories.get(sheet_type)
+        if history is None:
+            history = _histories[sheet_type] = DeltaHistory()
+        return history
+
+
+def record_snapshot_change(old, new) -> Optional[ListingDelta]:
+    """새 스냅샷이 설치될 때 호출: 이전 스냅샷과의 변경 내역 기록"""
+    if new is None:
+        return None
+    return _history(new.sheet_type).record(old, new)
+
+
+def changes_since(version: int, current_version: int,
+                  sheet_type: str = "lease") -> Optional[Dict[str, List[str]]]:
+    return _history(sheet_type).since(version, current_version)
+
+
+def build_delta_response(snapshot, since: int, changes: Dict[str, List[str]],
+                         visible_ids: Optional[set] = None) -> dict:
+    """
+    since 버전 이후 변경분 응답 구성
+    visible_ids 가 주어지면(역할/필터 적용 결과) 보이지 않게 된 변경 매물은 removed 로 보낸다.
+    """
+    def visible(lid):
+        return visible_ids is None or lid in visible_ids
+
+    added = [snapshot.get(lid) for lid in changes["added"] if visible(lid)]
+    changed, removed = [], list(changes["removed"])
+    for lid in changes["changed"]:
+        if visible(lid):
+            changed.append(snapshot.get(lid))
+        else:
+            removed.append(lid)
+
+    return {
+        "mode": "delta",
+        "since": since,
+        "version": snapshot.version,
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+        "total": len(snapshot) if visible_ids is None else len(visible_ids),
+    }
@@ -0,0 +1,106 @@
+# app/services/listing_facets.py
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .listing_query import get_query_index
+
+# 값별 개수를 세는 컬럼 (facet 키 → 시트 컬럼). 현황은 앞뒤 공백 제거, 층수는 숫자 층으로 변환해서 센다
+FACET_COLUMNS = {
+    "region":  "지역",
+    "region2": "지역2",
+    "status":  "현황",
+    "floor":   "층수",
+}
+
+# 히스토그램 구간 경계 (만원/평). 마지막 구간은 상한 없음
+HISTOGRAM_EDGES = {
+    "deposit":   [0, 500, 1000, 2000, 3000, 5000, 10000, 20000, 50000],
+    "rent":      [0, 50, 100, 150, 200, 300, 500, 1000],
+    "premium":   [0, 1000, 2000, 3000, 5000, 10000, 20000],
+    "area_real": [0, 10, 20, 30, 50, 100, 200],
+}
+
+
+class _Facet:
+    """컬럼 값 → 코드 (행마다 코드 하나)"""
+
+    def __init__(self, values: Sequence):
+        labels: List[str] = []
+        lookup: Dict[str, int] = {}
+        codes = np.empty(len(values), dtype=np.int32)
+        for pos, value in enumerate(values):
+            label = "" if value is None else str(value)
+            code = lookup.get(label)
+            if code is None:
+                code = lookup[label] = len(labels)
+                labels.append(label)
+            codes[pos] = code
+        self.labels = labels
+        self.codes = codes
+        self.totals = np.bincount(codes, minlength=len(labels))
+
+    def counts(self, positions: Optional[np.ndarray]) -> List[dict]:
+        counts = self.totals if positions is None else np.bincount(self.codes[positions], minlength=len(self.labels))
+        order = sorted((i for i in range(len(self.labels)) if counts[i]), key=lambda i: (-counts[i], self.labels[i]))
+        return [{"value": self.labels[i], "count": int(counts[i])} for i in order]
+
+
+class _Histogram:
+    """숫자 컬럼 → 구간 번호 (값이 없으면 마지막 번호)"""
+
+    def __init__(self, values: Sequence[Optional[float]], edges: List[float]):
+        self.edges = edges
+        arr = np.asarray(values, dtype=np.float64)
+        buckets = np.searchsorted(np.asarray(edges, dtype=np.float64), arr, side="right") - 1
+        # 첫 경계보다 작은 값(음수)은 첫 구간, 값 없음은 len(edges) 번
+        buckets = np.clip(buckets, 0, len(edges) - 1)
+        buckets[np.isnan(arr)] = len(edges)
+        self.buckets = buckets.astype(np.int16)
+        self.totals = np.bincount(self.buckets, minlength=len(edges) + 1)
+
+    def counts(self, positions: Optional[np.ndarray]) -> dict:
+        counts = self.totals if positions is None else np.bincount(self.buckets[positions], minlength=len(self.edges) + 1)
+        return {
+            "edges": self.edges,
+            "counts": [int(c) for c in counts[:-1]],
+            "missing": int(counts[-1]),
+        }
+
+
+class FacetIndex:
+    """
+    스냅샷 단위로 한 번 만들어 두는 집계 인덱스.
+    행마다 facet 값 코드와 히스토그램 구간 번호를 미리 계산해 두고
+    전체 집계는 미리 센 값을, 필터된 부분 집합은 해당 행 위치만 bincount 한다.
+    """
+
+    def __init__(self, snapshot):
+        index = get_query_index(snapshot)
+        items = snapshot.items
+        self.size = len(items)
+        self.facets = {
+            "region":  _Facet(items.field_column(FACET_COLUMNS["region"])),
+            "region2": _Facet(items.field_column(FACET_COLUMNS["region2"])),
+            "status":  _Facet(items.status_column_values()),
+            "floor":   _Facet(["" if v != v else int(v) for v in index.floor_column.tolist()]),
+        }
+        self.histograms = {
+            key: _Histogram(index.numeric_columns[key], edges)
+            for key, edges in HISTOGRAM_EDGES.items()
+        }
+
+    def aggregate(self, positions: Optional[Sequence[int]] = None) -> dict:
+        """positions 가 None 이면 전체, 아니면 해당 행들만 집계"""
+        pos = None if positions is None else np.asarray(positions, dtype=np.int64)
+        return {
+            "total": self.size if pos is None else int(len(pos)),
+            "facets": {key: facet.counts(pos) for key, facet in self.facets.items()},
+            "histograms": {key: hist.counts(pos) for key, hist in self.histograms.items()},
+        }
+
+
+def get_facet_index(snapshot) -> FacetIndex:
+    """스냅샷에 연결된 집계 인덱스 (스냅샷마다 한 번만 생성)"""
+    return snapshot.derived("facet_index", FacetIndex)
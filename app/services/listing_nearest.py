@@ -0,0 +1,116 @@
+# app/services/listing_nearest.py
+
+import math
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .listing_spatial import get_spatial_index
+
+# 지구 반지름(m): 프론트엔드 calcHaversineMeters 와 동일 (map-markers.js)
+EARTH_RADIUS_M = 6371000.0
+
+DEFAULT_NEAREST_LIMIT = 20
+MAX_NEAREST_LIMIT = 500
+
+
+def parse_point(lat_raw: Optional[str], lng_raw: Optional[str]) -> Tuple[float, float]:
+    """'lat', 'lng' 파라미터 → (lat, lng). 없거나 범위를 벗어나면 ValueError"""
+    if lat_raw is None or lng_raw is None:
+        raise ValueError("lat, lng 파라미터가 필요합니다")
+    lat, lng = float(lat_raw), float(lng_raw)
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):  # nan 도 여기서 걸러짐
+        raise ValueError(f"잘못된 좌표: {lat_raw}, {lng_raw}")
+    return lat, lng
+
+
+def parse_radius(raw: Optional[str]) -> Optional[float]:
+    """'radius' 파라미터(m) → 양의 유한한 값 또는 None. 그 밖의 값은 ValueError"""
+    if raw is None or raw == "":
+        return None
+    radius = float(raw)
+    if not math.isfinite(radius) or radius <= 0:
+        raise ValueError(f"잘못된 반경: {raw}")
+    return radius
+
+
+def haversine_m(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """한 지점에서 좌표 배열까지의 대권 거리(m), 배열 연산으로 한 번에 계산 (입력은 도 단위)"""
+    lat1, lng1 = np.radians(lat), np.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class NearestIndex:
+    """
+    스냅샷 단위 최근접 매물 검색.
+    좌표가 있는 행만 위치/위도/경도 배열로 모아 두고, 요청마다 거리를 배열 연산으로 계산해
+    argpartition 으로 가까운 k 개만 골라 정렬한다.
+    """
+
+    def __init__(self, lats: Sequence[Optional[float]], lngs: Sequence[Optional[float]], size: int):
+        self.positions = np.array([p for p, (lat, lng) in enumerate(zip(lats, lngs))
+                                   if lat is not None and lng is not None], dtype=np.int64)
+        self.lats = np.array([lats[p] for p in self.positions.tolist()], dtype=np.float64)
+        self.lngs = np.array([lngs[p] for p in self.positions.tolist()], dtype=np.float64)
+
+        # 행 위치 → 좌표 배열 인덱스 (좌표 없으면 -1)
+        self.slot = np.full(size, -1, dtype=np.int64)
+        self.slot[self.positions] = np.arange(len(self.positions))
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def nearest(self, lat: float, lng: float, limit: int,
+                positions: Optional[Sequence[int]] = None,
+                radius_m: Optional[float] = None) -> Tuple[List[int], List[float], int]:
+        """
+        (lat, lng) 에서 가까운 순으로 최대 limit 개: (행 위치, 거리 m, 반경 안 후보 수)
+        positions 가 있으면 그 행들(필터 결과) 중에서만 찾는다. 좌표가 없는 행은 제외.
+        """
+        if positions is None:
+            slots = np.arange(len(self.positions))
+        else:
+            slots = self.slot[np.asarray(positions, dtype=np.int64)] if len(positions) else np.empty(0, dtype=np.int64)
+            slots = slots[slots >= 0]
+
+        distances = haversine_m(lat, lng, self.lats[slots], self.lngs[slots])
+        if radius_m is not None:
+            within = distances <= radius_m
+            slots, distances = slots[within], distances[within]
+
+        total = len(slots)
+        if limit <= 0 or total == 0:
+            return [], [], total
+        if limit < total:
+            top = np.argpartition(distances, limit - 1)[:limit]
+        else:
+            top = np.arange(total)
+        # 거리가 같으면 원본 행 순서 유지
+        order = top[np.lexsort((self.positions[slots[top]], distances[top]))]
+        return self.positions[slots[order]].tolist(), distances[order].tolist(), total
+
+
+def get_nearest_index(snapshot) -> NearestIndex:
+    """스냅샷에 연결된 최근접 검색 인덱스 (스냅샷마다 한 번만 생성)"""
+    def build(snap):
+        spatial = get_spatial_index(snap)
+        return NearestIndex(spatial.lats, spatial.lngs, len(snap.items))
+    return snapshot.derived("nearest_index", build)
+
+
+def build_nearest_response(snapshot, lat: float, lng: float, positions: List[int],
+                           distances: List[float], total: int) -> dict:
+    """최근접 응답: 매물마다 distance(m, 소수 첫째 자리) 를 붙여 가까운 순으로"""
+    items = []
+    for pos, distance in zip(positions, distances):
+        item = dict(snapshot.items[pos])
+        item["distance"] = round(distance, 1)
+        items.append(item)
+    return {
+        "center": {"lat": lat, "lng": lng},
+        "version": snapshot.version,
+        "items": items,
+        "total": total,
+    }
@@ -0,0 +1,95 @@
+# app/services/listing_normalize.py
+
+from typing import Dict, List, Optional, Sequence
+
+from .listing_sheets import SheetSchema, LEASE
+from ..core.ids import ListingIdAssigner
+from ..core.utils import to_int_or_none
+
+
+def extract_columns(rows: Sequence[Sequence[str]], hdr: Dict[str, int]) -> Dict[str, Sequence[str]]:
+    """데이터 행(rows[1:])을 한 번에 전치해서 헤더 이름 → 컬럼 값 목록으로 변환"""
+    data = rows[1:]
+    if not data:
+        return {col: () for col in hdr}
+    width = max(len(r) for r in data)
+    if any(len(r) != width for r in data):
+        data = [list(r) + [""] * (width - len(r)) for r in data]
+    transposed = list(zip(*data))
+    return {col: transposed[idx] for col, idx in hdr.items() if idx < width}
+
+
+def strip_column(values: Sequence[str]) -> List[str]:
+    return [v.strip() for v in values]
+
+
+def address_column(columns: Dict[str, Sequence[str]], schema: SheetSchema, size: int) -> List[str]:
+    """주소 컬럼들을 이어 붙인 address_full (주소 컬럼이 하나라도 없으면 전부 빈 값)"""
+    if any(col not in columns for col in schema.address_columns):
+        return [""] * size
+    parts = [strip_column(columns[col]) for col in schema.address_columns]
+    return [" ".join(values).strip() for values in zip(*parts)]
+
+
+def int_column(values: Sequence[str]) -> List[Optional[int]]:
+    """to_int_or_none 을 컬럼 단위로 적용 (같은 값은 한 번만 변환)"""
+    lookup = {}
+    for v in set(values):
+        s = v.strip() if isinstance(v, str) else v
+        # 숫자만 있는 값은 정규식 없이 바로 변환
+        lookup[v] = int(s) if isinstance(s, str) and s.isascii() and s.isdigit() else to_int_or_none(v)
+    return [lookup[v] for v in values]
+
+
+def listing_id_column(columns: Dict[str, Sequence[str]], addresses: Sequence[str],
+                      schema: SheetSchema) -> List[Optional[str]]:
+    """행별 내용 기반 매물 ID (주소가 없어 매물로 쓰이지 않는 행은 None)"""
+    size = len(addresses)
+    keys = [columns.get(col) or [""] * size for col in schema.id_key_columns]
+    assigner = ListingIdAssigner(schema.id_prefix)
+    return [assigner.assign(key) if address else None for address, key in zip(addresses, zip(*keys))]
+
+
+def normalize_sheet(rows: Sequence[Sequence[str]], hdr: Dict[str, int],
+                    schema: SheetSchema = LEASE) -> List[dict]:
+    """
+    시트 전체를 컬럼 단위로 정규화해서 스냅샷용 매물 dict 목록으로 변환
+    (주소 구성, 숫자 추출, total 계산을 컬럼별로 한 번에 처리. 좌표는 비어 있음)
+    """
+    columns = extract_columns(rows, hdr)
+    size = max(len(rows) - 1, 0)
+
+    addresses = address_column(columns, schema, size)
+    ids = listing_id_column(columns, addresses, schema)
+    keep = [i for i, address in enumerate(addresses) if address]
+
+    field_names = list(columns)
+    field_values = [columns[col] for col in field_names]
+    status = strip_column(columns[schema.status_column]) if schema.status_column in columns else [""] * size
+
+    numeric = {key: int_column(columns[col]) if col in columns else [None] * size
+               for key, col in schema.numeric_columns.items()}
+    if schema.total_keys:
+        a, b = (numeric[k] for k in schema.total_keys)
+        numeric["total"] = [x + y if x is not None and y is not None else None for x, y in zip(a, b)]
+    numeric_keys = list(numeric)
+    numeric_values = [numeric[k] for k in numeric_keys]
+
+    items: List[dict] = []
+    for i in keep:
+        fields = dict(zip(field_names, [values[i] for values in field_values]))
+        items.append({
+            "id": ids[i],
+            "raw_row_index": i + 1,
+            "address_full": addresses[i],
+            "address_comp": {
+                "region2": fields.get("지역2", ""),
+                "region": fields.get("지역", ""),
+                "lot": fields.get("지번", ""),
+            },
+            "fields": fields,
+            "coords": {"lat": None, "lng": None},
+            "numeric_cache": dict(zip(numeric_keys, [values[i] for values in numeric_values])),
+            "status_raw": status[i],
+        })
+    return items
@@ -0,0 +1,122 @@
+# app/services/listing_payload.py
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Iterator, Optional
+
+try:
+    import brotli  # Flask-Compress 의존성으로 함께 설치됨
+except ImportError:  # pragma: no cover - brotli 없는 환경에서는 gzip 만 사용
+    brotli = None
+
+# 스냅샷 하나당 보관할 직렬화 결과 수 (역할/조회 조건 조합별)
+MAX_PAYLOADS_PER_SNAPSHOT = 64
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 8
+
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+# 스트리밍 응답에서 한 번에 내보낼 매물 수
+STREAM_CHUNK_ITEMS = 500
+
+
+class ListingPayload:
+    """
+    한 번 직렬화된 /api/listings 응답 본문.
+    인코딩(gzip/br)별 압축 결과도 처음 요청될 때 한 번만 만든다.
+    """
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.digest = hashlib.sha1(body).hexdigest()[:20]
+        self._encoded: Dict[str, bytes] = {"identity": body}
+        self._lock = threading.Lock()
+
+    def etag(self, encoding: str = "identity") -> str:
+        # Flask-Compress 와 같은 형식: "digest" / "digest:gzip"
+        if encoding == "identity":
+            return self.digest
+        return f"{self.digest}:{encoding}"
+
+    def encoded(self, encoding: str) -> bytes:
+        data = self._encoded.get(encoding)
+        if data is not None:
+            return data
+        with self._lock:
+            data = self._encoded.get(encoding)
+            if data is None:
+                if encoding == "gzip":
+                    data = gzip.compress(self.body, compresslevel=GZIP_LEVEL, mtime=0)
+                elif encoding == "br" and brotli is not None:
+                    data = brotli.compress(self.body, quality=BROTLI_QUALITY)
+                else:
+                    raise ValueError(f"unsupported encoding: {encoding}")
+                self._encoded[encoding] = data
+            return data
+
+
+class PayloadCache:
+    """스냅샷 단위 LRU 캐시: 뷰 키 → ListingPayload"""
+
+    def __init__(self, max_entries: int = MAX_PAYLOADS_PER_SNAPSHOT):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, ListingPayload]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[ListingPayload]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+            return payload
+
+    def put(self, key: Hashable, payload: ListingPayload) -> ListingPayload:
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return payload
+
+
+def serialize_payload(data: dict) -> ListingPayload:
+    return ListingPayload(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+
+def get_listing_payload(snapshot, view_key: Hashable, build: Callable[[], dict]) -> ListingPayload:
+    """
+    (스냅샷 버전, 뷰 키)에 해당하는 직렬화 결과 반환
+    캐시에 없을 때만 build() 로 응답 dict 를 만들어 직렬화한다.
+    """
+    cache = snapshot.derived("payload_cache", lambda snap: PayloadCache())
+    payload = cache.get(view_key)
+    if payload is None:
+        payload = cache.put(view_key, serialize_payload(build()))
+    return payload
+
+
+def iter_ndjson(meta: dict, items: Iterable[dict], chunk_items: int = STREAM_CHUNK_ITEMS) -> Iterator[bytes]:
+    """
+    NDJSON 스트리밍 본문: 첫 줄은 meta, 이어서 매물 한 줄씩, 마지막 줄은 {"done": true, "count": n}
+    매물은 chunk_items 개씩 묶어서 내보낸다 (전체 본문을 메모리에 만들지 않음).
+    """
+    dumps = json.dumps
+    yield (dumps(meta, ensure_ascii=False) + "\n").encode("utf-8")
+    lines = []
+    count = 0
+    for item in items:
+        lines.append(dumps(item, ensure_ascii=False))
+        count += 1
+        if len(lines) >= chunk_items:
+            lines.append("")
+            yield "\n".join(lines).encode("utf-8")
+            lines = []
+    if lines:
+        lines.append("")
+        yield "\n".join(lines).encode("utf-8")
+    yield (dumps({"done": True, "count": count}) + "\n").encode("utf-8")
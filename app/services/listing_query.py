@@ -0,0 +1,312 @@
+# app/services/listing_query.py
+
+import re
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..core.utils import to_float_or_none, parse_floor_value, split_manager_names
+from .listing_compact import CompactListings
+from .listing_ranges import RangeIndex
+from .listing_spatial import BBox, GridIndex, parse_bbox, get_spatial_index
+
+# 상단 필터 키 → 시트 컬럼 (static/js/modules/data/listings.js 의 FIELDS 와 동일)
+TEXT_FILTERS = {
+    "region":   "지역",
+    "jibun":    "지번",
+    "building": "건물명",
+    "store":    "가게명",
+    "note":     "비고",
+    "manager":  "담당자",
+    "region2":  "지역2",
+    "phone":    "연락처",
+    "client":   "의뢰인",
+    "note3":    "비고3",
+}
+
+# 숫자 필터 키 → (시트 컬럼, 단일값 입력 시 비교 방식)
+NUMERIC_FILTERS = {
+    "area_sale": ("분양", "gte"),
+    "area_real": ("실평수", "gte"),
+    "deposit":   ("보증금", "lte"),
+    "rent":      ("월세", "lte"),
+    "premium":   ("권리금", "lte"),
+}
+
+FLOOR_FIELD = "층수"
+
+# 정렬 키 → (정렬 컬럼, 내림차순 여부). None 컬럼은 원본 행 순서
+SORT_KEYS = {
+    "latest":       (None, True),
+    "oldest":       (None, False),
+    "area_high":    ("area_real", True),
+    "area_low":     ("area_real", False),
+    "deposit_high": ("deposit", True),
+    "deposit_low":  ("deposit", False),
+    "rent_high":    ("rent", True),
+    "rent_low":     ("rent", False),
+}
+
+MAX_PAGE_SIZE = 100000
+
+
+def _nan_if_none(value: Optional[float]) -> float:
+    return math.nan if value is None else value
+
+
+def _none_if_nan(value) -> Optional[float]:
+    value = float(value)
+    return None if value != value else value
+
+
+@dataclass
+class NumRange:
+    """숫자 범위 조건 (None 은 해당 방향 제한 없음)"""
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+    def contains(self, value: Optional[float]) -> bool:
+        # 프론트엔드 checkNumFilter 와 동일: 값이 없으면 통과
+        if value is None:
+            return True
+        if self.min is not None and value < self.min:
+            return False
+        if self.max is not None and value > self.max:
+            return False
+        return True
+
+
+def parse_text_tokens(raw: Optional[str]) -> List[str]:
+    """'a, b' → ['a', 'b'] (쉼표 구분, 어느 하나라도 포함되면 일치)"""
+    if not raw:
+        return []
+    return [t.strip() for t in str(raw).split(",") if t.strip()]
+
+
+def parse_num_filter(raw: Optional[str], kind: str) -> Optional[NumRange]:
+    """프론트엔드 buildNumFilter()와 같은 규칙으로 숫자 조건 파싱 ('10~20', '20-', '30')"""
+    if not raw:
+        return None
+    clean = re.sub(r"[^\d~-]", "", str(raw))
+    if "~" in clean or "-" in clean:
+        parts = re.split(r"[~-]", clean)
+        if len(parts) == 2:
+            lo = to_float_or_none(parts[0]) if parts[0] else None
+            hi = to_float_or_none(parts[1]) if parts[1] else None
+            if lo is not None and hi is not None:
+                return NumRange(lo, hi)
+            if lo is not None and parts[1] == "":
+                return NumRange(lo, None)
+    single = to_float_or_none(clean)
+    if single is None:
+        return None
+    if kind == "gte":
+        return NumRange(single, None)
+    return NumRange(None, single)
+
+
+def parse_floor_filter(raw: Optional[str]) -> Optional[NumRange]:
+    """프론트엔드 parseFloorInputToRange()와 같은 규칙 ('지하1~3', 'B2', '1-2')"""
+    if not raw:
+        return None
+    s = str(raw).lower()
+    s = re.sub(r"지하(\d+)", r"-\1", s)
+    s = re.sub(r"b(\d+)", r"-\1", s)
+    s = re.sub(r"[^\d~-]", "", s)
+    m = re.match(r"^(-?\d+)[~-](-?\d+)$", s)
+    if m:
+        lo, hi = int(m.group(1)), int(m.group(2))
+        return NumRange(min(lo, hi), max(lo, hi))
+    m = re.match(r"^(-?\d+)$", s)
+    if m:
+        n = int(m.group(1))
+        return NumRange(n, n)
+    return None
+
+
+@dataclass
+class ListingQuery:
+    """/api/listings 조회 조건"""
+    text: Dict[str, List[str]] = field(default_factory=dict)
+    numeric: Dict[str, NumRange] = field(default_factory=dict)
+    floor: Optional[NumRange] = None
+    status_raw: Optional[str] = None
+    manager_exact: Optional[str] = None  # 역할 기반 제한 (일반 사용자, 담당자 셀의 이름 중 하나와 일치)
+    bbox: Optional[BBox] = None  # 지도 화면 영역 (minLat, minLng, maxLat, maxLng)
+    sort: Optional[str] = None
+    limit: int = 100
+    offset: int = 0
+
+    @classmethod
+    def from_args(cls, args) -> "ListingQuery":
+        """request.args 와 같은 매핑에서 조회 조건 생성"""
+        q = cls()
+        for key in TEXT_FILTERS:
+            tokens = parse_text_tokens(args.get(key))
+            if tokens:
+                q.text[key] = tokens
+        for key, (_, kind) in NUMERIC_FILTERS.items():
+            rng = parse_num_filter(args.get(key), kind)
+            if rng is not None:
+                q.numeric[key] = rng
+        q.floor = parse_floor_filter(args.get("floor"))
+        q.status_raw = args.get("status_raw") or None
+        q.bbox = parse_bbox(args.get("bbox"))
+        sort = args.get("sort")
+        q.sort = sort if sort in SORT_KEYS else None
+        q.limit = max(0, min(int(args.get("limit", 100)), MAX_PAGE_SIZE))
+        q.offset = max(0, int(args.get("offset", 0)))
+        return q
+
+    def filter_key(self) -> tuple:
+        """정렬/페이지를 제외한 조회 조건 키 (집계 캐시용)"""
+        def rng(r):
+            return None if r is None else (r.min, r.max)
+        return (
+            tuple(sorted((k, tuple(v)) for k, v in self.text.items())),
+            tuple(sorted((k, rng(v)) for k, v in self.numeric.items())),
+            rng(self.floor),
+            self.status_raw,
+            self.manager_exact,
+            self.bbox,
+        )
+
+    def cache_key(self) -> tuple:
+        """같은 조회 조건이면 같은 값이 되는 해시 가능한 키 (응답 캐시용)"""
+        return self.filter_key() + (self.sort, self.limit, self.offset)
+
+    def has_filters(self) -> bool:
+        return bool(self.text or self.numeric or self.floor or self.status_raw
+                    or self.manager_exact is not None or self.bbox is not None)
+
+
+class ListingQueryIndex:
+    """
+    스냅샷 단위로 한 번 만들어 두는 컬럼 인덱스.
+    사전 인코딩된 코드 배열(공유 매핑 파일)을 numpy 로 그대로 쓰고,
+    숫자/층수는 고유 값마다 한 번 변환해 NaN 이 빈 값인 float64 배열로 펼친다.
+    텍스트·현황·담당자 조건은 사전 값별 일치 여부를 구한 뒤 코드로 행 비트맵을 만든다.
+    """
+
+    def __init__(self, items: CompactListings, spatial: Optional[GridIndex] = None):
+        self.items = items
+        self.size = len(items)
+        self.spatial = spatial if spatial is not None else GridIndex(*items.coordinates())
+
+        # 사전 인코딩된 컬럼을 그대로 사용 (숫자/층수 변환은 고유 값마다 한 번)
+        def decode(col, convert) -> np.ndarray:
+            dictionary, codes = items.field_codes_array(col)
+            values = np.array([_nan_if_none(convert(v)) for v in dictionary], dtype=np.float64)
+            return values[codes]
+
+        self.text_codes: Dict[str, Tuple[List[str], np.ndarray]] = {
+            key: items.field_codes_array(col) for key, col in TEXT_FILTERS.items()
+        }
+        self.numeric_columns: Dict[str, np.ndarray] = {
+            key: decode(col, to_float_or_none) for key, (col, _) in NUMERIC_FILTERS.items()
+        }
+        self.floor_column: np.ndarray = decode(FLOOR_FIELD, parse_floor_value)
+
+        # 범위 조건용 정렬 인덱스 (숫자 필터 컬럼 + 층수)
+        self.range_indexes: Dict[str, RangeIndex] = {
+            key: RangeIndex(values) for key, values in self.numeric_columns.items()
+        }
+        self.floor_range = RangeIndex(self.floor_column)
+
+        # 현황(앞뒤 공백 제거)·담당자('남/정' 은 각 담당자)는 사전 값 단위로만 풀어 둔다
+        dictionary, self.status_codes = items.field_codes_array(items.status_column)
+        self.status_values = [v.strip() for v in dictionary]
+        manager_dictionary, self.manager_codes = self.text_codes["manager"]
+        self.manager_names = [frozenset(split_manager_names(v)) for v in manager_dictionary]
+
+        # 정렬 순서는 int32 배열로 보관 (워커마다 따로 갖는 인덱스 메모리 절약)
+        self.sort_orders: Dict[str, np.ndarray] = {
+            name: self._build_order(column, descending)
+            for name, (column, descending) in SORT_KEYS.items()
+        }
+
+    def _build_order(self, column: Optional[str], descending: bool) -> np.ndarray:
+        if column is None:
+            order = np.arange(self.size, dtype=np.int32)
+            return order[::-1].copy() if descending else order
+        # 프론트엔드와 동일하게 값이 없으면 0 으로 취급 (안정 정렬, 같은 값은 원래 행 순서)
+        values = np.nan_to_num(self.numeric_columns[column], nan=0.0)
+        return np.argsort(-values if descending else values, kind="stable").astype(np.int32)
+
+    # ----- 행 위치 하나의 값 (역방향 매칭용) -----
+
+    def text_value(self, key: str, pos: int) -> str:
+        dictionary, codes = self.text_codes[key]
+        return dictionary[codes[pos]]
+
+    def numeric_value(self, key: str, pos: int) -> Optional[float]:
+        return _none_if_nan(self.numeric_columns[key][pos])
+
+    def floor_value(self, pos: int) -> Optional[float]:
+        return _none_if_nan(self.floor_column[pos])
+
+    # ----- 조건 → 비트맵 -----
+
+    @staticmethod
+    def _code_mask(codes: np.ndarray, hits) -> np.ndarray:
+        """사전 값별 일치 여부 → 행 비트맵"""
+        return np.fromiter(hits, dtype=bool)[codes] if len(codes) else np.zeros(0, dtype=bool)
+
+    def mask(self, query: ListingQuery) -> Optional[np.ndarray]:
+        """조건을 모두 통과하는 행의 비트맵 (조건이 없으면 None)"""
+        masks = []
+        if query.status_raw is not None:
+            masks.append(self._code_mask(self.status_codes, (v == query.status_raw for v in self.status_values)))
+        if query.manager_exact is not None:
+            names = frozenset(split_manager_names(query.manager_exact))
+            masks.append(self._code_mask(self.manager_codes, (not names.isdisjoint(n) for n in self.manager_names)))
+        if query.bbox is not None:
+            m = np.zeros(self.size, dtype=bool)
+            m[np.asarray(self.spatial.query(query.bbox), dtype=np.int64)] = True
+            masks.append(m)
+        for key, rng in query.numeric.items():
+            masks.append(self.range_indexes[key].mask(rng.min, rng.max))
+        if query.floor is not None:
+            masks.append(self.floor_range.mask(query.floor.min, query.floor.max))
+        for key, tokens in query.text.items():
+            dictionary, codes = self.text_codes[key]
+            masks.append(self._code_mask(codes, (bool(v) and any(t in v for t in tokens) for v in dictionary)))
+
+        if not masks:
+            return None
+        mask = masks[0]
+        for m in masks[1:]:
+            mask &= m
+        return mask
+
+    def positions(self, query: ListingQuery) -> np.ndarray:
+        """조건에 맞는 행 위치 배열 (정렬 적용, 페이지 미적용)"""
+        mask = self.mask(query)
+        if query.sort:
+            order = self.sort_orders[query.sort]
+            return order if mask is None else order[mask[order]]
+        return np.arange(self.size) if mask is None else np.flatnonzero(mask)
+
+    def evaluate(self, query: ListingQuery) -> List[int]:
+        """조건에 맞는 행 위치 목록 (정렬 적용, 페이지 미적용)"""
+        return self.positions(query).tolist()
+
+    def page_positions(self, query: ListingQuery) -> Tuple[List[int], int]:
+        """조건에 맞는 매물 중 요청한 페이지의 행 위치: (positions, total)"""
+        positions = self.positions(query)
+        return positions[query.offset:query.offset + query.limit].tolist(), len(positions)
+
+    def page(self, query: ListingQuery) -> Tuple[List[dict], int]:
+        """조건에 맞는 매물 중 요청한 페이지만 반환: (items, total)"""
+        window, total = self.page_positions(query)
+        return [self.items[p] for p in window], total
+
+
+def get_query_index(snapshot) -> ListingQueryIndex:
+    """스냅샷에 연결된 쿼리 인덱스 (스냅샷마다 한 번만 생성)"""
+    return snapshot.derived(
+        "query_index",
+        lambda snap: ListingQueryIndex(snap.items, spatial=get_spatial_index(snap))
+    )
@@ -0,0 +1,36 @@
+# app/services/listing_ranges.py
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+class RangeIndex:
+    """
+    숫자 컬럼 하나의 정렬 인덱스: 값 오름차순 (값, 행 위치) 배열 + 값 없는 행 위치.
+    범위 조건은 이진 탐색으로 구간을 찾고, 값이 없는 행은 프론트엔드와 같이 항상 통과시킨다.
+    """
+
+    def __init__(self, values: Sequence[Optional[float]]):
+        # float64 배열(NaN = 값 없음)은 복사 없이 사용, 리스트의 None 은 NaN 으로 변환
+        arr = np.asarray(values, dtype=np.float64)
+        self.size = len(arr)
+        missing = np.isnan(arr)
+        present = np.flatnonzero(~missing)
+        order = np.argsort(arr[present], kind="stable")
+        self.positions = present[order]
+        self.values = arr[self.positions]
+        self.missing = np.flatnonzero(missing)
+
+    def select(self, lo: Optional[float], hi: Optional[float]) -> np.ndarray:
+        """lo <= 값 <= hi 인 행 위치 (정렬 순서, 값 없는 행 제외)"""
+        start = 0 if lo is None else int(np.searchsorted(self.values, lo, side="left"))
+        end = len(self.values) if hi is None else int(np.searchsorted(self.values, hi, side="right"))
+        return self.positions[start:max(start, end)]
+
+    def mask(self, lo: Optional[float], hi: Optional[float]) -> np.ndarray:
+        """조건을 통과하는 행의 비트맵 (값 없는 행 포함)"""
+        out = np.zeros(self.size, dtype=bool)
+        out[self.select(lo, hi)] = True
+        out[self.missing] = True
+        return out
@@ -0,0 +1,99 @@
+# app/services/listing_sheets.py
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ..core.ids import LISTING_ID_KEY_COLUMNS
+
+
+@dataclass(frozen=True)
+class SheetSchema:
+    """매물 시트 종류별 파일/헤더 규칙"""
+    sheet_type: str
+    title: str                                  # 구글 시트 이름 (다운로드 파일명과 동일)
+    filename_env: str                           # 파일명 재정의 환경변수
+    expected_headers: Tuple[str, ...]           # 헤더 기대 (최소)
+    id_key_columns: Tuple[str, ...]             # 내용 기반 매물 ID 기준 컬럼
+    id_prefix: str
+    address_columns: Tuple[str, ...]            # address_full 구성 순서
+    address_has_district: bool = True           # 주소에 구/시(지역2)가 포함되는지
+    numeric_columns: Dict[str, str] = field(default_factory=dict)  # numeric_cache 키 → 컬럼
+    total_keys: Optional[Tuple[str, str]] = None                    # total = 두 값의 합
+    status_column: str = "현황"
+
+    @property
+    def filename(self) -> str:
+        return os.getenv(self.filename_env, f"{self.title}.xlsx")
+
+    @property
+    def path(self) -> str:
+        data_dir = os.getenv("DATA_DIR", "./data")
+        return os.path.join(data_dir, "raw", self.filename)
+
+    @property
+    def numeric_keys(self) -> List[str]:
+        keys = list(self.numeric_columns)
+        if self.total_keys:
+            keys.append("total")
+        return keys
+
+
+LEASE = SheetSchema(
+    sheet_type="lease",
+    title="상가임대차",
+    filename_env="LISTING_SHEET_FILENAME",
+    expected_headers=(
+        "접수날짜","지역","지번","건물명","층수","가게명","분양","실평수",
+        "보증금","월세","권리금","비고","담당자","현황","지역2","연락처",
+        "의뢰인","비고3","위반여부","현수막번호"
+    ),
+    id_key_columns=LISTING_ID_KEY_COLUMNS,
+    id_prefix="lst",
+    address_columns=("지역2","지역","지번"),
+    numeric_columns={"deposit": "보증금", "rent": "월세", "premium": "권리금", "area": "실평수"},
+    total_keys=("deposit", "premium"),
+)
+
+UNIT_SALE = SheetSchema(
+    sheet_type="unit_sale",
+    title="구분상가매매",
+    filename_env="UNIT_SALE_SHEET_FILENAME",
+    expected_headers=(
+        "접수일","지역","지번","건물명","층수","가게명","분양(㎡)","분양(평)","전용(평)",
+        "보증금","월세","매매가","평당가격","LTV","이율","수익율","비고","담당자","현황",
+        "소유주","연락처"
+    ),
+    id_key_columns=("접수일","지역","지번","층수"),
+    id_prefix="uss",
+    address_columns=("지역","지번"),
+    address_has_district=False,
+    numeric_columns={"deposit": "보증금", "rent": "월세", "price": "매매가", "area": "전용(평)"},
+)
+
+BUILDING_SALE = SheetSchema(
+    sheet_type="building_sale",
+    title="건물토지매매",
+    filename_env="BUILDING_SALE_SHEET_FILENAME",
+    expected_headers=(
+        "접수일","지역","지번","건물명","지하총층","지상총층","대지면적(㎡)","대지면적(평)",
+        "건축면적(㎡)","연면적(㎡)","보증금","월세","매매가","평당가격","LTV","이율","수익율",
+        "비고","담당자","현황","소유자","소유자관계","연락처"
+    ),
+    id_key_columns=("접수일","지역","지번"),
+    id_prefix="bld",
+    address_columns=("지역","지번"),
+    address_has_district=False,
+    numeric_columns={"deposit": "보증금", "rent": "월세", "price": "매매가", "area": "대지면적(평)"},
+)
+
+SHEET_SCHEMAS: Dict[str, SheetSchema] = {s.sheet_type: s for s in (LEASE, UNIT_SALE, BUILDING_SALE)}
+DEFAULT_SHEET = LEASE.sheet_type
+
+
+def get_sheet_schema(sheet_type: Optional[str] = None) -> SheetSchema:
+    """시트 종류 → 스키마 (알 수 없는 종류는 ValueError)"""
+    schema = SHEET_SCHEMAS.get(sheet_type or DEFAULT_SHEET)
+    if schema is None:
+        raise ValueError(f"알 수 없는 시트 종류: {sheet_type}")
+    return schema
@@ -0,0 +1,61 @@
+# app/services/listing_snapshot.py
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+
+from .listing_compact import CompactListings
+from .listing_sheets import get_sheet_schema
+
+
+class ListingSnapshot:
+    """
+    정규화가 끝난 매물 목록의 불변 스냅샷.
+
+    시트 종류별로 원본 파일 버전(시트 mtime, 지도캐시 mtime)마다 한 번만 만들어지고
+    모든 요청이 같은 객체를 공유한다.
+    items 는 압축 표현(CompactListings)이며 접근할 때마다 매물 dict 를 새로 만든다.
+    """
+
+    def __init__(self, version: int, source_key: Tuple, items: Union[CompactListings, Sequence[dict]],
+                 sheet_type: str = "lease"):
+        self.version = version
+        self.source_key = source_key
+        self.sheet_type = sheet_type
+        if not isinstance(items, CompactListings):
+            items = CompactListings.from_items(list(items), get_sheet_schema(sheet_type))
+        self.items: CompactListings = items
+        self.built_at = time.time()
+
+        # 스냅샷에서 파생되는 인덱스/캐시 (버전이 바뀌면 스냅샷과 함께 폐기됨)
+        self._derived: Dict[str, Any] = {}
+        # 파생 데이터가 다른 파생 데이터를 참조할 수 있으므로 재진입 가능 락
+        self._derived_lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def derived(self, key: str, factory: Callable[["ListingSnapshot"], Any]) -> Any:
+        """스냅샷 단위로 한 번만 계산되는 파생 데이터를 반환"""
+        value = self._derived.get(key)
+        if value is not None:
+            return value
+        with self._derived_lock:
+            value = self._derived.get(key)
+            if value is None:
+                value = factory(self)
+                self._derived[key] = value
+            return value
+
+    def get(self, listing_id: str) -> Optional[dict]:
+        return self.items.get(listing_id)
+
+    def info(self) -> dict:
+        """스냅샷 메타 정보"""
+        return {
+            "version": self.version,
+            "sheet_type": self.sheet_type,
+            "count": len(self.items),
+            "built_at": self.built_at,
+            "source_key": list(self.source_key),
+        }
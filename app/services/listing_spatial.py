@@ -0,0 +1,78 @@
+# app/services/listing_spatial.py
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 격자 한 칸 크기 (도 단위, 위도 기준 약 1.1km)
+GRID_CELL_DEG = 0.01
+
+BBox = Tuple[float, float, float, float]  # (minLat, minLng, maxLat, maxLng)
+
+
+def parse_bbox(raw: Optional[str]) -> Optional[BBox]:
+    """'minLat,minLng,maxLat,maxLng' → BBox (형식이 틀리면 ValueError)"""
+    if not raw:
+        return None
+    parts = [float(p) for p in str(raw).split(",")]
+    if len(parts) != 4:
+        raise ValueError("bbox 는 minLat,minLng,maxLat,maxLng 4개 값이어야 합니다")
+    min_lat, min_lng, max_lat, max_lng = parts
+    if min_lat > max_lat or min_lng > max_lng:
+        raise ValueError("bbox 최소값이 최대값보다 큽니다")
+    if not (-90 <= min_lat <= 90 and -90 <= max_lat <= 90 and -180 <= min_lng <= 180 and -180 <= max_lng <= 180):
+        raise ValueError("bbox 좌표 범위가 잘못되었습니다")
+    return (min_lat, min_lng, max_lat, max_lng)
+
+
+class GridIndex:
+    """
+    좌표가 있는 매물을 고정 크기 격자에 나눠 담은 공간 인덱스.
+    bbox 조회는 겹치는 칸만 훑으므로 화면에 보이는 매물 수에 비례한다.
+    """
+
+    def __init__(self, lats: Sequence[Optional[float]], lngs: Sequence[Optional[float]],
+                 cell_deg: float = GRID_CELL_DEG):
+        self.cell_deg = cell_deg
+        self.lats = lats
+        self.lngs = lngs
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        self.count = 0
+        for pos, (lat, lng) in enumerate(zip(lats, lngs)):
+            if lat is None or lng is None:
+                continue
+            self.cells.setdefault(self._cell(lat, lng), []).append(pos)
+            self.count += 1
+
+    @classmethod
+    def from_items(cls, items: Sequence[dict], cell_deg: float = GRID_CELL_DEG) -> "GridIndex":
+        coords = [item.get("coords") or {} for item in items]
+        return cls([c.get("lat") for c in coords], [c.get("lng") for c in coords], cell_deg)
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg))
+
+    def query(self, bbox: BBox) -> List[int]:
+        """bbox 안에 있는 매물의 행 위치 (오름차순)"""
+        min_lat, min_lng, max_lat, max_lng = bbox
+        lo_r, lo_c = self._cell(min_lat, min_lng)
+        hi_r, hi_c = self._cell(max_lat, max_lng)
+        lats, lngs = self.lats, self.lngs
+
+        result: List[int] = []
+        # 화면이 격자 전체보다 넓으면 칸을 일일이 훑지 않고 채워진 칸만 확인
+        if (hi_r - lo_r + 1) * (hi_c - lo_c + 1) > len(self.cells):
+            cells = [pos for (r, c), pos in self.cells.items() if lo_r <= r <= hi_r and lo_c <= c <= hi_c]
+        else:
+            cells = [self.cells[(r, c)] for r in range(lo_r, hi_r + 1) for c in range(lo_c, hi_c + 1)
+                     if (r, c) in self.cells]
+        for positions in cells:
+            for p in positions:
+                if min_lat <= lats[p] <= max_lat and min_lng <= lngs[p] <= max_lng:
+                    result.append(p)
+        result.sort()
+        return result
+
+
+def get_spatial_index(snapshot) -> GridIndex:
+    """스냅샷에 연결된 격자 공간 인덱스 (스냅샷마다 한 번만 생성)"""
+    return snapshot.derived("spatial_index", lambda snap: GridIndex(*snap.items.coordinates()))
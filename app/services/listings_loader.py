@@ -3,76 +3,157 @@
 
 import os
 import json
+import time
+import logging
+import threading
 import pandas as pd
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack
+from typing import List, Dict, Iterable, Optional, Tuple, Union
 from flask import current_app
-from .sheet_fetcher import read_local_listing_sheet
-from ..core.ids import listing_id_from_row
-from ..core.utils import to_int_or_none
-from ..models.listing_schema import Listing
-
-# 헤더 기대 (최소)
-EXPECTED_HEADERS = [
-    "접수날짜","지역","지번","건물명","층수","가게명","분양","실평수",
-    "보증금","월세","권리금","비고","담당자","현황","지역2","연락처",
-    "의뢰인","비고3","위반여부","현수막번호"
-]
-
-class CacheEntry:
-    """TTL 기반 캐시 엔트리 클래스"""
-    def __init__(self, data: Any, ttl_seconds: int = 300):
-        self.data = data
-        self.created_at = datetime.now()
-        self.ttl_seconds = ttl_seconds
-    
-    def is_expired(self) -> bool:
-        """캐시가 만료되었는지 확인"""
-        return datetime.now() - self.created_at > timedelta(seconds=self.ttl_seconds)
+from ..core.singleflight import KeyedLoader, SingleFlight
+from .sheet_fetcher import read_sheet_rows
+from .listing_sheets import SheetSchema, SHEET_SCHEMAS, DEFAULT_SHEET, LEASE, get_sheet_schema
+from .listing_snapshot import ListingSnapshot
+from .listing_compact import CompactListings
+from .listing_columnar import (load_columnar_snapshot, write_columnar_snapshot, columnar_snapshot_path,
+                               publish_snapshot_version, published_version_stamp, read_published_version,
+                               snapshot_build_lock)
+from .listing_delta import record_snapshot_change
+from .listing_query import get_query_index
+from .reverse_matching import record_listing_matches
+from .snapshot_warmup import request_snapshot_warmup, should_warm
+from .listing_normalize import extract_columns, address_column, listing_id_column, normalize_sheet
+
+logger = logging.getLogger(__name__)
+
+# 헤더 기대 (최소) - 상가임대차. 시트별 헤더는 listing_sheets.SHEET_SCHEMAS 참고
+EXPECTED_HEADERS = list(LEASE.expected_headers)
+
+# 프로세스 단위 매물 스냅샷 (시트 종류별, 원본 파일 버전마다 한 번만 생성)
+# 읽기는 락 없이 현재 dict 참조만 가져가고, 재구성만 _snapshot_lock 을 잡고
+# 새 dict 로 통째로 교체한다 (copy-on-write: 읽는 쪽이 보는 dict 는 바뀌지 않음)
+_snapshots: Dict[str, ListingSnapshot] = {}
+_snapshot_lock = threading.Lock()
+# 버전은 ms 타임스탬프 기반: 재시작 후나 다른 워커 프로세스가 만든 버전과도 순서가 맞음
+_last_version = 0
+# 다른 워커가 공개한 스냅샷 버전 (시트 → (버전 파일 mtime, 버전))
+_published: Dict[str, Tuple[Optional[int], int]] = {}
+# 컬럼 파일을 복사하지 않고 매핑한 채로 사용 (워커 간 메모리 공유).
+# Windows 는 매핑 중인 파일을 교체할 수 없으므로 복사해서 사용
+SHARED_SNAPSHOTS = os.name == "posix"
+# 지도캐시 읽기 (파일 버전별 결과 공유)
+_map_cache_loader = KeyedLoader()
+# 요청 안에서의 스냅샷 재구성 (같은 시트/원본 버전의 동시 요청은 한 번의 재구성 결과를 공유)
+_rebuild_flight = SingleFlight()
+# 여러 시트 동시 파싱용 프로세스 풀 (재구성마다 새로 만들지 않고 재사용)
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+def _listing_sheet_path(sheet_type: str = DEFAULT_SHEET) -> str:
+    """시트 파일 경로 (sheet_fetcher와 동일한 규칙)"""
+    return get_sheet_schema(sheet_type).path
+
+def _map_cache_path() -> str:
+    """지도캐시.xlsx 경로"""
+    fn = current_app.config["MAP_CACHE_FILENAME"]
+    data_dir = current_app.config["DATA_DIR"]
+    return os.path.join(data_dir, "raw", fn)
+
+def _mtime_or_zero(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+def _source_signature(sheet_type: str = DEFAULT_SHEET) -> Tuple[float, float]:
+    """스냅샷 버전 판단 기준: (매물 시트 mtime, 지도캐시 mtime)"""
+    return (_mtime_or_zero(_listing_sheet_path(sheet_type)), _mtime_or_zero(_map_cache_path()))
+
+def _next_version(floor: int = 0) -> int:
+    """새 스냅샷 버전 (floor 보다 큼: 이미 공개된 버전보다 뒤에 오도록)"""
+    global _last_version
+    _last_version = max(_last_version + 1, floor + 1, int(time.time() * 1000))
+    return _last_version
 
-# TTL 기반 캐시 (기존 전역 변수 대체)
-_cache: Optional[CacheEntry] = None
+def _published_version(sheet_type: str) -> int:
+    """다른 워커(또는 이 워커)가 컬럼 파일과 함께 공개한 최신 스냅샷 버전 (버전 파일 mtime 이 같으면 다시 읽지 않음)"""
+    path = columnar_snapshot_path(sheet_type)
+    stamp = published_version_stamp(path)
+    if stamp is None:
+        return 0
+    cached = _published.get(sheet_type)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    version = read_published_version(path)
+    _published[sheet_type] = (stamp, version)
+    return version
+
+def _source_state(sheet_type: str = DEFAULT_SHEET) -> Tuple[Tuple[float, float], int]:
+    """스냅샷 최신 여부 판단 기준: (원본 버전, 공개된 스냅샷 버전)"""
+    return _source_signature(sheet_type), _published_version(sheet_type)
+
+def _is_current(snapshot: Optional[ListingSnapshot], sheet_type: str) -> bool:
+    """원본이 그대로이고 다른 워커가 더 새 버전(강제 새로고침 등)을 공개하지 않았으면 True"""
+    if snapshot is None:
+        return False
+    source_key, published = _source_state(sheet_type)
+    return snapshot.source_key == source_key and snapshot.version >= published
+
+def invalidate_listing_snapshots() -> bool:
+    """
+    캐시 삭제 후 호출: 모든 시트에 더 새 버전을 공개해 이 워커와 다른 워커의 스냅샷을 모두 오래된 것으로 만들고
+    백그라운드 재구성을 요청한다. (컬럼 파일이 없으므로 빌드 락을 잡은 한 워커가 원본에서 다시 파싱)
+    백그라운드 준비를 쓸 수 없으면 False (다음 요청이 직접 재구성)
+    """
+    version = _next_version()
+    for t in SHEET_SCHEMAS:
+        publish_snapshot_version(columnar_snapshot_path(t), version)
+    return request_snapshot_warmup("cache cleared")
 
 def read_map_cache() -> Dict[str, tuple[float,float]]:
     """
     data/raw/지도캐시.xlsx 의 '지도캐시' 시트를 읽어서
     {주소: (lat, lng)} 매핑을 반환합니다.
+    파일 버전(mtime)이 같으면 마지막 결과를 재사용하고, 동시에 들어온 읽기는 한 번으로 합친다.
+    반환되는 dict 는 공유되므로 수정하지 말 것
     """
-    fn   = current_app.config["MAP_CACHE_FILENAME"]  # "지도캐시.xlsx"
-    data_dir = current_app.config["DATA_DIR"]
-    path = os.path.join(data_dir, "raw", fn)
+    path = _map_cache_path()
     if not os.path.exists(path):
         current_app.logger.warning(f"Map cache not found: {path}")
         return {}
 
     try:
-        # Excel 파일 열고 시트 이름 목록을 확인
-        xls = pd.ExcelFile(path)
-        # 만약 '지도캐시' 시트가 있으면, 그걸 쓰고 아니면 첫 번째 시트 사용
-        sheet = "지도캐시" if "지도캐시" in xls.sheet_names else xls.sheet_names[0]
-        current_app.logger.info(f"Using sheet for map cache: {sheet}")
-
-        df = pd.read_excel(path, sheet_name=sheet, dtype=str).fillna("")
-
-        mapping: dict[str, tuple[float,float]] = {}
-        for _, row in df.iterrows():
-            addr = row.get("주소","").strip()
-            lat  = row.get("위도","").strip()
-            lng  = row.get("경도","").strip()
-            if addr and lat and lng:
-                coords = safe_parse_coordinates(lat, lng)
-                if coords:
-                    mapping[addr] = coords
-                else:
-                    current_app.logger.warning(f"Invalid coordinates for {addr}: {lat}/{lng}")
-        
-        current_app.logger.info(f"Loaded {len(mapping)} coordinate mappings")
-        return mapping
-        
+        return _map_cache_loader.get((path, _mtime_or_zero(path)), lambda: _load_map_cache(path))
     except Exception as e:
         current_app.logger.error(f"Failed to read map cache: {e}")
         return {}
 
+def _load_map_cache(path: str) -> Dict[str, tuple[float,float]]:
+    # Excel 파일 열고 시트 이름 목록을 확인
+    xls = pd.ExcelFile(path)
+    # 만약 '지도캐시' 시트가 있으면, 그걸 쓰고 아니면 첫 번째 시트 사용
+    sheet = "지도캐시" if "지도캐시" in xls.sheet_names else xls.sheet_names[0]
+    current_app.logger.info(f"Using sheet for map cache: {sheet}")
+
+    df = pd.read_excel(path, sheet_name=sheet, dtype=str).fillna("")
+
+    mapping: dict[str, tuple[float,float]] = {}
+    for _, row in df.iterrows():
+        addr = row.get("주소","").strip()
+        lat  = row.get("위도","").strip()
+        lng  = row.get("경도","").strip()
+        if addr and lat and lng:
+            coords = safe_parse_coordinates(lat, lng)
+            if coords:
+                mapping[addr] = coords
+            else:
+                current_app.logger.warning(f"Invalid coordinates for {addr}: {lat}/{lng}")
+    
+    current_app.logger.info(f"Loaded {len(mapping)} coordinate mappings")
+    return mapping
+
 def safe_parse_coordinates(lat: str, lng: str) -> Optional[tuple[float, float]]:
     """안전하게 좌표를 파싱하는 함수"""
     try:
@@ -90,115 +171,313 @@ def safe_parse_coordinates(lat: str, lng: str) -> Optional[tuple[float, float]]:
         current_app.logger.warning(f"Invalid coordinate format: {lat}/{lng} - {e}")
         return None
 
-def normalize_headers(header_row: list[str]) -> Dict[str, int]:
+def normalize_headers(header_row: list[str], expected: Iterable[str] = EXPECTED_HEADERS) -> Dict[str, int]:
     mapping = {}
-    for name in EXPECTED_HEADERS:
+    for name in expected:
         if name in header_row:
             mapping[name] = header_row.index(name)
     return mapping
 
-def build_address(row: list[str], hdr: Dict[str,int]) -> str:
+def assign_listing_ids(rows: list[list[str]], hdr: Dict[str,int],
+                       schema: SheetSchema = LEASE) -> Dict[int, str]:
+    """
+    데이터 행 번호(1부터) → 내용 기반 매물 ID
+    주소가 없어 매물로 쓰이지 않는 행은 제외 (normalize_sheet 과 같은 기준)
+    """
+    columns = extract_columns(rows, hdr)
+    addresses = address_column(columns, schema, max(len(rows) - 1, 0))
+    ids = listing_id_column(columns, addresses, schema)
+    return {i: lid for i, lid in enumerate(ids, start=1) if lid}
+
+def get_listing_snapshot(force_reload: bool = False, sheet_type: str = DEFAULT_SHEET,
+                         allow_stale: bool = True) -> ListingSnapshot:
+    """
+    현재 원본 파일 버전에 해당하는 시트별 매물 스냅샷 반환
+    같은 버전이면 모든 요청이 이미 만들어진 스냅샷을 그대로 공유한다.
+    force_reload=True 시 파일 버전과 관계없이 새 스냅샷 생성
+
+    이미 스냅샷이 있으면 원본이 바뀌어도 기존 스냅샷을 반환하고 백그라운드 재구성을 요청한다.
+    allow_stale=False 이면 현재 원본 버전의 스냅샷이 준비될 때까지 기다린다.
+    요청 안에서 만들 때 같은 시트/원본 버전의 동시 요청은 한 번의 재구성 결과를 함께 받는다.
+
+    요청 안에서 다시 만들어야 할 때는 이미 로드된 다른 시트 중 원본이 바뀐 것도 함께 병렬로 다시 만든다.
+    (동기화는 세 시트를 한 번에 내려받으므로 시트마다 따로 기다리지 않도록)
+    """
+    get_sheet_schema(sheet_type)
+    snapshot = _snapshots.get(sheet_type)
+    state = _source_state(sheet_type)
+    if not force_reload and snapshot is not None:
+        if snapshot.source_key == state[0] and snapshot.version >= state[1]:
+            return snapshot
+        # 원본(또는 공개된 버전)이 바뀌었어도 기존 스냅샷을 계속 제공하고 재구성은 백그라운드에서
+        # (같은 상태를 이미 시도했다면 실패한 것이므로 다시 요청하지 않음)
+        if allow_stale and (not should_warm(sheet_type, state) or request_snapshot_warmup("source changed")):
+            return snapshot
+
+    flight_key = (sheet_type, "force" if force_reload else state)
+    return _rebuild_flight.do(flight_key, lambda: _rebuild_for_request(sheet_type, force_reload))
+
+def _rebuild_for_request(sheet_type: str, force_reload: bool) -> ListingSnapshot:
+    with _snapshot_lock:
+        # 락 대기 중 다른 요청(또는 백그라운드 준비)이 이미 같은 버전을 만들었으면 재사용
+        snapshot = _snapshots.get(sheet_type)
+        if not force_reload and _is_current(snapshot, sheet_type):
+            return snapshot
+
+        stale = [t for t, snap in _snapshots.items() if t != sheet_type and not _is_current(snap, t)]
+        _rebuild_snapshots([sheet_type] + stale, force_reload=force_reload, required=sheet_type)
+        return _snapshots[sheet_type]
+
+def get_listing_snapshots(sheet_types: Optional[Iterable[str]] = None,
+                          force_reload: bool = False) -> Dict[str, ListingSnapshot]:
+    """
+    여러 시트의 스냅샷을 한 번에 준비 (기본: 전체 시트)
+    원본이 바뀐 시트들은 프로세스 풀에서 동시에 파싱된다.
+    원본 파일이 없는 시트는 결과에서 빠진다.
+    """
+    types = list(sheet_types or SHEET_SCHEMAS)
+    for t in types:
+        get_sheet_schema(t)
+    with _snapshot_lock:
+        stale = [t for t in types if force_reload or not _is_current(_snapshots.get(t), t)]
+        if stale:
+            _rebuild_snapshots(stale, force_reload=force_reload)
+        return {t: _snapshots[t] for t in types if t in _snapshots}
+
+def load_listings(force_reload=False, sheet_type: str = DEFAULT_SHEET, allow_stale: bool = True) -> List[dict]:
+    """
+    매물 데이터 로드 (공유 스냅샷 기반)
+    allow_stale=False 이면 원본이 바뀐 직후에도 재구성된 최신 스냅샷을 기다린다.
+    """
+    snapshot = get_listing_snapshot(force_reload=force_reload, sheet_type=sheet_type, allow_stale=allow_stale)
+    return list(snapshot.items)
+
+def _rebuild_snapshots(sheet_types: List[str], force_reload: bool = False,
+                       required: Optional[str] = None) -> None:
+    """
+    주어진 시트들의 스냅샷을 새로 만들어 설치 (_snapshot_lock 안에서 호출)
+    컬럼 스냅샷 캐시가 없는 시트만 Excel 에서 파싱하며, 둘 이상이면 프로세스 풀에서 동시에 파싱한다.
+    파싱은 컬럼 파일별 프로세스 간 락 안에서 하므로 여러 워커 중 한 곳만 만들고
+    나머지는 락을 기다린 뒤 그 워커가 쓴 파일을 매핑해서 쓴다.
+    required 시트의 파싱이 실패하면 예외를 그대로 올린다.
+    """
+    source_keys = {t: _source_signature(t) for t in sheet_types}
+    results: Dict[str, Tuple[Union[CompactListings, List[dict]], Optional[int]]] = {}
+
+    to_parse = []
+    built: List[str] = []  # 이 프로세스가 원본에서 파싱한 시트
+    for t in sheet_types:
+        cached = None if force_reload else _load_cached_items(t, source_keys[t])
+        if cached is None:
+            to_parse.append(t)
+        else:
+            results[t] = cached
+
+    if to_parse:
+        with ExitStack() as locks:
+            for t in sorted(to_parse):
+                locks.enter_context(snapshot_build_lock(columnar_snapshot_path(t)))
+            # 락을 기다리는 동안 다른 워커가 같은 원본 버전을 만들었으면 그 파일 사용
+            if not force_reload:
+                for t in list(to_parse):
+                    cached = _load_cached_items(t, source_keys[t])
+                    if cached is not None:
+                        results[t] = cached
+                        to_parse.remove(t)
+            if to_parse:
+                parsed = _parse_and_publish(to_parse, source_keys, force_reload, required)
+                results.update(parsed)
+                built.extend(parsed)
+
+    for t, (items, version) in results.items():
+        _install_snapshot(t, source_keys[t], items, version, record_matches=t in built)
+
+def _parse_and_publish(sheet_types: List[str], source_keys: Dict[str, Tuple[float, float]],
+                       force_reload: bool, required: Optional[str]
+                       ) -> Dict[str, Tuple[Union[CompactListings, List[dict]], Optional[int]]]:
+    """원본에서 파싱 → 컬럼 파일 저장 → 버전 공개 (빌드 락 안에서 호출)"""
+    if force_reload:
+        current_app.logger.info(f"🔄 강제 새로고침: 캐시 무시하고 파일에서 직접 로드 ({', '.join(sheet_types)})")
+    parsed, errors = _parse_sheets(sheet_types)
+    for t, error in errors.items():
+        current_app.logger.error(f"❌ {get_sheet_schema(t).title} 시트 파싱 실패: {error}")
+        if t == required:
+            raise error
+
+    results = {}
+    map_cache = read_map_cache() if parsed else {}
+    for t, items in parsed.items():
+        _apply_map_cache(items, map_cache, get_sheet_schema(t))
+        current_app.logger.info(f"✅ Loaded listings: {len(items)} ({t}, force_reload: {force_reload})")
+        results[t] = (items, None)
+        if items:
+            try:
+                path = columnar_snapshot_path(t)
+                version = _next_version(_published_version(t))
+                write_columnar_snapshot(items, source_keys[t], path, version)
+                publish_snapshot_version(path, version)
+                # 방금 쓴 파일을 매핑해서 사용 (다른 워커와 같은 페이지 공유)
+                results[t] = _load_cached_items(t, source_keys[t]) or (items, version)
+            except Exception as e:
+                current_app.logger.warning(f"⚠️ 컬럼 스냅샷 캐시 저장 실패 ({t}): {e}")
+    return results
+
+def _install_snapshot(sheet_type: str, source_key: Tuple[float, float],
+                      items: Union[CompactListings, List[dict]], version: Optional[int] = None,
+                      record_matches: bool = True) -> ListingSnapshot:
+    """
+    version 이 주어지면(공개된 컬럼 파일) 그 번호를 그대로 써서 모든 워커의 버전을 맞춘다
+    record_matches: 고객 매칭 이벤트 기록 여부 (공유 로그이므로 직접 파싱한 프로세스만)
+    """
+    global _snapshots
+    previous = _snapshots.get(sheet_type)
+    snapshot = ListingSnapshot(version or _next_version(_published_version(sheet_type)), source_key, items,
+                               sheet_type=sheet_type)
     try:
-        region2 = row[hdr["지역2"]].strip()
-        region = row[hdr["지역"]].strip()
-        lot = row[hdr["지번"]].strip()
-        return f"{region2} {region} {lot}".strip()
-    except:
-        return ""
-
-def normalize_listing(row_idx: int, row: list[str], hdr: Dict[str,int]) -> Listing | None:
+        delta = record_snapshot_change(previous, snapshot)
+        if delta is not None:
+            current_app.logger.info(
+                f"🧾 매물 변경({sheet_type}): +{len(delta.added)} -{len(delta.removed)} ~{len(delta.changed)} "
+                f"({delta.from_version} → {delta.to_version})"
+            )
+    except Exception as e:
+        delta = None
+        current_app.logger.warning(f"⚠️ 매물 변경 내역 기록 실패: {e}")
     try:
-        status_raw = row[hdr["현황"]].strip()
-        # 디버그: 현황 값 확인
-        if row_idx <= 5:  # 처음 5개 행만 로그
-            current_app.logger.info(f"Row {row_idx}: 현황 = '{status_raw}' (원본: '{row[hdr['현황']]}')")
+        # 추가/변경된 매물만 고객 조건과 대조 (역방향 매칭)
+        matched = record_listing_matches(snapshot, delta) if record_matches else 0
+        if matched:
+            current_app.logger.info(f"🤝 고객 매칭 이벤트 {matched}건 기록 ({sheet_type}, version={snapshot.version})")
     except Exception as e:
-        current_app.logger.error(f"Row {row_idx}: 현황 읽기 실패 - {e}")
-        status_raw = ""
+        current_app.logger.warning(f"⚠️ 고객 역방향 매칭 실패: {e}")
+    # 교체 전에 쿼리 인덱스를 만들어 둠 (교체 직후 요청이 인덱스 생성을 기다리지 않도록)
+    get_query_index(snapshot)
+    _snapshots = {**_snapshots, sheet_type: snapshot}
+    current_app.logger.info(f"📦 매물 스냅샷 생성: sheet={sheet_type}, version={snapshot.version}, count={len(snapshot)}")
+    return snapshot
 
-    address_full = build_address(row, hdr)
-    if address_full.strip() == "":
+def _load_cached_items(sheet_type: str, source_key: Tuple[float, float]
+                       ) -> Optional[Tuple[CompactListings, Optional[int]]]:
+    """
+    같은 원본 버전의 컬럼 스냅샷 파일이 있으면 매핑해서 압축 매물 목록으로 복원 (dict 생성 없음)
+    반환: (매물 목록, 파일에 기록된 스냅샷 버전)
+    """
+    try:
+        columnar = load_columnar_snapshot(source_key, columnar_snapshot_path(sheet_type))
+        if columnar is None:
+            return None
+        if (columnar.version or 0) < _published_version(sheet_type):
+            # 공개된 버전보다 오래된 파일 (캐시 삭제 등으로 새 버전만 공개된 상태) → 원본에서 다시
+            columnar.close()
+            return None
+        if SHARED_SNAPSHOTS:
+            # 배열은 매핑된 파일을 그대로 가리킴 (memoryview 가 매핑을 유지하고 스냅샷과 함께 해제)
+            items = CompactListings.from_columnar(columnar, get_sheet_schema(sheet_type), shared=True)
+        else:
+            try:
+                items = CompactListings.from_columnar(columnar, get_sheet_schema(sheet_type))
+            finally:
+                columnar.close()
+        current_app.logger.info(f"✅ 컬럼 스냅샷 캐시 사용 ({sheet_type}): {len(items)}개, version={columnar.version}")
+        return items, columnar.version
+    except Exception as e:
+        current_app.logger.warning(f"⚠️ 컬럼 스냅샷 캐시 읽기 실패 ({sheet_type}), 원본에서 재구성: {e}")
         return None
 
-    def gv(col):  # get value
-        return row[hdr[col]] if col in hdr else ""
-
-    fields = { col: gv(col) for col in hdr.keys() }
-
-    # numeric parsing (만원 기준이라면 그대로 int)
-    deposit = to_int_or_none(fields.get("보증금"))
-    rent = to_int_or_none(fields.get("월세"))
-    premium = to_int_or_none(fields.get("권리금"))
-    area = to_int_or_none(fields.get("실평수"))
-    total = None
-    if deposit is not None and premium is not None:
-        total = deposit + premium
-
-    listing = Listing(
-        id=listing_id_from_row(row_idx),
-        raw_row_index=row_idx,
-        address_full=address_full,
-        address_comp={
-            "region2": fields.get("지역2",""),
-            "region": fields.get("지역",""),
-            "lot": fields.get("지번","")
-        },
-        fields=fields,
-        coords={"lat": None, "lng": None},  # S2 이후 geocode fill
-        numeric_cache={
-            "deposit": deposit,
-            "rent": rent,
-            "premium": premium,
-            "area": area,
-            "total": total
-        },
-        status_raw=status_raw
-    )
-    return listing
-
-def load_listings(force_reload=False) -> List[dict]:
-    """
-    매물 데이터 로드
-    force_reload=True 시 캐시 무시하고 파일에서 직접 읽기
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """시트 파싱용 프로세스 풀 (프로세스당 하나, 처음 쓸 때 생성해 계속 재사용)"""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=len(SHEET_SCHEMAS))
+        return _parse_pool
+
+def _discard_parse_pool() -> None:
+    """깨진 풀 버리기 (다음 파싱 때 새로 생성)"""
+    global _parse_pool
+    with _parse_pool_lock:
+        pool, _parse_pool = _parse_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+def _parse_sheets(sheet_types: List[str]) -> Tuple[Dict[str, List[dict]], Dict[str, Exception]]:
     """
-    if force_reload:
-        current_app.logger.info("🔄 강제 새로고침: 캐시 무시하고 파일에서 직접 로드")
-    else:
-        current_app.logger.info("📊 일반 로드: 캐시 우선 사용")
-    
-    # sheet_fetcher에 force_reload 파라미터 전달
-    rows = read_local_listing_sheet(force_reload=force_reload)
-    
+    시트들을 파싱: (시트별 매물 목록, 시트별 오류)
+    시트가 둘 이상이면 프로세스 풀에서 동시에 처리 (Excel 파싱은 CPU 작업이라 스레드로는 병렬화되지 않음)
+    시트 하나는 풀을 거치지 않고 현재 프로세스에서 바로 파싱한다.
+    """
+    parsed: Dict[str, List[dict]] = {}
+    errors: Dict[str, Exception] = {}
+
+    if len(sheet_types) > 1:
+        try:
+            pool = _get_parse_pool()
+            futures = {t: pool.submit(parse_listing_sheet, t) for t in sheet_types}
+            for t, future in futures.items():
+                try:
+                    parsed[t] = future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    errors[t] = e
+            return parsed, errors
+        except Exception as e:
+            # 프로세스 생성이 불가능하거나 풀이 깨졌으면 순차 처리
+            current_app.logger.warning(f"⚠️ 프로세스 풀 사용 불가, 순차 파싱: {e}")
+            _discard_parse_pool()
+            parsed.clear()
+            errors.clear()
+
+    for t in sheet_types:
+        try:
+            parsed[t] = parse_listing_sheet(t)
+        except Exception as e:
+            errors[t] = e
+    return parsed, errors
+
+def parse_listing_sheet(sheet_type: str = DEFAULT_SHEET) -> List[dict]:
+    """
+    시트 하나를 원본 파일에서 읽어 정규화 (좌표는 비어 있음)
+    프로세스 풀에서 실행되므로 Flask 앱 컨텍스트에 의존하지 않는다.
+    """
+    schema = get_sheet_schema(sheet_type)
+    rows = read_sheet_rows(schema.path)
+
     if rows is None or len(rows) == 0:
-        current_app.logger.error("❌ Excel 파일에서 데이터를 읽을 수 없습니다.")
+        logger.error(f"❌ Excel 파일에서 데이터를 읽을 수 없습니다: {schema.filename}")
         return []
-    
+
     header = rows[0]
-    hdr_map = normalize_headers(header)
-    missing = [h for h in EXPECTED_HEADERS if h not in hdr_map]
+    hdr_map = normalize_headers(header, schema.expected_headers)
+    missing = [h for h in schema.expected_headers if h not in hdr_map]
     if missing:
-        current_app.logger.warning(f"Missing headers: {missing}")
+        logger.warning(f"Missing headers ({sheet_type}): {missing}")
 
-    listings: List[dict] = []
-    for i, row in enumerate(rows[1:], start=1):
-        listing = normalize_listing(i, row, hdr_map)
-        if listing:
-            listings.append(listing.to_dict())
+    # 컬럼 단위 정규화 (ID 는 행 위치가 아닌 내용 기반 - 행 추가/삭제에도 유지됨)
+    return normalize_sheet(rows, hdr_map, schema)
 
-    # 지도캐시 매핑 적용
-    _apply_map_cache(listings)
-    
-    current_app.logger.info(f"✅ Loaded listings: {len(listings)} (force_reload: {force_reload})")
-    return listings
-
-def _apply_map_cache(listings: List[dict]) -> None:
-    """지도 캐시 매핑 적용"""
+def _apply_map_cache(listings: List[dict], map_cache: Optional[Dict[str, tuple]] = None,
+                     schema: SheetSchema = LEASE) -> None:
+    """
+    지도 캐시 매핑 적용
+    주소에 구/시가 없는 시트(매매)는 '동 지번'이 지도캐시에서 한 곳으로만 특정될 때 그 좌표를 사용
+    """
     try:
-        map_cache = read_map_cache()
+        if map_cache is None:
+            map_cache = read_map_cache()
+        by_suffix: Dict[str, Optional[tuple]] = {}
+        if not schema.address_has_district:
+            for addr, coords in map_cache.items():
+                parts = addr.split(" ", 1)
+                if len(parts) == 2:
+                    suffix = parts[1]
+                    by_suffix[suffix] = coords if suffix not in by_suffix else None
+
         for item in listings:
             addr = item.get("address_full", "")
-            if addr in map_cache and item.get("status_raw") == "생":
-                lat, lng = map_cache[addr]
+            coords = map_cache.get(addr) or by_suffix.get(addr)
+            if coords and item.get("status_raw") == "생":
+                lat, lng = coords
                 item["coords"] = {"lat": lat, "lng": lng}
             else:
                 item["coords"] = {"lat": None, "lng": None}
@@ -0,0 +1,70 @@
+# app/services/reload_admission.py
+
+import math
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .snapshot_warmup import request_snapshot_warmup
+
+# 사용자별 강제 새로고침 최소 간격(초)
+FORCE_RELOAD_MIN_INTERVAL = int(os.getenv("FORCE_RELOAD_MIN_INTERVAL", "30"))
+
+_admission_lock = threading.Lock()
+# 사용자 → 마지막으로 받아들인 강제 새로고침 시각 (간격이 지난 항목은 정리)
+_last_forced_at: Dict[str, float] = {}
+# 시트 → 진행 중(또는 대기 중)인 강제 재구성의 원본 버전
+_forcing: Dict[str, Tuple[float, float]] = {}
+# 시트 → 강제 재구성을 마친 원본 버전 (원본이 바뀌지 않았으면 다시 만들지 않음)
+_forced_sources: Dict[str, Tuple[float, float]] = {}
+
+
+def admit_force_reload(user_key: str, sheet_type: str) -> dict:
+    """
+    ?force=1 요청의 처리 방식 결정 (요청 스레드는 재구성을 기다리지 않음)
+    - rate_limited: 같은 사용자가 FORCE_RELOAD_MIN_INTERVAL 안에 다시 요청 (retry_after 초 포함)
+    - in_progress:  이 원본 버전의 강제 재구성이 이미 진행 중이거나 대기 중
+    - up_to_date:   이 원본 버전으로 이미 강제 재구성을 마침
+    - started:      백그라운드 강제 재구성 시작
+    - unavailable:  백그라운드 준비를 쓸 수 없음 (호출부에서 직접 재구성)
+    """
+    from .listings_loader import _source_signature
+
+    now = time.time()
+    source_key = _source_signature(sheet_type)
+    with _admission_lock:
+        for key in [k for k, at in _last_forced_at.items() if now - at >= FORCE_RELOAD_MIN_INTERVAL]:
+            del _last_forced_at[key]
+        last = _last_forced_at.get(user_key)
+        if last is not None:
+            return {"status": "rate_limited",
+                    "retry_after": math.ceil(FORCE_RELOAD_MIN_INTERVAL - (now - last))}
+        _last_forced_at[user_key] = now
+
+        if _forced_sources.get(sheet_type) == source_key:
+            return {"status": "up_to_date"}
+        if _forcing.get(sheet_type) == source_key:
+            return {"status": "in_progress"}
+        _forcing[sheet_type] = source_key
+
+    if not request_snapshot_warmup("force reload", force_sheet=sheet_type):
+        with _admission_lock:
+            _forcing.pop(sheet_type, None)
+        return {"status": "unavailable"}
+    return {"status": "started"}
+
+
+def finish_forced_reload(sheet_type: str, source_key: Optional[Tuple[float, float]]) -> None:
+    """
+    백그라운드 강제 재구성이 끝나면 호출: 성공하면 만든 원본 버전을 기록,
+    실패하면(source_key=None) 진행 표시를 지워 다음 요청이 다시 시작할 수 있게 한다
+    """
+    with _admission_lock:
+        if source_key is None:
+            _forcing.pop(sheet_type, None)
+            return
+        _forced_sources[sheet_type] = source_key
+        # 진행 중에 원본이 또 바뀌어 다시 요청된 경우는 그 재구성이 끝날 때까지 유지
+        if _forcing.get(sheet_type) == source_key:
+            del _forcing[sheet_type]
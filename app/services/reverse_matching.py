@@ -0,0 +1,218 @@
+# app/services/reverse_matching.py
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from ..core.singleflight import KeyedLoader
+from ..core.utils import split_manager_names
+from .customer_matching import CustomerCriteria, get_customer_criteria
+from .listing_columnar import snapshot_build_lock
+from .listing_query import get_query_index
+from .store import _admin_file
+
+# 변경된 매물을 고객 조건과 대조할 시트 (고객 조건은 상가임대차 기준)
+REVERSE_MATCH_SHEETS = ("lease",)
+
+# 매칭 이벤트 기록 (JSON Lines, 모든 워커 프로세스가 같은 파일을 읽음)
+MATCH_EVENT_LOG = "./data/cache/match_events.jsonl"
+
+# 보관 기간/개수 (둘 중 먼저 닿는 기준으로 오래된 이벤트 삭제)
+MATCH_EVENT_RETENTION_DAYS = 14
+MAX_MATCH_EVENTS = 5000
+
+
+class CustomerCriteriaIndex:
+    """
+    전체 고객(all_customers.xlsx) 조건의 역색인.
+    지역/지역2 검색어 → 고객 번호, 지역 조건이 없는 고객은 따로 모아 두고
+    변경된 매물 한 건마다 지역이 맞는 고객만 골라 숫자/층수 조건을 확인한다.
+    """
+
+    def __init__(self, customers: Sequence[dict]):
+        self.customers = list(customers)
+        self.criteria: List[CustomerCriteria] = [get_customer_criteria(c) for c in self.customers]
+
+        # 텍스트 키(region/region2) → 검색어 → 고객 번호 목록
+        self.tokens: Dict[str, Dict[str, List[int]]] = {"region": {}, "region2": {}}
+        self.text_keys: List[tuple] = []  # 고객별 지역 조건 키
+        for i, criteria in enumerate(self.criteria):
+            keys = tuple(k for k in self.tokens if k in criteria.query.text)
+            self.text_keys.append(keys)
+            for key in keys:
+                for token in criteria.query.text[key]:
+                    self.tokens[key].setdefault(token, []).append(i)
+        self.unrestricted = [i for i, keys in enumerate(self.text_keys) if not keys]
+        # 매물 값 → 일치하는 고객 번호 (같은 지역명은 한 번만 검사)
+        self._value_cache: Dict[tuple, frozenset] = {}
+
+    def __len__(self) -> int:
+        return len(self.customers)
+
+    def _text_matches(self, key: str, value: str) -> frozenset:
+        cache_key = (key, value)
+        matched = self._value_cache.get(cache_key)
+        if matched is None:
+            # 목록 필터와 같은 부분 문자열 일치
+            hits = set()
+            if value:
+                for token, ids in self.tokens[key].items():
+                    if token in value:
+                        hits.update(ids)
+            matched = self._value_cache[cache_key] = frozenset(hits)
+        return matched
+
+    def match_position(self, index, pos: int) -> List[int]:
+        """쿼리 인덱스의 행 위치 하나에 맞는 고객 번호 목록"""
+        by_key = {key: self._text_matches(key, index.text_value(key, pos)) for key in self.tokens}
+        candidates = set(self.unrestricted)
+        for key in self.tokens:
+            candidates.update(by_key[key])
+
+        result = []
+        floor = index.floor_value(pos)
+        for i in sorted(candidates):
+            query = self.criteria[i].query
+            if any(i not in by_key[key] for key in self.text_keys[i]):
+                continue
+            if query.floor is not None and not query.floor.contains(floor):
+                continue
+            if any(not rng.contains(index.numeric_value(key, pos)) for key, rng in query.numeric.items()):
+                continue
+            result.append(i)
+        return result
+
+
+# 고객 조건 역색인 (고객 파일 mtime 이 바뀌면 다시 생성)
+_criteria_index: Optional[CustomerCriteriaIndex] = None
+_criteria_index_key = None
+_criteria_index_lock = threading.Lock()
+
+
+def _load_customers(path: str) -> List[dict]:
+    df = pd.read_excel(path).fillna("")
+    return df.to_dict(orient="records")
+
+
+def get_customer_criteria_index() -> Optional[CustomerCriteriaIndex]:
+    global _criteria_index, _criteria_index_key
+    path = _admin_file()
+    if not os.path.exists(path):
+        return None
+    key = (path, os.path.getmtime(path))
+    with _criteria_index_lock:
+        if _criteria_index is None or _criteria_index_key != key:
+            _criteria_index = CustomerCriteriaIndex(_load_customers(path))
+            _criteria_index_key = key
+        return _criteria_index
+
+
+# 로그 파일 (mtime, 크기)가 같으면 다시 읽지 않음
+_event_loader = KeyedLoader()
+
+
+def _read_events() -> List[dict]:
+    if not os.path.exists(MATCH_EVENT_LOG):
+        return []
+    events = []
+    with open(MATCH_EVENT_LOG, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    continue
+    return events
+
+
+def _load_events() -> List[dict]:
+    try:
+        st = os.stat(MATCH_EVENT_LOG)
+    except OSError:
+        return []
+    return _event_loader.get((st.st_mtime_ns, st.st_size), _read_events)
+
+
+def append_match_events(events: List[dict]) -> None:
+    """
+    매칭 이벤트를 로그에 추가하고 seq 를 붙인다 (보관 기간/개수를 넘은 오래된 이벤트는 정리)
+    seq 는 로그의 마지막 seq 와 ms 타임스탬프 중 큰 값에서 이어지므로
+    재시작하거나 다른 워커가 기록해도 줄어들지 않는다. (파일 락으로 프로세스 간 직렬화)
+    """
+    if not events:
+        return
+    os.makedirs(os.path.dirname(MATCH_EVENT_LOG), exist_ok=True)
+    with snapshot_build_lock(MATCH_EVENT_LOG):
+        existing = _read_events()
+        seq = max(existing[-1].get("seq", 0) if existing else 0, int(time.time() * 1000))
+        for event in events:
+            seq += 1
+            event["seq"] = seq
+        lines = "".join(json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n" for e in events)
+
+        cutoff = time.time() - MATCH_EVENT_RETENTION_DAYS * 86400
+        kept = [e for e in existing if e.get("at", 0) >= cutoff]
+        kept = kept[max(0, len(kept) + len(events) - MAX_MATCH_EVENTS):]
+        if len(kept) == len(existing):
+            with open(MATCH_EVENT_LOG, "a", encoding="utf-8") as f:
+                f.write(lines)
+        else:
+            tmp = MATCH_EVENT_LOG + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for e in kept:
+                    f.write(json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n")
+                f.write(lines)
+            os.replace(tmp, MATCH_EVENT_LOG)
+
+
+def record_listing_matches(snapshot, delta) -> int:
+    """
+    새 스냅샷 설치 후 호출: 추가/변경된 매물만 고객 조건과 대조해 매칭 이벤트 기록
+    비용은 변경된 행 수에 비례 (고객 × 전체 매물을 다시 보지 않음). 기록한 이벤트 수 반환
+    여러 워커가 같은 이벤트를 중복 기록하지 않도록 스냅샷을 직접 만든(빌드 락을 잡고 파싱한) 프로세스만 호출한다.
+    """
+    if delta is None or snapshot.sheet_type not in REVERSE_MATCH_SHEETS:
+        return 0
+    targets = [(lid, "added") for lid in delta.added] + [(lid, "changed") for lid in delta.changed]
+    if not targets:
+        return 0
+    criteria_index = get_customer_criteria_index()
+    if criteria_index is None or not len(criteria_index):
+        return 0
+
+    index = get_query_index(snapshot)
+    now = time.time()
+    events = []
+    for lid, change in targets:
+        pos = snapshot.items.position(lid)
+        if pos is None:
+            continue
+        for i in criteria_index.match_position(index, pos):
+            customer = criteria_index.customers[i]
+            events.append({
+                "at": now,
+                "version": snapshot.version,
+                "sheet_type": snapshot.sheet_type,
+                "listing_id": lid,
+                "change": change,
+                "customer_id": str(customer.get("id", "")),
+                "customer_name": str(customer.get("name", "")),
+                "manager": str(customer.get("manager", "")),
+            })
+
+    append_match_events(events)
+    return len(events)
+
+
+def match_events(since: int = 0, manager_name: Optional[str] = None) -> List[dict]:
+    """seq 가 since 보다 큰 매칭 이벤트 (manager_name 이 주어지면 그 담당자 고객만)"""
+    names = set(split_manager_names(manager_name)) if manager_name is not None else None
+    events = [e for e in _load_events() if e.get("seq", 0) > since]
+    if names is not None:
+        events = [e for e in events if names & set(split_manager_names(e["manager"]))]
+    return events
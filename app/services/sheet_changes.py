@@ -0,0 +1,226 @@
+# app/services/sheet_changes.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .listing_normalize import extract_columns, address_column, listing_id_column
+from .listing_sheets import SheetSchema, SHEET_SCHEMAS
+from .sheet_fetcher import read_sheet_rows
+
+# 다운로드 간 시트 변경 기록 (JSON Lines, 한 줄에 다운로드 한 번)
+SHEET_CHANGE_LOG = "./data/cache/sheet_changes.jsonl"
+# 시트별 직전 다운로드의 매물 ID → 행 지문
+_SHEET_STATE_FILE = "./data/cache/sheet_state_{sheet_type}.json"
+# 지문 계산 방식이 바뀌면 올림 (이전 방식의 상태는 이어 쓰지 않고 baseline 부터 다시)
+_SHEET_STATE_FORMAT = 2
+
+# 보관 기간/개수 (둘 중 먼저 닿는 기준으로 오래된 기록 삭제)
+CHANGE_LOG_RETENTION_DAYS = 14
+CHANGE_LOG_MAX_ENTRIES = 1000
+
+_log_lock = threading.Lock()
+_last_seq = 0
+
+
+def schema_for_file(file_name: str) -> Optional[SheetSchema]:
+    """다운로드 파일명 → 시트 스키마 (매물 시트가 아니면 None)"""
+    for schema in SHEET_SCHEMAS.values():
+        if schema.filename == file_name or f"{schema.title}.xlsx" == file_name:
+            return schema
+    return None
+
+
+def sheet_fingerprints(path: str, schema: SheetSchema) -> Dict[str, str]:
+    """
+    시트 파일의 매물 ID → 행 지문 (헤더 행 + 행의 모든 셀 기준)
+    매물 ID 는 스냅샷과 같은 내용 기반 ID 라서 변경 기록을 매물 단위로 바로 쓸 수 있다.
+    헤더만 바뀌어도(컬럼 이름/순서) 셀의 의미가 달라지므로 모든 행이 수정으로 잡힌다.
+    """
+    from .listings_loader import normalize_headers
+    rows = read_sheet_rows(path)
+    if not rows:
+        return {}
+    hdr = normalize_headers(rows[0], schema.expected_headers)
+    columns = extract_columns(rows, hdr)
+    addresses = address_column(columns, schema, len(rows) - 1)
+    ids = listing_id_column(columns, addresses, schema)
+    header = "\x1f".join(rows[0]) + "\x1e"
+    fingerprints = {}
+    for lid, row in zip(ids, rows[1:]):
+        if lid:
+            raw = (header + "\x1f".join(row)).encode("utf-8")
+            fingerprints[lid] = hashlib.blake2b(raw, digest_size=8).hexdigest()
+    return fingerprints
+
+
+def diff_fingerprints(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, List[str]]:
+    return {
+        "added": [lid for lid in new if lid not in old],
+        "removed": [lid for lid in old if lid not in new],
+        "modified": [lid for lid, fp in new.items() if lid in old and old[lid] != fp],
+    }
+
+
+def _state_path(sheet_type: str) -> str:
+    return _SHEET_STATE_FILE.format(sheet_type=sheet_type)
+
+
+def load_sheet_state(schema: SheetSchema) -> Optional[Dict[str, str]]:
+    """직전 지문 (ID 기준 컬럼이나 지문 방식이 바뀌었으면 이어지지 않으므로 None)"""
+    path = _state_path(schema.sheet_type)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except Exception:
+        return None
+    if state.get("format") != _SHEET_STATE_FORMAT or state.get("id_key_columns") != list(schema.id_key_columns):
+        return None
+    return state.get("fingerprints")
+
+
+def _save_sheet_state(schema: SheetSchema, fingerprints: Dict[str, str]) -> None:
+    path = _state_path(schema.sheet_type)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"format": _SHEET_STATE_FORMAT, "id_key_columns": list(schema.id_key_columns),
+                   "fingerprints": fingerprints},
+                  f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def reset_sheet_state(schema: SheetSchema) -> None:
+    """직전 지문 삭제: 비교에 실패한 채로 파일을 교체했을 때 다음 다운로드를 baseline 으로 시작"""
+    try:
+        os.remove(_state_path(schema.sheet_type))
+    except FileNotFoundError:
+        pass
+
+
+def detect_sheet_change(path: str, schema: SheetSchema) -> Tuple[Optional[dict], Dict[str, str]]:
+    """
+    새로 받은 시트 파일을 직전 다운로드와 비교: (변경 기록, 새 지문)
+    변경이 없으면 기록은 None. 직전 상태가 없으면 baseline 기록 (ID 목록 없이 행 수만)
+    """
+    new = sheet_fingerprints(path, schema)
+    old = load_sheet_state(schema)
+    if old is None:
+        return {"sheet_type": schema.sheet_type, "baseline": True, "rows": len(new)}, new
+    diff = diff_fingerprints(old, new)
+    if not any(diff.values()):
+        return None, new
+    return {"sheet_type": schema.sheet_type, "rows": len(new), **diff}, new
+
+
+def commit_sheet_change(schema: SheetSchema, change: Optional[dict], fingerprints: Dict[str, str],
+                        source_mtime: Optional[float] = None) -> Optional[dict]:
+    """
+    파일 교체가 끝난 뒤 호출: 지문 상태 저장 + 변경 기록 추가 (seq 가 붙은 기록 반환)
+    source_mtime: 교체된 시트 파일의 mtime (스냅샷 원본 버전과 변경 기록을 잇는 데 사용)
+    """
+    _save_sheet_state(schema, fingerprints)
+    if change is None:
+        return None
+    if source_mtime is not None:
+        change = {**change, "mtime": source_mtime}
+    return append_sheet_change(change)
+
+
+def _next_seq() -> int:
+    # ms 타임스탬프 기반, 같은 ms 안에서도 증가
+    global _last_seq
+    _last_seq = max(_last_seq + 1, int(time.time() * 1000))
+    return _last_seq
+
+
+def _read_log() -> List[dict]:
+    if not os.path.exists(SHEET_CHANGE_LOG):
+        return []
+    entries = []
+    with open(SHEET_CHANGE_LOG, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+    return entries
+
+
+def append_sheet_change(change: dict) -> dict:
+    """변경 기록 한 줄 추가 (보관 기간/개수를 넘은 오래된 기록은 정리)"""
+    with _log_lock:
+        entries = _read_log()
+        global _last_seq
+        if entries:
+            _last_seq = max(_last_seq, entries[-1].get("seq", 0))
+        entry = {"seq": _next_seq(), "at": time.time(), **change}
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+        cutoff = time.time() - CHANGE_LOG_RETENTION_DAYS * 86400
+        kept = [e for e in entries if e.get("at", 0) >= cutoff][-(CHANGE_LOG_MAX_ENTRIES - 1):]
+        os.makedirs(os.path.dirname(SHEET_CHANGE_LOG), exist_ok=True)
+        if len(kept) == len(entries):
+            with open(SHEET_CHANGE_LOG, "a", encoding="utf-8") as f:
+                f.write(line)
+        else:
+            tmp = SHEET_CHANGE_LOG + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for e in kept:
+                    f.write(json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n")
+                f.write(line)
+            os.replace(tmp, SHEET_CHANGE_LOG)
+        return entry
+
+
+def read_sheet_changes(since: int = 0, sheet_type: Optional[str] = None) -> List[dict]:
+    """
+    seq 가 since 보다 큰 변경 기록 (오래된 순)
+    baseline 기록이 끼어 있으면 그 이전 상태와는 이어지지 않으므로 전체를 다시 봐야 한다.
+    """
+    with _log_lock:
+        entries = _read_log()
+    return [e for e in entries if e.get("seq", 0) > since and (sheet_type is None or e.get("sheet_type") == sheet_type)]
+
+
+def changes_between(sheet_type: str, from_mtime: float, to_mtime: float) -> Optional[Dict[str, object]]:
+    """
+    시트 파일 버전(mtime) 두 개 사이의 매물 변경을 변경 기록만으로 구성: {added, removed, modified, rows}
+    from 버전을 만든 기록부터 to 버전을 만든 기록까지 끊김 없이(baseline 없이) 남아 있어야 하며, 아니면 None
+    (스냅샷 변경 내역이 두 스냅샷의 전체 지문을 다시 계산하지 않도록)
+    """
+    if from_mtime == to_mtime:
+        return None
+    entries = read_sheet_changes(0, sheet_type)
+    start = next((i for i in range(len(entries) - 1, -1, -1) if entries[i].get("mtime") == from_mtime), None)
+    end = next((i for i in range(len(entries) - 1, -1, -1) if entries[i].get("mtime") == to_mtime), None)
+    if start is None or end is None or end <= start:
+        return None
+
+    state: Dict[str, str] = {}
+    for entry in entries[start + 1:end + 1]:
+        if entry.get("baseline"):
+            return None
+        for lid in entry["added"]:
+            # 기준 버전에 있던 매물이 삭제 후 다시 생긴 경우는 수정으로 취급
+            state[lid] = "modified" if state.get(lid) == "removed" else "added"
+        for lid in entry["removed"]:
+            if state.get(lid) == "added":
+                del state[lid]
+            else:
+                state[lid] = "removed"
+        for lid in entry["modified"]:
+            if state.get(lid) != "added":
+                state[lid] = "modified"
+
+    result: Dict[str, object] = {"added": [], "removed": [], "modified": [], "rows": entries[end]["rows"]}
+    for lid, op in state.items():
+        result[op].append(lid)
+    return result
@@ -10,6 +10,8 @@ from googleapiclient.http import MediaIoBaseDownload
 import io
 import pandas as pd
 
+from .sheet_changes import schema_for_file, detect_sheet_change, commit_sheet_change, reset_sheet_state
+
 class SheetDownloadService:
     """Google Sheets를 Excel로 다운로드하는 서비스"""
     
@@ -105,10 +107,40 @@ class SheetDownloadService:
             # DataFrame으로 변환
             df = pd.DataFrame(values[1:], columns=values[0])
             
-            # Excel 파일로 저장 (덮어쓰기)
+            # 임시 파일로 저장 후 직전 다운로드와 비교
             file_path = os.path.join(self.download_dir, file_name)
-            df.to_excel(file_path, index=False)
-            
+            schema = schema_for_file(file_name)
+            if schema is None:
+                df.to_excel(file_path, index=False)
+                logging.info(f"시트 다운로드 성공: {sheet_name} → {file_path}")
+                return True
+
+            tmp_path = file_path + ".tmp.xlsx"
+            try:
+                df.to_excel(tmp_path, index=False)
+                try:
+                    change, fingerprints = detect_sheet_change(tmp_path, schema)
+                except Exception as e:
+                    # 비교 실패가 다운로드를 막지 않도록: 파일은 교체하고 변경 기록은 새 기준부터
+                    logging.warning(f"시트 변경 비교 실패, 새 기준으로 시작: {sheet_name}: {str(e)}")
+                    change, fingerprints = None, None
+
+                if fingerprints is not None and change is None and os.path.exists(file_path):
+                    # 변경 없음: 기존 파일 유지 (mtime 이 그대로라 스냅샷도 다시 만들지 않음)
+                    logging.info(f"시트 변경 없음: {sheet_name}")
+                    return True
+
+                os.replace(tmp_path, file_path)
+                if fingerprints is None:
+                    reset_sheet_state(schema)
+                else:
+                    entry = commit_sheet_change(schema, change, fingerprints, os.path.getmtime(file_path))
+                    if entry and not entry.get("baseline"):
+                        logging.info(f"시트 변경: {sheet_name} 추가 {len(entry['added'])} / "
+                                     f"삭제 {len(entry['removed'])} / 수정 {len(entry['modified'])}")
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
             logging.info(f"시트 다운로드 성공: {sheet_name} → {file_path}")
             return True
             
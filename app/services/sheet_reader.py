@@ -0,0 +1,283 @@
+# app/services/sheet_reader.py
+
+import datetime
+import os
+import posixpath
+import zipfile
+from xml.etree import ElementTree
+from typing import Iterator, List, Optional, Tuple
+
+# 파일 시그니처 (앞부분 바이트)
+_ZIP_SIGNATURE = b"PK\x03\x04"                      # xlsx / ods (zip 컨테이너)
+_OLE2_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"  # xls
+_ODS_MIMETYPE = b"application/vnd.oasis.opendocument.spreadsheet"
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+# pandas read_excel 기본 결측값 문자열 (이전 pandas 기반 로더와 같은 결과를 내기 위해 동일하게 처리)
+_NA_STRINGS = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+    # 수식 오류 셀 (pandas 는 값 없음으로 처리)
+    "#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!",
+})
+
+
+def detect_sheet_format(path: str) -> str:
+    """파일 앞부분 바이트로 형식 판별: 'xlsx' | 'xls' | 'ods' (알 수 없으면 ValueError)"""
+    with open(path, "rb") as f:
+        head = f.read(128)
+    if head.startswith(_OLE2_SIGNATURE):
+        return "xls"
+    if head.startswith(_ZIP_SIGNATURE):
+        # ods 는 zip 첫 항목이 압축되지 않은 mimetype 파일
+        return "ods" if _ODS_MIMETYPE in head else "xlsx"
+    raise ValueError(f"지원하지 않는 시트 파일 형식입니다: {os.path.basename(path)}")
+
+
+def _cell_text(value) -> str:
+    """셀 값 → 문자열 (pandas dtype=str + fillna('') 와 같은 규칙)"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, float):
+        if value != value:
+            return ""
+        if value.is_integer():
+            return str(int(value))
+        return str(value)
+    if isinstance(value, (int, datetime.datetime, datetime.date, datetime.time)):
+        return str(value)
+    text = str(value)
+    return "" if text in _NA_STRINGS else text
+
+
+def _xlsx_first_sheet(zf: zipfile.ZipFile) -> Tuple[str, bool]:
+    """(첫 번째 시트 XML 경로, 1904 날짜 체계 여부)"""
+    with zf.open("xl/workbook.xml") as f:
+        root = ElementTree.parse(f).getroot()
+    pr = root.find(f"{_NS}workbookPr")
+    date1904 = pr is not None and pr.get("date1904") in ("1", "true")
+    sheet = root.find(f"{_NS}sheets/{_NS}sheet")
+    rel_id = sheet.get(f"{_REL_NS}id")
+
+    with zf.open("xl/_rels/workbook.xml.rels") as f:
+        rels = ElementTree.parse(f).getroot()
+    for rel in rels:
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target")
+            path = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+            return path, date1904
+    raise ValueError(f"첫 번째 시트를 찾을 수 없습니다: {rel_id}")
+
+
+def _xlsx_shared_strings(zf: zipfile.ZipFile) -> List[str]:
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return []
+    strings: List[str] = []
+    with zf.open("xl/sharedStrings.xml") as f:
+        for _, el in ElementTree.iterparse(f):
+            if el.tag == f"{_NS}si":
+                strings.append(_inline_text(el))
+                el.clear()
+    return strings
+
+
+def _inline_text(el) -> str:
+    """<si>/<is> 텍스트 (서식 있는 텍스트는 조각을 이어 붙이고 윗주(rPh)는 제외)"""
+    t = el.find(f"{_NS}t")
+    if t is not None:
+        return t.text or ""
+    return "".join(r.text or "" for r in el.iterfind(f"{_NS}r/{_NS}t"))
+
+
+def _xlsx_date_styles(zf: zipfile.ZipFile) -> Tuple[set, set]:
+    """날짜/기간 서식이 적용된 셀 스타일 번호 (openpyxl 과 같은 판별 기준)"""
+    from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+    if "xl/styles.xml" not in zf.namelist():
+        return set(), set()
+    with zf.open("xl/styles.xml") as f:
+        root = ElementTree.parse(f).getroot()
+    custom = {int(n.get("numFmtId")): n.get("formatCode")
+              for n in root.iterfind(f"{_NS}numFmts/{_NS}numFmt")}
+    dates, timedeltas = set(), set()
+    for idx, xf in enumerate(root.iterfind(f"{_NS}cellXfs/{_NS}xf")):
+        fmt_id = int(xf.get("numFmtId", 0))
+        code = custom.get(fmt_id) or BUILTIN_FORMATS.get(fmt_id)
+        if code and is_date_format(code):
+            dates.add(idx)
+            if is_timedelta_format(code):
+                timedeltas.add(idx)
+    return dates, timedeltas
+
+
+def _column_index(ref: str) -> int:
+    """'AB12' → 27 (0부터)"""
+    idx = 0
+    for ch in ref:
+        if ch.isdigit():
+            break
+        idx = idx * 26 + ord(ch) - 64
+    return idx - 1
+
+
+def _iter_xlsx(path: str) -> Iterator[list]:
+    """
+    xlsx 시트 XML 을 직접 스트리밍 파싱 (openpyxl 읽기 전용 모드와 같은 셀 값, 약 3배 빠름)
+    행 번호가 건너뛴 부분은 빈 행으로 채운다.
+    """
+    from openpyxl.utils.datetime import from_excel, CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+
+    row_tag, cell_tag, value_tag, inline_tag = f"{_NS}row", f"{_NS}c", f"{_NS}v", f"{_NS}is"
+    with zipfile.ZipFile(path) as zf:
+        sheet_path, date1904 = _xlsx_first_sheet(zf)
+        strings = _xlsx_shared_strings(zf)
+        date_styles, timedelta_styles = _xlsx_date_styles(zf)
+        epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+
+        expected_row = 1
+        with zf.open(sheet_path) as f:
+            for _, el in ElementTree.iterparse(f):
+                if el.tag != row_tag:
+                    continue
+                number = int(el.get("r") or expected_row)
+                for _ in range(expected_row, number):
+                    yield []
+                expected_row = number + 1
+
+                row: list = []
+                for c in el.iter(cell_tag):
+                    ref = c.get("r")
+                    if ref:
+                        col = _column_index(ref)
+                        if col > len(row):
+                            row.extend([None] * (col - len(row)))
+                    kind = c.get("t", "n")
+                    value = None
+                    if kind == "inlineStr":
+                        child = c.find(inline_tag)
+                        if child is not None:
+                            value = _inline_text(child)
+                    else:
+                        text = c.findtext(value_tag) or None
+                        if text is not None:
+                            if kind == "n":
+                                value = float(text) if ("." in text or "E" in text or "e" in text) else int(text)
+                                style = int(c.get("s") or 0)
+                                if style in date_styles:
+                                    try:
+                                        value = from_excel(value, epoch, timedelta=style in timedelta_styles)
+                                    except (OverflowError, ValueError):
+                                        value = None
+                            elif kind == "s":
+                                value = strings[int(text)]
+                            elif kind == "b":
+                                value = bool(int(text))
+                            elif kind == "d":
+                                from openpyxl.utils.datetime import from_ISO8601
+                                value = from_ISO8601(text)
+                            else:
+                                value = text
+                    row.append(value)
+                el.clear()
+                yield row
+
+
+def _iter_xls(path: str) -> Iterator[list]:
+    import xlrd
+    book = xlrd.open_workbook(path, on_demand=True)
+    try:
+        sheet = book.sheet_by_index(0)
+        for r in range(sheet.nrows):
+            row = []
+            for cell in sheet.row(r):
+                if cell.ctype == xlrd.XL_CELL_DATE:
+                    row.append(xlrd.xldate.xldate_as_datetime(cell.value, book.datemode))
+                elif cell.ctype == xlrd.XL_CELL_BOOLEAN:
+                    row.append(bool(cell.value))
+                elif cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK, xlrd.XL_CELL_ERROR):
+                    row.append(None)
+                else:
+                    row.append(cell.value)
+            yield row
+    finally:
+        book.release_resources()
+
+
+def _iter_ods(path: str) -> Iterator[list]:
+    # ods 는 스트리밍 리더가 없어 pandas(odf)로 읽는다 (드문 경우)
+    import pandas as pd
+    df = pd.read_excel(path, header=None, dtype=object, engine="odf")
+    for row in df.itertuples(index=False, name=None):
+        yield [None if v != v else v for v in row]
+
+
+_READERS = {"xlsx": _iter_xlsx, "xls": _iter_xls, "ods": _iter_ods}
+
+
+def _iter_rows(path: str, sheet_format: Optional[str] = None) -> Iterator[Tuple[List[str], int]]:
+    """
+    (문자열 행, 원본 셀 값이 있는 마지막 열까지의 너비)
+    오류 셀/결측 문자열은 값이 없어져도 행과 열은 남는다 (pandas 와 같음)
+    """
+    reader = _READERS[sheet_format or detect_sheet_format(path)]
+    for raw in reader(path):
+        row = [_cell_text(v) for v in raw]
+        while row and row[-1] == "":
+            row.pop()
+        width = len(raw)
+        while width and (raw[width - 1] is None or raw[width - 1] == ""):
+            width -= 1
+        yield row, width
+
+
+def iter_sheet_rows(path: str, sheet_format: Optional[str] = None) -> Iterator[List[str]]:
+    """
+    첫 번째 시트의 행을 문자열 리스트로 하나씩 반환 (끝의 빈 셀 제거, 빈 행은 [])
+    DataFrame 을 만들지 않고 셀 값을 바로 문자열로 바꾼다.
+    """
+    for row, _ in _iter_rows(path, sheet_format):
+        yield row
+
+
+def _header_names(header: List[str], width: int) -> List[str]:
+    """pandas 와 같은 컬럼 이름: 빈 이름은 'Unnamed: n', 중복은 '이름.1'"""
+    names: List[str] = []
+    seen = {}
+    for i in range(width):
+        name = header[i] if i < len(header) and header[i] != "" else f"Unnamed: {i}"
+        if name in seen:
+            count = seen[name]
+            while f"{name}.{count}" in seen:
+                count += 1
+            seen[name] = count + 1
+            name = f"{name}.{count}"
+        seen[name] = seen.get(name, 1)
+        names.append(name)
+    return names
+
+
+def read_sheet_table(path: str) -> List[List[str]]:
+    """
+    시트를 [헤더] + 데이터 행 2차원 배열로 읽는다.
+    모든 행은 같은 길이로 맞춰지며 값은 문자열(빈 셀은 "")이다.
+    중간의 빈 행은 행 번호(raw_row_index)가 유지되도록 그대로 두고 앞뒤 빈 행만 제거한다.
+    (pandas read_excel(dtype=str).fillna("") 결과와 같음)
+    """
+    rows: List[List[str]] = []
+    last_used = -1
+    width = 0
+    for row, used_width in _iter_rows(path):
+        if used_width:
+            last_used = len(rows)
+            width = max(width, used_width)
+        if rows or used_width:
+            rows.append(row)
+    del rows[last_used + 1:]
+    if not rows:
+        return []
+    header = _header_names(rows[0], width)
+    data = [r + [""] * (width - len(r)) for r in rows[1:]]
+    return [header] + data
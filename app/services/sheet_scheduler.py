@@ -5,6 +5,7 @@ import threading
 import logging
 from typing import Optional
 from .sheet_download_service import SheetDownloadService
+from .snapshot_warmup import request_snapshot_warmup
 
 class SheetScheduler:
     """Google Sheets를 주기적으로 다운로드하는 스케줄러"""
@@ -84,6 +85,10 @@ class SheetScheduler:
                 failed_sheets = [name for name, success in results.items() if not success]
                 self.logger.warning(f"⚠️ 일부 시트 다운로드 실패: {failed_sheets}")
             
+            # 새 파일로 매물 스냅샷을 미리 준비 (요청은 준비될 때까지 기존 스냅샷 사용)
+            if success_count:
+                request_snapshot_warmup("sheet sync")
+            
         except Exception as e:
             self.logger.error(f"시트 다운로드 실행 실패: {str(e)}")
     
@@ -0,0 +1,89 @@
+# app/services/snapshot_warmup.py
+
+import threading
+import time
+from typing import Dict, Optional, Set
+
+# 백그라운드 스냅샷 준비 (앱 시작 시, 시트 동기화 후, 원본 변경 감지 시)
+# 새 스냅샷이 준비될 때까지 요청은 기존 스냅샷을 그대로 받는다.
+_app = None
+_warmup_lock = threading.Lock()
+_warmup_running = False
+_warmup_pending = False
+# 다음 실행에서 캐시를 무시하고 다시 만들 시트 (강제 새로고침)
+_force_sheets: Set[str] = set()
+# 시트별 마지막으로 시도한 원본 상태 (같은 상태의 파싱 실패를 요청마다 반복하지 않도록)
+_attempted: Dict[str, tuple] = {}
+
+
+def init_snapshot_warmup(app) -> None:
+    """앱 객체 등록 후 바로 전체 시트 스냅샷 준비 시작"""
+    global _app
+    _app = app
+    request_snapshot_warmup("startup")
+
+
+def should_warm(sheet_type: str, state: tuple) -> bool:
+    return _attempted.get(sheet_type) != state
+
+
+def request_snapshot_warmup(reason: str = "", force_sheet: Optional[str] = None) -> bool:
+    """
+    백그라운드 재구성 요청 (이미 실행 중이면 끝난 뒤 한 번 더 실행)
+    force_sheet 가 주어지면 그 시트는 캐시를 무시하고 원본에서 다시 만든다.
+    앱이 등록되지 않았으면 False
+    """
+    global _warmup_running, _warmup_pending
+    if _app is None:
+        return False
+    with _warmup_lock:
+        if force_sheet:
+            _force_sheets.add(force_sheet)
+        if _warmup_running:
+            _warmup_pending = True
+            return True
+        _warmup_running = True
+        _warmup_pending = False
+    threading.Thread(target=_run_warmup, args=(reason,), daemon=True, name="snapshot-warmup").start()
+    return True
+
+
+def _run_warmup(reason: str) -> None:
+    global _warmup_running, _warmup_pending
+    from .listings_loader import get_listing_snapshots, _source_state
+    from .listing_sheets import SHEET_SCHEMAS
+    from .reload_admission import finish_forced_reload
+
+    while True:
+        with _app.app_context():
+            started = time.time()
+            with _warmup_lock:
+                forced = sorted(_force_sheets)
+                _force_sheets.clear()
+            try:
+                if forced:
+                    rebuilt = {}
+                    try:
+                        rebuilt = get_listing_snapshots(forced, force_reload=True)
+                    finally:
+                        # 이번에 새로 만든 스냅샷만 성공 (파싱에 실패한 시트는 이전 스냅샷이 남아 있음)
+                        for t in forced:
+                            snap = rebuilt.get(t)
+                            finish_forced_reload(t, snap.source_key if snap is not None and snap.built_at >= started else None)
+                for t in SHEET_SCHEMAS:
+                    _attempted[t] = _source_state(t)
+                snapshots = get_listing_snapshots()
+                _app.logger.info(
+                    f"🔥 매물 스냅샷 준비 완료 ({reason or 'refresh'}): "
+                    + ", ".join(f"{t}={s.version}" for t, s in snapshots.items())
+                    + f" ({time.time() - started:.2f}s)"
+                )
+            except Exception as e:
+                _app.logger.error(f"❌ 매물 스냅샷 백그라운드 준비 실패 ({reason}): {e}")
+
+        with _warmup_lock:
+            if not _warmup_pending:
+                _warmup_running = False
+                return
+            _warmup_pending = False
+            reason = "pending"
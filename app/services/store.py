@@ -8,6 +8,7 @@ import threading
 import pandas as pd
 from flask import current_app
 import uuid
+from ..core.utils import build_manager_partition, manager_positions
 
 def clean_nan_values(obj):
     """JSON 직렬화 전에 NaN 값을 완전히 제거하는 함수"""
@@ -69,6 +70,10 @@ _briefing_seq = itertools.count(1)
 CUSTOMERS = {}   # id → 고객 dict
 BRIEFINGS = {}   # id → 브리핑 dict
 
+# 고객 파일별 담당자 → 행 위치 인덱스 (파일 mtime/행 수가 같으면 재사용)
+_customer_manager_index = {}
+_customer_manager_lock = threading.Lock()
+
 def _ensure_dir():
     os.makedirs(DATA_DIR, exist_ok=True)
 
@@ -300,6 +305,18 @@ def _repair_excel_file(file_path: str) -> bool:
         print(f"Excel 파일 복구 실패 ({file_path}): {e}")
         return False
 
+def _filter_customers_by_manager(df, target: str, manager_name: str):
+    """담당자명으로 고객 행 선택 ('남/정' 처럼 여러 명이 적힌 고객은 각 담당자에 포함)"""
+    values = df['manager']
+    key = (os.path.getmtime(target), len(df))
+    with _customer_manager_lock:
+        cached = _customer_manager_index.get(target)
+    if cached is None or cached[0] != key:
+        cached = (key, build_manager_partition(values.astype(str).tolist()))
+        with _customer_manager_lock:
+            _customer_manager_index[target] = cached
+    return df.iloc[manager_positions(cached[1], manager_name)]
+
 def list_customers(user_email: str, filter_type: str = 'own', manager: str = '') -> list:
     """
     GET /api/customers 호출 시 사용.
@@ -381,7 +398,7 @@ def list_customers(user_email: str, filter_type: str = 'own', manager: str = '')
                 # 일반 사용자는 본인 담당 고객만 조회
                 manager_name = getattr(user, 'manager_name', '')
                 if manager_name:
-                    df = df[df['manager'] == manager_name]
+                    df = _filter_customers_by_manager(df, target, manager_name)
                     print(f"User {user.email} filtered customers by manager_name: {manager_name} ({len(df)} items)")
                 else:
                     # 담당자명이 설정되지 않은 경우 빈 결과 반환
@@ -390,7 +407,7 @@ def list_customers(user_email: str, filter_type: str = 'own', manager: str = '')
             elif user.is_manager() or user.is_admin():
                 # 매니저와 어드민은 모든 고객 조회 가능
                 if filter_type == 'manager' and manager:
-                    df = df[df['manager'] == manager]
+                    df = _filter_customers_by_manager(df, target, manager)
                 # 다른 필터는 적용하지 않음 (모든 고객 조회)
                 user_role = getattr(user, 'role', 'unknown')
                 print(f"{user_role.title()} {user.email} accessing all customers ({len(df)} items)")
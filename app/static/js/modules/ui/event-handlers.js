@@ -117,9 +117,16 @@ function initRefreshButton() {
       const data = await response.json();
       console.log('✅ 새로고침 완료');
       
-      // 성공 메시지
+      // 성공 메시지 (재구성은 서버 백그라운드에서 진행, 응답은 현재 데이터)
       if (typeof showToast === 'function') {
-        showToast(`✅ ${data.total}개 매물 데이터가 새로고침되었습니다.`, 'success');
+        const status = data.rebuild && data.rebuild.status;
+        if (status === 'rate_limited') {
+          showToast(`⏳ 잠시 후 다시 시도해주세요. (${response.headers.get('Retry-After')}초)`, 'info');
+        } else if (status === 'started' || status === 'in_progress') {
+          showToast('🔄 서버에서 매물 데이터를 다시 불러오는 중입니다. 잠시 후 반영됩니다.', 'info');
+        } else {
+          showToast(`✅ ${data.total}개 매물 데이터가 새로고침되었습니다.`, 'success');
+        }
       }
       
       // 마지막 업데이트 시간 표시
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+매물 스냅샷 메모리 리포트: 매물 dict 목록 vs 압축 표현(app/services/listing_compact.py)
+
+합성 상가임대차 행(기본 5만 행)을 정규화한 뒤 두 표현의 메모리 사용량을
+객체 그래프 전체(sys.getsizeof, 공유 객체는 한 번만)로 재서 매물당 바이트 수를 비교한다.
+
+실행: python benchmarks/listing_memory_report.py [--rows 50000]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.listing_compact import CompactListings
+from app.services.listing_normalize import normalize_sheet
+from app.services.listing_sheets import LEASE
+from app.services.listings_loader import normalize_headers
+
+from sheet_reader_benchmark import synthetic_rows
+
+
+def deep_sizeof(obj, seen=None) -> int:
+    """객체와 참조하는 객체들의 크기 합 (같은 객체는 한 번만 셈)"""
+    seen = set() if seen is None else seen
+    stack = [obj]
+    total = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif hasattr(o, "__slots__"):
+            stack.extend(getattr(o, name) for name in o.__slots__ if hasattr(o, name))
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="매물 스냅샷 메모리 리포트")
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    rows = [["" if v is None else str(v) for v in row] for row in synthetic_rows(args.rows)]
+    hdr = normalize_headers(rows[0], LEASE.expected_headers)
+    items = normalize_sheet(rows, hdr)
+    for i, item in enumerate(items):
+        if i % 3:  # 2/3 정도 지오코딩된 상태
+            item["coords"] = {"lat": 37.5 + i * 1e-6, "lng": 126.7 + i * 1e-6}
+    compact = CompactListings.from_items(items, LEASE)
+    del rows
+    print(f"📝 합성 매물: {len(items):,}건")
+
+    before = deep_sizeof(items)
+    after = deep_sizeof(compact)
+    count = max(len(items), 1)
+    print(f"   dict 목록  {before / 1024 / 1024:8.1f}MB   매물당 {before / count:8.0f}B")
+    print(f"   압축 표현  {after / 1024 / 1024:8.1f}MB   매물당 {after / count:8.0f}B")
+    print(f"   절감: {(1 - after / before) * 100:.1f}%")
+    print()
+    print("   압축 표현 구성 (매물당 바이트)")
+    for name, size in compact.memory_usage().items():
+        print(f"     {name:<12} {size / count:8.1f}B")
+
+    same = list(compact) == items
+    print(f"   결과 일치: {'✅' if same else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
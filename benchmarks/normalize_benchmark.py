@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+매물 정규화 벤치마크: 이전 행 단위 방식 vs 컬럼 단위 방식(app/services/listing_normalize.py)
+
+합성 상가임대차 행(기본 5만 행, 시트 리더와 같은 문자열 행)을 정규화하는 시간을 비교하고
+두 결과가 같은지 확인한다.
+
+실행: python benchmarks/normalize_benchmark.py [--rows 50000] [--repeat 3]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+from dataclasses import asdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.ids import ListingIdAssigner
+from app.core.utils import to_int_or_none
+from app.models.listing_schema import Listing
+from app.services.listing_normalize import normalize_sheet
+from app.services.listing_sheets import LEASE
+from app.services.listings_loader import normalize_headers
+
+from sheet_reader_benchmark import synthetic_rows
+
+
+def normalize_rowwise(rows, hdr, schema=LEASE):
+    """이전 방식 재현: 행마다 fields dict, 셀마다 정규식, Listing 생성 후 asdict"""
+    def build_address(row):
+        try:
+            return " ".join(row[hdr[col]].strip() for col in schema.address_columns).strip()
+        except Exception:
+            return ""
+
+    assigner = ListingIdAssigner(schema.id_prefix)
+    ids = {}
+    for i, row in enumerate(rows[1:], start=1):
+        if build_address(row) == "":
+            continue
+        ids[i] = assigner.assign([row[hdr[c]] if c in hdr else "" for c in schema.id_key_columns])
+
+    items = []
+    for i, row in enumerate(rows[1:], start=1):
+        try:
+            status_raw = row[hdr[schema.status_column]].strip()
+        except Exception:
+            status_raw = ""
+        address_full = build_address(row)
+        if address_full == "":
+            continue
+        fields = {col: row[hdr[col]] for col in hdr.keys()}
+        numeric_cache = {key: to_int_or_none(fields.get(col)) for key, col in schema.numeric_columns.items()}
+        a, b = (numeric_cache.get(k) for k in schema.total_keys)
+        numeric_cache["total"] = a + b if a is not None and b is not None else None
+        items.append(asdict(Listing(
+            id=ids[i],
+            raw_row_index=i,
+            address_full=address_full,
+            address_comp={
+                "region2": fields.get("지역2", ""),
+                "region": fields.get("지역", ""),
+                "lot": fields.get("지번", ""),
+            },
+            fields=fields,
+            coords={"lat": None, "lng": None},
+            numeric_cache=numeric_cache,
+            status_raw=status_raw,
+        )))
+    return items
+
+
+IMPLEMENTATIONS = {
+    "row-wise": normalize_rowwise,
+    "columnar": normalize_sheet,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="매물 정규화 벤치마크")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # 시트 리더 출력과 같은 형태: 모든 값이 문자열인 2차원 배열
+    rows = [["" if v is None else str(v) for v in row] for row in synthetic_rows(args.rows)]
+    hdr = normalize_headers(rows[0], LEASE.expected_headers)
+    print(f"📝 합성 행 생성: {args.rows:,}행")
+
+    results = {}
+    timings = {}
+    for name, func in IMPLEMENTATIONS.items():
+        best = float("inf")
+        for _ in range(args.repeat):
+            gc.collect()
+            start = time.perf_counter()
+            results[name] = func(rows, hdr)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+        print(f"   {name:<10} {best:7.3f}s   ({len(results[name]):,}건)")
+
+    print(f"   속도 향상: {timings['row-wise'] / timings['columnar']:.1f}배")
+    print(f"   결과 일치: {'✅' if results['row-wise'] == results['columnar'] else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+워커 프로세스 간 매물 스냅샷 공유 벤치마크
+
+합성 상가임대차 시트(기본 5만 행)를 두고 워커 프로세스 N개가 동시에 get_listing_snapshot() 을 호출한다.
+- 몇 개의 워커가 실제로 파싱했는지 (빌드 락: 1이어야 함), 모든 워커의 스냅샷 버전이 같은지
+- 워커별 스냅샷 로드 전후 메모리 증가분: private(워커 전용) / shared(다른 프로세스와 공유 가능)
+  를 복사 모드(SHARED_SNAPSHOTS=False)와 공유 모드에서 비교한다. (/proc/self/smaps_rollup, Linux 전용)
+
+실행: python benchmarks/shared_snapshot_benchmark.py [--rows 50000] [--workers 4]
+"""
+
+import argparse
+import logging
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sheet_reader_benchmark import make_sheet
+
+
+def memory_kb() -> dict:
+    """현재 프로세스의 private / shared 메모리 (kB)"""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":"):
+                values[parts[0][:-1]] = int(parts[1])
+    return {
+        "private": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0),
+        "shared": values.get("Shared_Clean", 0) + values.get("Shared_Dirty", 0),
+    }
+
+
+def worker(data_dir: str, shared: bool, start, out) -> None:
+    logging.disable(logging.CRITICAL)
+    sys.stdout = open(os.devnull, "w")
+    from flask import Flask
+    from app.services import listings_loader
+
+    listings_loader.SHARED_SNAPSHOTS = shared
+    app = Flask("shared_snapshot_benchmark")
+    app.config["DATA_DIR"] = data_dir
+    app.config["MAP_CACHE_FILENAME"] = "지도캐시.xlsx"
+    app.logger.disabled = True
+
+    parsed = []
+    original = listings_loader._parse_sheets
+
+    def counting_parse(*args, **kwargs):
+        parsed.append(1)
+        return original(*args, **kwargs)
+
+    listings_loader._parse_sheets = counting_parse
+    start.wait()
+    before = memory_kb()
+    with app.app_context():
+        snapshot = listings_loader.get_listing_snapshot()
+        # 모든 매물 컬럼을 한 번씩 읽어 매핑된 페이지를 실제로 사용
+        for name in snapshot.items.field_names:
+            snapshot.items.field_column(name)
+        snapshot.items.coordinates()
+    after = memory_kb()
+    out.put({
+        "parsed": len(parsed),
+        "version": snapshot.version,
+        "private": after["private"] - before["private"],
+        "shared": after["shared"] - before["shared"],
+    })
+
+
+def run(data_dir: str, workers: int, shared: bool) -> list:
+    ctx = mp.get_context("spawn")
+    start = ctx.Event()
+    out = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(data_dir, shared, start, out)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    start.set()
+    results = [out.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 캐시 파일(./data/cache)도 임시 디렉터리에 생기도록 작업 디렉터리 이동
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        data_dir = os.path.join(tmp, "data")
+        os.makedirs(os.path.join(data_dir, "raw"))
+        os.environ["DATA_DIR"] = data_dir
+        from app.services.listing_sheets import LEASE
+        make_sheet(LEASE.path, args.rows)
+
+        print(f"rows={args.rows} workers={args.workers}")
+        print(f"{'mode':<7} {'parsed':>7} {'versions':>9} {'private MB/worker':>18} {'shared MB/worker':>17}")
+        for mode in ("copy", "shared"):
+            os.utime(LEASE.path, None)  # 모드마다 새 원본 버전 → 다시 빌드
+            results = run(data_dir, args.workers, shared=(mode == "shared"))
+            private = sum(r["private"] for r in results) / len(results) / 1024
+            shared = sum(r["shared"] for r in results) / len(results) / 1024
+            print(f"{mode:<7} {sum(r['parsed'] for r in results):>7} "
+                  f"{len({r['version'] for r in results}):>9} {private:>18.1f} {shared:>17.1f}")
+        os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
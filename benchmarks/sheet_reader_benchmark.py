@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+매물 시트 읽기 벤치마크: pandas read_excel vs 스트리밍 리더(app/services/sheet_reader.py)
+
+상가임대차 헤더 구조의 합성 시트(기본 1만/10만 행)를 만들어
+파싱 시간과 최대 메모리(tracemalloc)를 비교하고 두 결과가 같은지 확인한다.
+
+실행: python benchmarks/sheet_reader_benchmark.py [--rows 10000 100000] [--repeat 3]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from openpyxl import Workbook
+
+from app.services.listing_sheets import LEASE
+from app.services.sheet_reader import read_sheet_table
+
+REGIONS = ["중동", "상동", "심곡동", "부평동", "산곡동", "구월동", "삼산동", "계산동"]
+REGIONS2 = ["부천시", "부평구", "남동구", "계양구", "미추홀구"]
+STATUSES = ["생", "완", "보류", ""]
+MANAGERS = ["남", "정", "오", "남/정"]
+
+
+def synthetic_rows(rows: int, seed: int = 42):
+    """상가임대차와 같은 컬럼 구성의 합성 행 (헤더 포함, 숫자/문자/빈 셀 혼합)"""
+    rnd = random.Random(seed)
+    yield [""] + list(LEASE.expected_headers) + ["간략한위치"]
+    for i in range(rows):
+        values = {
+            "접수날짜": f"{rnd.randint(19, 25)}{rnd.randint(1, 12):02d}{rnd.randint(1, 28):02d}",
+            "지역": rnd.choice(REGIONS),
+            "지번": f"{rnd.randint(1, 1500)}-{rnd.randint(1, 40)}",
+            "건물명": rnd.choice(["", f"빌딩{i % 300}"]),
+            "층수": rnd.choice([1, 2, 3, "지하1", "B2", ""]),
+            "가게명": f"가게{i}",
+            "분양": rnd.choice(["", rnd.randint(10, 200)]),
+            "실평수": rnd.randint(5, 150),
+            "보증금": rnd.choice([rnd.randint(500, 20000), "협의", ""]),
+            "월세": rnd.randint(30, 1500),
+            "권리금": rnd.choice(["", "무권리", rnd.randint(0, 30000)]),
+            "비고": rnd.choice(["", "부가세별도 / 시설 인수", "주차 가능, 인근 거주"]),
+            "담당자": rnd.choice(MANAGERS),
+            "현황": rnd.choice(STATUSES),
+            "지역2": rnd.choice(REGIONS2),
+            "연락처": f"010-{rnd.randint(1000, 9999)}-{rnd.randint(1000, 9999)}",
+            "의뢰인": rnd.choice(["임대인", "임차인", ""]),
+            "비고3": "",
+            "위반여부": rnd.choice(["", "위반"]),
+            "현수막번호": rnd.choice(["", rnd.randint(1, 999)]),
+        }
+        yield [""] + [values[h] for h in LEASE.expected_headers] + [rnd.choice(["", "역 앞"])]
+
+
+def make_sheet(path: str, rows: int, seed: int = 42) -> None:
+    """합성 행으로 xlsx 시트 생성"""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    for row in synthetic_rows(rows, seed):
+        ws.append(row)
+    wb.save(path)
+
+
+def read_with_pandas(path: str):
+    """이전 방식: DataFrame 전체 생성 후 2차원 배열 변환"""
+    df = pd.read_excel(path, dtype=str, engine="openpyxl").fillna("")
+    return [df.columns.tolist()] + df.values.tolist()
+
+
+READERS = {
+    "pandas": read_with_pandas,
+    "streaming": read_sheet_table,
+}
+
+
+def measure(func, path: str, repeat: int):
+    """(최소 소요 시간 초, 최대 메모리 MB, 결과)"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func(path)
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / (1024 * 1024), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="매물 시트 읽기 벤치마크")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = os.path.join(tmp, f"listing_{rows}.xlsx")
+            print(f"📝 합성 시트 생성: {rows:,}행")
+            make_sheet(path, rows)
+            print(f"   파일 크기: {os.path.getsize(path) / 1024 / 1024:.1f}MB")
+
+            results = {}
+            for name, func in READERS.items():
+                elapsed, peak_mb, table = measure(func, path, args.repeat)
+                results[name] = table
+                print(f"   {name:<10} {elapsed:7.2f}s   최대 메모리 {peak_mb:8.1f}MB")
+
+            same = results["pandas"] == results["streaming"]
+            print(f"   결과 일치: {'✅' if same else '❌'}")
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+매물 스냅샷 동시 읽기 벤치마크: 재구성 중 N개 읽기 스레드의 요청 지연 시간 (p50/p99/max)
+
+합성 상가임대차 시트(기본 2만 행)로 스냅샷을 만든 뒤, 읽기 스레드들이
+get_listing_snapshot() + 첫 페이지 조회를 반복하는 동안 원본 파일을 갱신해 재구성을 일으킨다.
+
+- before: 요청 안에서 재구성 (모든 요청이 _snapshot_lock 에서 파싱이 끝나기를 기다림)
+- after:  백그라운드 재구성 + 스냅샷 교체 (요청은 기존 스냅샷을 락 없이 계속 사용)
+
+실행: python benchmarks/snapshot_concurrency_benchmark.py [--rows 20000] [--readers 16] [--think-ms 20] [--seconds 4]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from flask import Flask
+
+from app.services import listings_loader, snapshot_warmup
+from app.services.listing_query import ListingQuery, get_query_index
+from app.services.listing_sheets import LEASE
+
+from sheet_reader_benchmark import make_sheet
+
+
+def make_app(data_dir: str) -> Flask:
+    app = Flask("snapshot_benchmark")
+    app.config["DATA_DIR"] = data_dir
+    app.config["MAP_CACHE_FILENAME"] = "지도캐시.xlsx"
+    app.logger.disabled = True
+    return app
+
+
+def wait_fresh(app: Flask, timeout: float = 120.0) -> None:
+    """백그라운드 재구성이 끝나 현재 원본 버전의 스냅샷이 설치될 때까지 대기"""
+    deadline = time.time() + timeout
+    with app.app_context():
+        while time.time() < deadline:
+            snap = listings_loader._snapshots.get(LEASE.sheet_type)
+            if snap is not None and snap.source_key == listings_loader._source_signature(LEASE.sheet_type):
+                return
+            time.sleep(0.05)
+    raise TimeoutError("스냅샷 재구성 대기 시간 초과")
+
+
+def run(app: Flask, readers: int, seconds: float, think: float) -> dict:
+    """
+    읽기 스레드를 돌리는 중간에 원본을 갱신하고,
+    원본 갱신부터 새 스냅샷 설치까지(재구성 구간) 시작된 요청들의 지연 시간을 모은다
+    """
+    samples = [[] for _ in range(readers)]  # (시작 시각, 지연 시간)
+    stop = threading.Event()
+    query = ListingQuery(limit=50)
+
+    def reader(out):
+        with app.app_context():
+            while not stop.is_set():
+                t = time.perf_counter()
+                snap = listings_loader.get_listing_snapshot()
+                get_query_index(snap).page_positions(query)
+                out.append((t, time.perf_counter() - t))
+                time.sleep(think)  # 요청 사이 간격 (응답 전송 등)
+
+    threads = [threading.Thread(target=reader, args=(samples[i],)) for i in range(readers)]
+    for th in threads:
+        th.start()
+    time.sleep(seconds / 4)
+    rebuild_start = time.perf_counter()
+    os.utime(LEASE.path, None)  # 원본 갱신 → 다음 요청에서 재구성
+    wait_fresh(app)
+    rebuild_end = time.perf_counter()
+    time.sleep(seconds / 4)
+    stop.set()
+    for th in threads:
+        th.join()
+
+    window = np.array([lat for out in samples for start, lat in out
+                       if rebuild_start <= start <= rebuild_end]) * 1000
+    return {
+        "rebuild": rebuild_end - rebuild_start,
+        "requests": len(window),
+        "p50": float(np.percentile(window, 50)),
+        "p99": float(np.percentile(window, 99)),
+        "max": float(window.max()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--think-ms", type=float, default=20.0, help="읽기 스레드의 요청 간 간격")
+    parser.add_argument("--seconds", type=float, default=4.0, help="재구성 앞뒤로 읽기를 유지하는 시간 합")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as tmp:
+        # 캐시 파일(./data/cache)도 임시 디렉터리에 생기도록 작업 디렉터리 이동
+        os.chdir(tmp)
+        data_dir = os.path.join(tmp, "data")
+        os.makedirs(os.path.join(data_dir, "raw"))
+        os.environ["DATA_DIR"] = data_dir
+        make_sheet(LEASE.path, args.rows)
+        app = make_app(data_dir)
+
+        with app.app_context():
+            listings_loader.get_listing_snapshot()
+        print(f"rows={args.rows} readers={args.readers} (재구성 구간에 시작된 요청 기준)")
+        print(f"{'mode':<8} {'rebuild s':>9} {'requests':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+
+        for mode in ("before", "after"):
+            if mode == "after":
+                snapshot_warmup.init_snapshot_warmup(app)
+                wait_fresh(app)
+            result = run(app, args.readers, args.seconds, args.think_ms / 1000)
+            print(f"{mode:<8} {result['rebuild']:>9.2f} {result['requests']:>9} "
+                  f"{result['p50']:>9.2f} {result['p99']:>9.2f} {result['max']:>9.2f}")
+        os.chdir("/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+브리핑에 저장된 매물 ID를 행 위치 기반(lst_000123)에서 내용 기반 ID로 변환하는 스크립트
+
+현재 상가임대차.xlsx 의 행 순서를 기준으로 이전 ID → 새 ID 대응표를 만들고
+data/store.json, data/state/briefings.json 의 listing_ids / overrides / tags 를 갱신한다.
+실행 전 각 파일은 .bak 으로 백업된다.
+"""
+
+import os
+import re
+import json
+import shutil
+import pandas as pd
+
+from app.core.ids import listing_id_from_row
+from app.services.listings_loader import normalize_headers, assign_listing_ids
+
+LEGACY_ID = re.compile(r"^lst_\d{6}$")
+
+def build_id_mapping(sheet_path: str) -> dict:
+    """이전 행 위치 ID → 내용 기반 ID 대응표"""
+    df = pd.read_excel(sheet_path, dtype=str, engine='openpyxl').fillna("")
+    rows = [df.columns.tolist()] + df.values.tolist()
+    hdr = normalize_headers(rows[0])
+    ids = assign_listing_ids(rows, hdr)
+    return {listing_id_from_row(i): new_id for i, new_id in ids.items()}
+
+def _remap(listing_id: str, mapping: dict, missing: set) -> str:
+    if not LEGACY_ID.match(listing_id or ""):
+        return listing_id
+    if listing_id not in mapping:
+        missing.add(listing_id)
+        return listing_id
+    return mapping[listing_id]
+
+def _backup(path: str):
+    shutil.copy2(path, path + ".bak")
+    print(f"💾 백업 생성: {path}.bak")
+
+def migrate_store_file(path: str, mapping: dict, missing: set) -> int:
+    """store.json 의 BRIEFINGS (listing_ids, overrides/tags 키) 변환"""
+    if not os.path.exists(path):
+        print(f"파일이 존재하지 않음: {path}")
+        return 0
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    changed = 0
+    for b in data.get("briefings", {}).values():
+        before = json.dumps(b, ensure_ascii=False, sort_keys=True)
+        b["listing_ids"] = [_remap(lid, mapping, missing) for lid in b.get("listing_ids", [])]
+        b["overrides"] = {_remap(lid, mapping, missing): v for lid, v in b.get("overrides", {}).items()}
+        b["tags"] = {_remap(lid, mapping, missing): v for lid, v in b.get("tags", {}).items()}
+        if json.dumps(b, ensure_ascii=False, sort_keys=True) != before:
+            changed += 1
+
+    if changed:
+        _backup(path)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    return changed
+
+def migrate_briefing_state_file(path: str, mapping: dict, missing: set) -> int:
+    """data/state/briefings.json 의 items[].items[].listing_id 변환"""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        print(f"파일이 없거나 비어 있음: {path}")
+        return 0
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            print(f"⚠️ JSON 파싱 실패, 건너뜀: {path} ({e})")
+            return 0
+
+    changed = 0
+    for b in data.get("items", []):
+        for it in b.get("items", []):
+            new_id = _remap(it.get("listing_id"), mapping, missing)
+            if new_id != it.get("listing_id"):
+                it["listing_id"] = new_id
+                changed += 1
+
+    if changed:
+        _backup(path)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    return changed
+
+def main():
+    """메인 함수"""
+    print("🔄 매물 ID 마이그레이션 시작...")
+
+    data_dir = os.getenv("DATA_DIR", "./data")
+    sheet_path = os.path.join(data_dir, "raw", os.getenv("LISTING_SHEET_FILENAME", "상가임대차.xlsx"))
+    if not os.path.exists(sheet_path):
+        print(f"❌ 매물 시트가 없습니다: {sheet_path}")
+        return
+
+    mapping = build_id_mapping(sheet_path)
+    print(f"📊 대응표 생성 완료: {len(mapping)}개 매물")
+
+    missing: set = set()
+    n_store = migrate_store_file(os.path.join(data_dir, "store.json"), mapping, missing)
+    print(f"✅ store.json: 브리핑 {n_store}개 갱신")
+    n_state = migrate_briefing_state_file(os.path.join(data_dir, "state", "briefings.json"), mapping, missing)
+    print(f"✅ state/briefings.json: 매물 항목 {n_state}개 갱신")
+
+    if missing:
+        print(f"⚠️ 현재 시트에 없는 이전 ID {len(missing)}개는 그대로 유지: {sorted(missing)}")
+
+    print("\n✅ 매물 ID 마이그레이션 완료!")
+
+if __name__ == "__main__":
+    main()
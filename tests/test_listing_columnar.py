@@ -0,0 +1,70 @@
+import pytest
+
+from app.services.listing_columnar import load_columnar_snapshot, write_columnar_snapshot
+from app.services.listing_compact import CompactListings
+from app.services.listing_sheets import LEASE
+
+SOURCE_KEY = (1.0, 2.0)
+
+
+def _item(pos, deposit, coords=(37.5, 126.9)):
+    return {
+        "id": f"lst_{pos:04d}",
+        "raw_row_index": pos,
+        "address_full": "부천 중동 1172",
+        "fields": {"지역2": "부천", "지역": "중동", "지번": "1172", "현황": "생", "보증금": str(deposit)},
+        "coords": {"lat": coords[0], "lng": coords[1]},
+        "numeric_cache": {"deposit": deposit, "rent": 100, "premium": None, "area": 10,
+                          "total": None if deposit is None else deposit},
+        "status_raw": "생",
+    }
+
+
+ITEMS = [
+    _item(0, 1000),
+    _item(1, 10 ** 25),    # int64 범위를 벗어나는 값 (숫자만 이어붙인 입력)
+    _item(2, None, coords=(None, None)),
+    _item(3, -(2 ** 63)),  # NULL_INT 와 같은 값도 범위 밖으로 취급
+]
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_columnar_round_trip_keeps_overflow_values(tmp_path, shared):
+    path = str(tmp_path / "listing_snapshot.bin")
+    parsed = CompactListings.from_items(ITEMS, LEASE)
+    write_columnar_snapshot(parsed, SOURCE_KEY, path, version=7)
+
+    columnar = load_columnar_snapshot(SOURCE_KEY, path)
+    assert columnar.version == 7
+    cached = CompactListings.from_columnar(columnar, LEASE, shared=shared)
+
+    assert [item["numeric_cache"] for item in cached] == [item["numeric_cache"] for item in parsed]
+    assert cached[1]["numeric_cache"]["deposit"] == 10 ** 25
+    assert cached[3]["numeric_cache"]["deposit"] == -(2 ** 63)
+    assert list(cached) == list(parsed)
+    assert columnar.to_items()[1]["numeric_cache"]["deposit"] == 10 ** 25
+    del cached
+    if not shared:
+        columnar.close()
+
+
+def test_stale_source_key_is_ignored(tmp_path):
+    path = str(tmp_path / "listing_snapshot.bin")
+    write_columnar_snapshot(ITEMS, SOURCE_KEY, path)
+    assert load_columnar_snapshot((9.0, 9.0), path) is None
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_id_lookup_uses_stored_sorted_ids(tmp_path, shared):
+    path = str(tmp_path / "listing_snapshot.bin")
+    items = [_item(pos, pos) for pos in (7, 3, 12, 0, 5)]
+    write_columnar_snapshot(items, SOURCE_KEY, path)
+
+    columnar = load_columnar_snapshot(SOURCE_KEY, path)
+    cached = CompactListings.from_columnar(columnar, LEASE, shared=shared)
+    assert [cached.position(item["id"]) for item in items] == list(range(len(items)))
+    assert cached.get(items[2]["id"]) == cached[2]
+    assert cached.position("lst_0004") is None and cached.position("zzz") is None and cached.position("") is None
+    del cached
+    if not shared:
+        columnar.close()
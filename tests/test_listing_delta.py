@@ -0,0 +1,77 @@
+from app.services.listing_delta import DeltaHistory, ListingDelta, build_delta_response
+from app.services.listing_normalize import normalize_sheet
+from app.services.listing_snapshot import ListingSnapshot
+
+HEADER = ["접수날짜", "지역2", "지역", "지번", "층수", "보증금"]
+
+
+def _snapshot(version, rows):
+    """(접수날짜, 지번, 보증금) 행들로 스냅샷 생성 (source_key 가 비어 있으므로 지문 비교 경로)"""
+    table = [HEADER] + [[date, "부천", "중동", lot, "1", deposit] for date, lot, deposit in rows]
+    return ListingSnapshot(version, (), normalize_sheet(table, {col: i for i, col in enumerate(HEADER)}))
+
+
+A, B, C, D = ("240101", "1", "1000"), ("240102", "2", "2000"), ("240103", "3", "3000"), ("240104", "4", "4000")
+B2 = ("240102", "2", "2500")  # B 의 보증금 수정
+
+
+def _ids(snapshot):
+    return {item["fields"]["지번"]: item["id"] for item in snapshot.items}
+
+
+def test_between_detects_added_removed_changed():
+    old, new = _snapshot(1, [A, B, C]), _snapshot(2, [B2, C, D])
+    delta = ListingDelta.between(old, new)
+    ids = {**_ids(old), **_ids(new)}
+    assert (delta.added, delta.removed, delta.changed) == ([ids["4"]], [ids["1"]], [ids["2"]])
+
+
+def test_moving_rows_is_not_a_change():
+    assert ListingDelta.between(_snapshot(1, [A, B, C]), _snapshot(2, [C, A, B])).is_empty()
+
+
+def test_since_combines_consecutive_deltas():
+    s1, s2, s3, s4 = (_snapshot(1, [A, B]), _snapshot(2, [A, B2, D]),
+                      _snapshot(3, [B2, D, C]), _snapshot(4, [B2, C, A]))
+    history = DeltaHistory()
+    for old, new in ((s1, s2), (s2, s3), (s3, s4)):
+        history.record(old, new)
+    ids = {**_ids(s1), **_ids(s2), **_ids(s3), **_ids(s4)}
+
+    # D 는 추가 후 삭제되어 사라지고, A 는 삭제 후 다시 생겨 변경으로 잡힌다
+    assert history.since(1, 4) == {"added": [ids["3"]], "removed": [], "changed": [ids["2"], ids["1"]]}
+    assert history.since(2, 4) == {"added": [ids["3"]], "removed": [ids["4"]], "changed": [ids["1"]]}
+    assert history.since(4, 4) == {"added": [], "removed": [], "changed": []}
+    # 기록에 없는 버전이나 현재가 아닌 버전까지는 이을 수 없음
+    assert history.since(0, 4) is None
+    assert history.since(1, 3) is None
+
+
+def test_gap_in_history_drops_older_deltas():
+    s1, s2, s3, s4 = (_snapshot(v, [A]) for v in (1, 2, 3, 4))
+    history = DeltaHistory()
+    history.record(s1, s2)
+    history.record(s3, s4)  # 2 → 3 전환이 기록되지 않음
+    assert history.since(1, 4) is None
+    assert history.since(3, 4) == {"added": [], "removed": [], "changed": []}
+
+
+def test_history_keeps_only_recent_entries():
+    snapshots = [_snapshot(v, [A]) for v in range(1, 6)]
+    history = DeltaHistory(max_entries=2)
+    for old, new in zip(snapshots, snapshots[1:]):
+        history.record(old, new)
+    assert history.since(2, 5) is None
+    assert history.since(3, 5) is not None
+
+
+def test_delta_response_hides_invisible_changes():
+    old, new = _snapshot(1, [A, B, C]), _snapshot(2, [B2, C, D])
+    ids = {**_ids(old), **_ids(new)}
+    changes = DeltaHistory()
+    changes.record(old, new)
+    body = build_delta_response(new, 1, changes.since(1, 2), visible_ids={ids["4"]})
+    assert [item["id"] for item in body["added"]] == [ids["4"]]
+    # 보이지 않게 된 변경 매물은 삭제로 보냄
+    assert body["changed"] == [] and sorted(body["removed"]) == sorted([ids["1"], ids["2"]])
+    assert body["version"] == 2 and body["total"] == 1
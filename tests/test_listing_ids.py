@@ -0,0 +1,44 @@
+from app.services.listing_normalize import listing_id_column
+from app.services.listing_sheets import LEASE
+
+# 같은 날 접수된 같은 건물·같은 층의 호실 3개 + 다른 매물 1개
+ROWS = [
+    {"접수날짜": "240101", "지역2": "부천", "지역": "중동", "지번": "1172", "건물명": "아주상가", "층수": "1", "가게명": "101호", "실평수": "10"},
+    {"접수날짜": "240101", "지역2": "부천", "지역": "중동", "지번": "1172", "건물명": "아주상가", "층수": "1", "가게명": "102호", "실평수": "12"},
+    {"접수날짜": "240101", "지역2": "부천", "지역": "중동", "지번": "1172", "건물명": "아주상가", "층수": "1", "가게명": "103호", "실평수": "9"},
+    {"접수날짜": "240102", "지역2": "부천", "지역": "상동", "지번": "540", "건물명": "", "층수": "2", "가게명": "공실", "실평수": "30"},
+]
+
+
+def _ids(rows):
+    columns = {col: [row.get(col, "") for row in rows] for col in LEASE.id_key_columns}
+    addresses = [f'{row["지역"]} {row["지번"]}' for row in rows]
+    return listing_id_column(columns, addresses, LEASE)
+
+
+def test_key_uses_only_stable_columns():
+    assert not {"가게명", "실평수", "건물명", "현황", "보증금"} & set(LEASE.id_key_columns)
+
+
+def test_sibling_units_get_ordinal_suffix():
+    ids = _ids(ROWS)
+    assert len(set(ids)) == len(ids)
+    assert ids[1] == f"{ids[0]}-2" and ids[2] == f"{ids[0]}-3"
+
+
+def test_editing_descriptive_fields_keeps_ids():
+    edited = [dict(row) for row in ROWS]
+    edited[1].update({"가게명": "카페 102호", "실평수": "12.5", "건물명": "아주프라자"})
+    assert _ids(edited) == _ids(ROWS)
+
+
+def test_removing_or_moving_other_listings_keeps_ids():
+    before = _ids(ROWS)
+    # 다른 매물을 앞으로 옮기거나 삭제해도 호실들의 ID 는 그대로
+    assert _ids([ROWS[3]] + ROWS[:3]) == [before[3]] + before[:3]
+    assert _ids(ROWS[:3]) == before[:3]
+
+
+def test_removing_last_sibling_keeps_earlier_ids():
+    before = _ids(ROWS)
+    assert _ids([ROWS[0], ROWS[1], ROWS[3]]) == [before[0], before[1], before[3]]
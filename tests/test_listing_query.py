@@ -0,0 +1,164 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.core.utils import parse_floor_value, split_manager_names, to_float_or_none
+from app.services.listing_normalize import normalize_sheet
+from app.services.listing_query import (
+    FLOOR_FIELD, NUMERIC_FILTERS, SORT_KEYS, TEXT_FILTERS, ListingQuery, ListingQueryIndex,
+)
+from app.services.listing_ranges import RangeIndex
+from app.services.listing_snapshot import ListingSnapshot
+
+HEADER = ["접수날짜", "지역2", "지역", "지번", "건물명", "층수", "가게명", "분양", "실평수",
+          "보증금", "월세", "권리금", "비고", "담당자", "현황", "연락처"]
+
+
+def _rows(n, seed=7):
+    rnd = random.Random(seed)
+    pick = rnd.choice
+    rows = [HEADER]
+    for i in range(n):
+        rows.append([
+            f"24{i % 12 + 1:02d}{i % 28 + 1:02d}",
+            pick(["부천시", "인천 부평구", "서울 강서구", ""]),
+            pick(["중동", "상동", "부평동", "심곡동", "중앙동"]),
+            str(rnd.randint(1, 2000)),
+            pick(["", "아주상가", "중동프라자", "상동타워"]),
+            pick(["1", "2", "3층", "지하1", "B2", "1~2", "", "옥탑"]),
+            pick(["공실", "카페", "101호", ""]),
+            pick(["", "30", "45.5", "협의"]),
+            pick(["", "10", "12.5", "20평", "33", "50"]),
+            pick(["", "500", "1000", "3,000", "5000", "협의"]),
+            pick(["", "30", "50", "120", "200"]),
+            pick(["", "0", "무권리", "1000", "3000"]),
+            pick(["", "부가세별도", "주차가능", "식당제외"]),
+            pick(["남", "정", "오", "남/정", "", "정,오"]),
+            pick(["생", "완", "보류", " 생 ", ""]),
+            pick(["010-1234-5678", ""]),
+        ])
+    return rows
+
+
+ROWS = _rows(400)
+ITEMS = normalize_sheet(ROWS, {col: i for i, col in enumerate(HEADER)})
+_rnd = random.Random(3)
+for _item in ITEMS:
+    if _rnd.random() < 0.8:
+        _item["coords"] = {"lat": 37.4 + _rnd.random() * 0.2, "lng": 126.7 + _rnd.random() * 0.2}
+
+
+def _reference(items, query):
+    """인덱스 없이 매물 dict 를 하나씩 보는 기준 구현 (예전 pandas 필터와 같은 규칙)"""
+    def text_ok(item):
+        for key, tokens in query.text.items():
+            value = item["fields"].get(TEXT_FILTERS[key], "")
+            if not value or not any(t in value for t in tokens):
+                return False
+        return True
+
+    def numeric_ok(item):
+        for key, rng in query.numeric.items():
+            if not rng.contains(to_float_or_none(item["fields"].get(NUMERIC_FILTERS[key][0], ""))):
+                return False
+        if query.floor is not None and not query.floor.contains(parse_floor_value(item["fields"].get(FLOOR_FIELD, ""))):
+            return False
+        return True
+
+    def exact_ok(item):
+        if query.status_raw is not None and item["fields"].get("현황", "").strip() != query.status_raw:
+            return False
+        if query.manager_exact is not None:
+            names = set(split_manager_names(query.manager_exact))
+            if not names & set(split_manager_names(item["fields"].get("담당자", ""))):
+                return False
+        if query.bbox is not None:
+            lat, lng = item["coords"]["lat"], item["coords"]["lng"]
+            min_lat, min_lng, max_lat, max_lng = query.bbox
+            if lat is None or lng is None or not (min_lat <= lat <= max_lat and min_lng <= lng <= max_lng):
+                return False
+        return True
+
+    positions = [p for p, item in enumerate(items) if exact_ok(item) and numeric_ok(item) and text_ok(item)]
+    if query.sort:
+        column, descending = SORT_KEYS[query.sort]
+        if column is None:
+            positions.sort(reverse=descending)
+        else:
+            col = NUMERIC_FILTERS[column][0]
+            positions.sort(key=lambda p: to_float_or_none(items[p]["fields"].get(col, "")) or 0, reverse=descending)
+    return positions
+
+
+def _random_args(rnd):
+    args = {}
+    if rnd.random() < 0.4:
+        args["region"] = rnd.choice(["중동", "상동", "중", "부평동, 심곡동"])
+    if rnd.random() < 0.2:
+        args["region2"] = rnd.choice(["부천", "부평구", "강서구, 부천"])
+    if rnd.random() < 0.2:
+        args["building"] = rnd.choice(["아주", "타워"])
+    if rnd.random() < 0.2:
+        args["note"] = rnd.choice(["부가세", "주차, 식당"])
+    if rnd.random() < 0.4:
+        args["deposit"] = rnd.choice(["1000", "500~3000", "3000-", "~1000"])
+    if rnd.random() < 0.3:
+        args["rent"] = rnd.choice(["50", "30~120"])
+    if rnd.random() < 0.3:
+        args["area_real"] = rnd.choice(["12", "10~33", "20-"])
+    if rnd.random() < 0.2:
+        args["premium"] = rnd.choice(["0", "1000"])
+    if rnd.random() < 0.3:
+        args["floor"] = rnd.choice(["1", "지하1~2", "B2", "2~3"])
+    if rnd.random() < 0.3:
+        args["status_raw"] = rnd.choice(["생", "완", "없음"])
+    if rnd.random() < 0.3:
+        args["bbox"] = rnd.choice(["37.4,126.7,37.5,126.8", "37.45,126.75,37.6,126.9"])
+    if rnd.random() < 0.6:
+        args["sort"] = rnd.choice(list(SORT_KEYS))
+    return args
+
+
+@pytest.fixture(scope="module")
+def index():
+    return ListingQueryIndex(ListingSnapshot(1, (), ITEMS).items)
+
+
+@pytest.mark.parametrize("seed", range(150))
+def test_evaluate_matches_reference(index, seed):
+    rnd = random.Random(seed)
+    query = ListingQuery.from_args(_random_args(rnd))
+    if rnd.random() < 0.3:
+        query.manager_exact = rnd.choice(["남", "정", "오", "남/정", "없는사람"])
+    assert index.evaluate(query) == _reference(ITEMS, query)
+
+
+def test_page_slices_evaluated_positions(index):
+    query = ListingQuery.from_args({"sort": "deposit_high", "limit": "7", "offset": "5"})
+    window, total = index.page_positions(query)
+    full = _reference(ITEMS, query)
+    assert total == len(full) and window == full[5:12]
+    items, _ = index.page(query)
+    assert [item["id"] for item in items] == [ITEMS[p]["id"] for p in window]
+
+
+def test_range_index_select_and_mask():
+    values = [5.0, None, 1.0, 5.0, 3.0, None, -2.0]
+    rng = RangeIndex(values)
+    assert rng.select(None, None).tolist() == [6, 2, 4, 0, 3]
+    assert rng.select(1, 5).tolist() == [2, 4, 0, 3]
+    assert rng.select(5, 5).tolist() == [0, 3]
+    assert rng.select(6, None).tolist() == []
+    assert rng.select(4, 2).tolist() == []
+    # 값이 없는 행은 범위와 상관없이 통과
+    assert np.flatnonzero(rng.mask(2, 4)).tolist() == [1, 4, 5]
+    assert np.flatnonzero(RangeIndex([]).mask(0, 1)).tolist() == []
+
+
+@pytest.mark.parametrize("lo,hi", [(None, 20), (10, None), (12.5, 33), (0, 0), (100, 1)])
+def test_range_index_matches_linear_scan(lo, hi):
+    values = [to_float_or_none(item["fields"]["실평수"]) for item in ITEMS]
+    expected = [p for p, v in enumerate(values)
+                if v is None or ((lo is None or v >= lo) and (hi is None or v <= hi))]
+    assert np.flatnonzero(RangeIndex(values).mask(lo, hi)).tolist() == expected
@@ -0,0 +1,140 @@
+import threading
+
+import pandas as pd
+import pytest
+from flask import Flask, current_app
+
+from app.services import listing_columnar, listings_loader
+from app.services.listing_columnar import (
+    load_columnar_snapshot, publish_snapshot_version, write_columnar_snapshot, read_published_version,
+)
+
+HEADER = ["접수날짜", "지역2", "지역", "지번", "층수", "담당자", "현황", "보증금", "월세"]
+ROWS = [
+    ["240101", "부천", "중동", "1172", "1", "오", "생", "1000", "50"],
+    ["240102", "부천", "상동", "540", "2", "남", "생", "3000", "150"],
+]
+
+
+@pytest.fixture
+def loader(tmp_path, monkeypatch):
+    """임시 data 디렉터리의 상가임대차 시트로 스냅샷을 만드는 앱 (parses: 원본 파싱 횟수)"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("DATA_DIR", raising=False)
+    (tmp_path / "data" / "raw").mkdir(parents=True)
+    pd.DataFrame(ROWS, columns=HEADER).to_excel(tmp_path / "data" / "raw" / "상가임대차.xlsx", index=False)
+
+    monkeypatch.setattr(listing_columnar, "LISTING_SNAPSHOT_FILE", str(tmp_path / "data" / "cache" / "listing_snapshot.bin"))
+    monkeypatch.setattr(listings_loader, "_snapshots", {})
+    monkeypatch.setattr(listings_loader, "_published", {})
+
+    parses = []
+    parse = listings_loader.parse_listing_sheet
+
+    def counting_parse(sheet_type="lease"):
+        parses.append(sheet_type)
+        return parse(sheet_type)
+
+    monkeypatch.setattr(listings_loader, "parse_listing_sheet", counting_parse)
+
+    app = Flask(__name__)
+    app.config.update(DATA_DIR="./data", MAP_CACHE_FILENAME="지도캐시.xlsx")
+    with app.app_context():
+        yield parses
+
+
+def _path():
+    return listing_columnar.columnar_snapshot_path("lease")
+
+
+def test_cached_file_is_reused_after_restart(loader):
+    first = listings_loader.get_listing_snapshot(allow_stale=False)
+    listings_loader._snapshots = {}
+    second = listings_loader.get_listing_snapshot(allow_stale=False)
+    assert loader == ["lease"]
+    assert second.version == first.version
+    assert list(second.items) == list(first.items)
+
+
+def test_old_format_file_is_rebuilt(loader):
+    first = listings_loader.get_listing_snapshot(allow_stale=False)
+    # 이전 형식(v6)으로 쓰인 같은 원본 버전의 파일
+    with open(_path(), "r+b") as f:
+        data = f.read()
+        current = f'"format": {listing_columnar.FORMAT_VERSION}'.encode()
+        assert current in data
+        f.seek(0)
+        f.write(data.replace(current, b'"format": 6', 1))
+    assert load_columnar_snapshot(first.source_key, _path()) is None
+
+    listings_loader._snapshots = {}
+    rebuilt = listings_loader.get_listing_snapshot(allow_stale=False)
+    assert loader == ["lease", "lease"]
+    assert list(rebuilt.items) == list(first.items)
+    columnar = load_columnar_snapshot(first.source_key, _path())
+    assert columnar is not None and columnar.version == rebuilt.version
+    columnar.close()
+
+
+def test_newer_published_version_is_picked_up(loader):
+    first = listings_loader.get_listing_snapshot(allow_stale=False)
+    # 다른 워커가 같은 원본으로 다시 만들어 더 새 버전을 공개
+    write_columnar_snapshot(list(first.items), first.source_key, _path(), first.version + 5)
+    publish_snapshot_version(_path(), first.version + 5)
+
+    current = listings_loader.get_listing_snapshot(allow_stale=False)
+    assert current.version == first.version + 5
+    assert loader == ["lease"]
+
+
+def test_stale_version_file_forces_rebuild(loader):
+    first = listings_loader.get_listing_snapshot(allow_stale=False)
+    # 버전 파일만 더 새 버전 (캐시 삭제 직후 등): 남아 있는 컬럼 파일은 그보다 오래됨
+    publish_snapshot_version(_path(), first.version + 5)
+
+    rebuilt = listings_loader.get_listing_snapshot(allow_stale=False)
+    assert loader == ["lease", "lease"]
+    assert rebuilt.version > first.version + 5
+    assert read_published_version(_path()) == rebuilt.version
+    # 다시 요청해도 재구성하지 않음
+    assert listings_loader.get_listing_snapshot(allow_stale=False) is rebuilt
+
+
+def test_concurrent_readers_while_rebuilding(loader):
+    first = listings_loader.get_listing_snapshot(allow_stale=False)
+    expected = list(first.items)
+    errors, seen = [], set()
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            try:
+                snapshot = listings_loader.get_listing_snapshot(allow_stale=False)
+                assert list(snapshot.items) == expected
+                seen.add(snapshot.version)
+            except Exception as e:
+                errors.append(e)
+                return
+
+    app = current_app._get_current_object()
+
+    def run_reader():
+        with app.app_context():
+            reader()
+
+    threads = [threading.Thread(target=run_reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    # 읽는 중에 다른 워커가 같은 원본으로 파일을 다시 쓰고 새 버전 공개 (몇 차례)
+    for step in range(1, 6):
+        version = first.version + step
+        with listing_columnar.snapshot_build_lock(_path()):
+            write_columnar_snapshot(expected, first.source_key, _path(), version)
+            publish_snapshot_version(_path(), version)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    assert errors == [] and seen
+    assert listings_loader.get_listing_snapshot(allow_stale=False).version == first.version + 5
+    assert loader == ["lease"]
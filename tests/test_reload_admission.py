@@ -0,0 +1,72 @@
+import pytest
+
+from app.services import listings_loader
+from app.services import reload_admission as admission
+
+SOURCE = (1.0, 2.0)
+
+
+@pytest.fixture
+def warmups(monkeypatch):
+    """백그라운드 재구성 요청 기록 (state["available"]=False 면 백그라운드를 쓸 수 없는 상태)"""
+    calls = []
+    state = {"available": True, "source": SOURCE}
+
+    def request(reason, force_sheet=None):
+        calls.append(force_sheet)
+        return state["available"]
+
+    monkeypatch.setattr(admission, "request_snapshot_warmup", request)
+    monkeypatch.setattr(listings_loader, "_source_signature", lambda sheet_type: state["source"])
+    for name in ("_last_forced_at", "_forcing", "_forced_sources"):
+        monkeypatch.setattr(admission, name, {})
+    return calls, state
+
+
+def test_rate_limited_per_user(warmups):
+    assert admission.admit_force_reload("a", "lease")["status"] == "started"
+    limited = admission.admit_force_reload("a", "lease")
+    assert limited["status"] == "rate_limited"
+    assert 0 < limited["retry_after"] <= admission.FORCE_RELOAD_MIN_INTERVAL
+
+
+def test_expired_rate_limits_are_pruned(warmups):
+    admission.admit_force_reload("a", "lease")
+    admission._last_forced_at["a"] -= admission.FORCE_RELOAD_MIN_INTERVAL
+    admission.admit_force_reload("b", "lease")
+    assert list(admission._last_forced_at) == ["b"]
+
+
+def test_same_source_in_progress_then_up_to_date(warmups):
+    calls, _ = warmups
+    assert admission.admit_force_reload("a", "lease")["status"] == "started"
+    assert admission.admit_force_reload("b", "lease")["status"] == "in_progress"
+    admission.finish_forced_reload("lease", SOURCE)
+    assert admission.admit_force_reload("c", "lease")["status"] == "up_to_date"
+    assert calls == ["lease"]
+
+
+def test_failed_rebuild_can_be_requested_again(warmups):
+    calls, _ = warmups
+    admission.admit_force_reload("a", "lease")
+    admission.finish_forced_reload("lease", None)
+    assert admission.admit_force_reload("b", "lease")["status"] == "started"
+    assert calls == ["lease", "lease"]
+
+
+def test_unavailable_is_not_remembered(warmups):
+    calls, state = warmups
+    state["available"] = False
+    assert admission.admit_force_reload("a", "lease")["status"] == "unavailable"
+    state["available"] = True
+    assert admission.admit_force_reload("b", "lease")["status"] == "started"
+
+
+def test_source_change_while_rebuilding_starts_again(warmups):
+    calls, state = warmups
+    admission.admit_force_reload("a", "lease")
+    state["source"] = (3.0, 2.0)
+    assert admission.admit_force_reload("b", "lease")["status"] == "started"
+    # 먼저 끝난 재구성이 이전 원본이면 새 원본의 진행 표시는 남아 있다
+    admission.finish_forced_reload("lease", SOURCE)
+    assert admission.admit_force_reload("c", "lease")["status"] == "in_progress"
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from app.services import reverse_matching
+from app.services.customer_matching import get_customer_criteria
+from app.services.listing_query import ListingQueryIndex
+from app.services.listing_snapshot import ListingSnapshot
+from app.services.reverse_matching import CustomerCriteriaIndex, append_match_events, match_events
+
+from test_listing_query import ITEMS
+
+
+def _customer(cid, manager, **filters):
+    return {"id": cid, "name": f"고객{cid}", "manager": manager,
+            "filter_data": json.dumps(filters, ensure_ascii=False)}
+
+
+CUSTOMERS = [
+    _customer("c1", "남", region="중동", deposit="3000"),
+    _customer("c2", "정", region="부평구 전체", rent="50~120"),
+    _customer("c3", "남/정", region="상동, 심곡동", floor="1~2", area_real="12"),
+    _customer("c4", "오", deposit="1000", premium="0"),
+    _customer("c5", "오", region2="부천", floor="지하1"),
+    _customer("c6", "정"),  # 조건 없음: 모든 매물
+    _customer("c7", "남", region="중앙동", floor="강서구"),  # 층수 칸에 잘못 들어간 지역
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return ListingQueryIndex(ListingSnapshot(1, (), ITEMS).items)
+
+
+def test_reverse_index_agrees_with_forward_matching(index):
+    reverse = CustomerCriteriaIndex(CUSTOMERS)
+    by_position = {pos: set(reverse.match_position(index, pos)) for pos in range(index.size)}
+    for i, customer in enumerate(CUSTOMERS):
+        forward = set(index.evaluate(get_customer_criteria(customer).query))
+        assert forward == {pos for pos, matched in by_position.items() if i in matched}, customer["id"]
+
+
+def test_match_events_seq_and_manager_filter(tmp_path, monkeypatch):
+    monkeypatch.setattr(reverse_matching, "MATCH_EVENT_LOG", str(tmp_path / "match_events.jsonl"))
+    append_match_events([{"at": 1e12, "listing_id": "a", "manager": "남"},
+                         {"at": 1e12, "listing_id": "b", "manager": "정/오"}])
+    append_match_events([{"at": 1e12, "listing_id": "c", "manager": "오"}])
+
+    events = match_events()
+    seqs = [e["seq"] for e in events]
+    assert [e["listing_id"] for e in events] == ["a", "b", "c"] and seqs == sorted(set(seqs))
+    assert [e["listing_id"] for e in match_events(seqs[0])] == ["b", "c"]
+    assert [e["listing_id"] for e in match_events(0, "오")] == ["b", "c"]
+    assert [e["listing_id"] for e in match_events(0, "남/정")] == ["a", "b"]
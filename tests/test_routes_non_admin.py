@@ -0,0 +1,64 @@
+import json
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from flask import Flask
+
+from app.routes import customers as customers_routes
+from app.routes import listings as listings_routes
+from app.services import store
+from app.services.listing_normalize import normalize_sheet
+from app.services.listing_snapshot import ListingSnapshot
+from app.services.user_service import UserService
+
+AGENT = "agent@example.com"
+
+HEADER = ["접수날짜", "지역2", "지역", "지번", "층수", "담당자", "현황", "보증금", "월세"]
+ROWS = [
+    HEADER,
+    ["240101", "부천", "중동", "1172", "1", "오", "생", "1000", "50"],
+    ["240102", "부천", "상동", "540", "2", "남", "생", "3000", "150"],
+]
+ITEMS = normalize_sheet(ROWS, {col: i for i, col in enumerate(HEADER)})
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    (data_dir / "raw").mkdir(parents=True)
+    (data_dir / "users.json").write_text(json.dumps({"users": [{
+        "id": "usr_agent", "email": AGENT, "name": "오중개", "role": "user",
+        "status": "approved", "manager_name": "오", "is_active": True, "password_hash": "",
+    }]}), encoding="utf-8")
+    # 일반 사용자의 고객 파일: <아이디>_customerList.xlsx
+    pd.DataFrame([
+        {"id": "C1", "name": "김고객", "phone": "010", "manager": "오", "region": "중동"},
+        {"id": "C2", "name": "이고객", "phone": "011", "manager": "남", "region": "상동"},
+    ]).to_excel(data_dir / "raw" / "agent_customerList.xlsx", index=False)
+    monkeypatch.setattr(store, "BASE_DIR", str(tmp_path))
+
+    snapshot = ListingSnapshot(1, ("test",), ITEMS)
+    monkeypatch.setattr(listings_routes, "get_listing_snapshot", lambda **kw: snapshot)
+
+    app = Flask(__name__)
+    app.data_manager = SimpleNamespace(user_service=UserService(str(data_dir)))
+    app.register_blueprint(listings_routes.bp)
+    app.register_blueprint(customers_routes.bp)
+    return app.test_client()
+
+
+def test_customers_as_agent(client):
+    r = client.get("/api/customers/", headers={"X-User": AGENT})
+    assert r.status_code == 200
+    assert [c["id"] for c in r.get_json()["items"]] == ["C1"]
+
+
+def test_listing_matches_as_agent(client):
+    r = client.get("/api/listings/matches", headers={"X-User": AGENT})
+    assert r.status_code == 200
+    body = r.get_json()
+    assert [c["customer_id"] for c in body["customers"]] == ["C1"]
+    # 일반 사용자는 본인 담당 매물만 매칭
+    matches = body["customers"][0]["matches"]
+    assert matches and all(m["id"] == ITEMS[0]["id"] for m in matches)
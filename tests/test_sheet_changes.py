@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from app.services import sheet_changes
+from app.services import sheet_download_service as download
+from app.services.listing_sheets import LEASE
+
+HEADER = ["접수날짜", "지역2", "지역", "지번", "층수", "담당자", "현황", "보증금", "월세"]
+ROWS = [
+    ["240101", "부천", "중동", "1172", "1", "오", "생", "1000", "50"],
+    ["240102", "부천", "상동", "540", "2", "남", "생", "3000", "150"],
+]
+
+
+class _Request:
+    def __init__(self, values):
+        self.values_ = values
+
+    def execute(self):
+        return {"values": self.values_}
+
+
+class _SheetsService:
+    """spreadsheets().values().get(...).execute() 만 흉내"""
+
+    def __init__(self):
+        self.values_ = [HEADER] + ROWS
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, spreadsheetId, range):
+        return _Request(self.values_)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setenv("SHEET_DOWNLOAD_DIR", str(tmp_path / "raw"))
+    monkeypatch.setattr(sheet_changes, "_SHEET_STATE_FILE", str(tmp_path / "cache" / "sheet_state_{sheet_type}.json"))
+    monkeypatch.setattr(sheet_changes, "SHEET_CHANGE_LOG", str(tmp_path / "cache" / "sheet_changes.jsonl"))
+    svc = download.SheetDownloadService(service_account_file=str(tmp_path / "missing.json"))
+    svc.sheets_service = _SheetsService()
+    monkeypatch.setattr(svc, "get_sheet_info", lambda: {LEASE.title: {}})
+    return svc
+
+
+def _download(svc):
+    return svc.download_sheet_as_excel(LEASE.title, LEASE.filename)
+
+
+def _leftovers(svc):
+    return [name for name in os.listdir(svc.download_dir) if ".tmp" in name]
+
+
+def test_header_only_change_marks_rows_modified(service):
+    assert _download(service)
+    service.sheets_service.values_ = [HEADER[:-2] + ["월세", "보증금"]] + ROWS
+    assert _download(service)
+    last = sheet_changes.read_sheet_changes(0, LEASE.sheet_type)[-1]
+    assert not last.get("baseline")
+    assert len(last["modified"]) == len(ROWS) and not last["added"] and not last["removed"]
+
+
+def test_unchanged_download_keeps_file(service):
+    assert _download(service)
+    path = os.path.join(service.download_dir, LEASE.filename)
+    mtime = os.path.getmtime(path)
+    assert _download(service)
+    assert os.path.getmtime(path) == mtime
+    assert _leftovers(service) == []
+
+
+def test_failed_comparison_replaces_file_and_restarts_baseline(service, monkeypatch):
+    assert _download(service)
+    assert sheet_changes.load_sheet_state(LEASE) is not None
+
+    def broken(path, schema):
+        raise ValueError("broken sheet")
+
+    monkeypatch.setattr(download, "detect_sheet_change", broken)
+    service.sheets_service.values_ = [HEADER] + ROWS[:1]
+    assert _download(service)
+    assert sheet_changes.read_sheet_rows(os.path.join(service.download_dir, LEASE.filename))[1:] == ROWS[:1]
+    assert sheet_changes.load_sheet_state(LEASE) is None
+    assert _leftovers(service) == []
+
+    # 다음 다운로드는 새 기준(baseline)부터
+    monkeypatch.setattr(download, "detect_sheet_change", sheet_changes.detect_sheet_change)
+    service.sheets_service.values_ = [HEADER] + ROWS
+    assert _download(service)
+    assert sheet_changes.read_sheet_changes(0, LEASE.sheet_type)[-1].get("baseline")
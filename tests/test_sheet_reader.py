@@ -0,0 +1,69 @@
+import datetime
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from app.services.sheet_reader import detect_sheet_format, iter_sheet_rows, read_sheet_table
+
+
+def _pandas_table(path):
+    """이전 로더가 쓰던 방식: pandas read_excel(dtype=str).fillna('')"""
+    df = pd.read_excel(path, dtype=str).fillna("")
+    return [list(df.columns)] + df.values.tolist()
+
+
+def _write(path, rows):
+    wb = Workbook()
+    ws = wb.active
+    for r, row in enumerate(rows, start=1):
+        for c, value in enumerate(row, start=1):
+            if value is not None:
+                ws.cell(row=r, column=c, value=value)
+    wb.save(path)
+    return str(path)
+
+
+SHEETS = {
+    "basic": [
+        ["접수날짜", "지역", "지번", "층수", "보증금"],
+        ["240101", "중동", "1172", 1, 1000],
+        ["240102", "상동", "540-3", "지하1", "3,000"],
+    ],
+    "numbers": [
+        ["정수", "실수", "정수형 실수", "음수", "큰 수"],
+        [1, 12.5, 30.0, -2, 10 ** 12],
+        [0, 0.1, 1e3, -0.5, 123456789],
+    ],
+    "blanks": [
+        ["이름", None, "이름", "비고", None],
+        ["a", "b", "c", None, None],
+        [None, None, None, None, None],
+        ["d", None, None, "NA", "n/a"],
+        [None, None, None, None, None],
+    ],
+    "types": [
+        ["날짜", "참거짓", "문자"],
+        [datetime.datetime(2024, 1, 2, 3, 4, 5), True, "  공백 포함  "],
+        [datetime.datetime(2023, 12, 31), False, "nan"],
+    ],
+}
+
+
+@pytest.mark.parametrize("name", sorted(SHEETS))
+def test_read_sheet_table_matches_pandas(tmp_path, name):
+    path = _write(tmp_path / f"{name}.xlsx", SHEETS[name])
+    assert detect_sheet_format(path) == "xlsx"
+    assert read_sheet_table(path) == _pandas_table(path)
+
+
+def test_iter_sheet_rows_strips_trailing_blanks(tmp_path):
+    path = _write(tmp_path / "rows.xlsx", [["a", "b", None], ["1", None, None], [None, None, None], ["2", "3", "4"]])
+    assert list(iter_sheet_rows(path)) == [["a", "b"], ["1"], [], ["2", "3", "4"]]
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    path = tmp_path / "listing.xlsx"
+    path.write_text("접수날짜,지역\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        detect_sheet_format(str(path))